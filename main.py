@@ -18,14 +18,24 @@ Windows WIM/Driver 管理工具（tkinter）
 """
 
 import os
+import stat
 import re
+import base64
 import subprocess
 import threading
 import sys
-from datetime import datetime
+import time
+from functools import lru_cache, wraps
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import configparser
+import queue
+from collections import deque
+from dataclasses import dataclass
+from io import StringIO
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Iterator, Mapping, Optional
 
 ## 移除網路磁碟相依（專注於 WIM/Driver 功能）
 
@@ -39,21 +49,304 @@ else:
     SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 CONFIG_FILE = os.path.join(SCRIPT_DIR, 'settings.ini')
 
+# DISM 回報的損壞掛載狀態
+_BAD_STATES = frozenset({"Invalid", "Needs Remount", "Corrupted"})
+
+# DISM 錯誤訊息（轉小寫後）中代表「資料夾使用中」與「映像已掛載」的片段
+# （「檔案正在使用中」已包含「正在使用」，不必另列）
+_IN_USE_PATTERNS = ("is currently in use", "正在使用")
+_ALREADY_MOUNTED = ("0xc1420127", "already mounted")
+
+# 在 Windows 上啟動主控台程式時不配置主控台視窗（省去 conhost 啟動）
+if os.name == 'nt':
+    _si = subprocess.STARTUPINFO()
+    _si.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    _si.wShowWindow = subprocess.SW_HIDE
+    _NO_WINDOW = {"creationflags": subprocess.CREATE_NO_WINDOW, "startupinfo": _si}
+    # 與本程式脫離的背景程序（如 shutdown.exe）：不附加主控台，也就不會閃出視窗
+    # （CREATE_NO_WINDOW 與 DETACHED_PROCESS 併用時會被忽略，只用其一）
+    _DETACHED_NO_WINDOW = subprocess.DETACHED_PROCESS
+else:
+    _NO_WINDOW = {}
+    _DETACHED_NO_WINDOW = 0
+
+# Win32 API：權限檢查、提升權限用的 ShellExecuteW 與命令列（只可能用到一次，於載入時先備妥）、結束程序
+if os.name == 'nt':
+    import ctypes
+    from ctypes import wintypes
+    
+    _shell32 = ctypes.WinDLL('shell32', use_last_error=True)
+    _IsUserAnAdmin = _shell32.IsUserAnAdmin
+    _IsUserAnAdmin.argtypes = ()
+    _IsUserAnAdmin.restype = wintypes.BOOL
+    _ShellExecuteW = _shell32.ShellExecuteW
+    _ShellExecuteW.argtypes = (wintypes.HWND, wintypes.LPCWSTR, wintypes.LPCWSTR,
+                               wintypes.LPCWSTR, wintypes.LPCWSTR, ctypes.c_int)
+    _ShellExecuteW.restype = ctypes.c_void_p  # HINSTANCE
+    # 依 Windows 命令列規則引號化（含空白與引號的參數都能正確傳遞）
+    _ELEVATED_CMD = (sys.executable,
+                     subprocess.list2cmdline([os.path.abspath(sys.argv[0]), *sys.argv[1:]]))
+    
+    # 直接以 Win32 API 結束指定名稱的程序（不必啟動 taskkill.exe）
+    _TH32CS_SNAPPROCESS = 0x00000002
+    _PROCESS_TERMINATE = 0x0001
+    _INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+    
+    class _PROCESSENTRY32W(ctypes.Structure):
+        _fields_ = [
+            ("dwSize", wintypes.DWORD),
+            ("cntUsage", wintypes.DWORD),
+            ("th32ProcessID", wintypes.DWORD),
+            ("th32DefaultHeapID", ctypes.c_size_t),
+            ("th32ModuleID", wintypes.DWORD),
+            ("cntThreads", wintypes.DWORD),
+            ("th32ParentProcessID", wintypes.DWORD),
+            ("pcPriClassBase", ctypes.c_long),
+            ("dwFlags", wintypes.DWORD),
+            ("szExeFile", wintypes.WCHAR * 260),
+        ]
+    
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    _kernel32.CreateToolhelp32Snapshot.argtypes = (wintypes.DWORD, wintypes.DWORD)
+    _kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    _kernel32.Process32FirstW.argtypes = (wintypes.HANDLE, ctypes.POINTER(_PROCESSENTRY32W))
+    _kernel32.Process32FirstW.restype = wintypes.BOOL
+    _kernel32.Process32NextW.argtypes = (wintypes.HANDLE, ctypes.POINTER(_PROCESSENTRY32W))
+    _kernel32.Process32NextW.restype = wintypes.BOOL
+    _kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    _kernel32.OpenProcess.restype = wintypes.HANDLE
+    _kernel32.TerminateProcess.argtypes = (wintypes.HANDLE, wintypes.UINT)
+    _kernel32.TerminateProcess.restype = wintypes.BOOL
+    _kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+    _kernel32.CloseHandle.restype = wintypes.BOOL
+    
+    def _terminate_processes(exe_name: str) -> int:
+        """結束所有映像名稱為 exe_name 的程序，回傳成功結束的數量"""
+        snap = _kernel32.CreateToolhelp32Snapshot(_TH32CS_SNAPPROCESS, 0)
+        if not snap or snap == _INVALID_HANDLE_VALUE:
+            raise ctypes.WinError(ctypes.get_last_error())
+        target = exe_name.casefold()
+        killed = 0
+        try:
+            entry = _PROCESSENTRY32W()
+            entry.dwSize = ctypes.sizeof(entry)
+            ok = _kernel32.Process32FirstW(snap, ctypes.byref(entry))
+            while ok:
+                if entry.szExeFile.casefold() == target:
+                    h = _kernel32.OpenProcess(_PROCESS_TERMINATE, False, entry.th32ProcessID)
+                    if h:
+                        try:
+                            if _kernel32.TerminateProcess(h, 1):
+                                killed += 1
+                        finally:
+                            _kernel32.CloseHandle(h)
+                ok = _kernel32.Process32NextW(snap, ctypes.byref(entry))
+        finally:
+            _kernel32.CloseHandle(snap)
+        return killed
+
+# 設定檔中視為 True 的字串
+_TRUE_SET = frozenset({'1', 'true', 'yes', 'on'})
+
+
+def _as_bool(s: str) -> bool:
+    return s.lower() in _TRUE_SET
+
+
+# DISM 串流輸出中不需顯示的行（標頭與進度列）
+_DISM_NOISE_PREFIXES = ("Deployment Image Servicing", "Version:", "[")
+
+
+@lru_cache(maxsize=256)
+def _norm(p: str) -> str:
+    """正規化路徑（同一路徑在各按鈕間反覆出現，結果快取）；空字串維持原樣，不會變成 '.'"""
+    return os.path.normpath(p) if p else p
+
+
+def _mount_key(p: str) -> str:
+    """比對掛載目錄 / WIM 路徑用的鍵（不分大小寫）"""
+    return _norm(p).casefold() if p else ''
+
+
+def _dir_nonempty(p: str) -> bool:
+    """資料夾是否有任何項目（讀到第一個即停止，不建立整個清單）"""
+    with os.scandir(p) as it:
+        return next(it, None) is not None
+
+
+class _FsCache:
+    """使用者輸入路徑的 exists / isdir / 是否為空 檢查結果，短時間（TTL）內重複使用"""
+    
+    def __init__(self, ttl: float = 1.0):
+        self._ttl = ttl
+        self._modes: dict[str, tuple[float, int | None]] = {}
+        self._empty: dict[str, tuple[float, bool]] = {}
+    
+    @staticmethod
+    def _key(p: str) -> str:
+        return os.path.normcase(_norm(p))
+    
+    def _mode(self, p: str) -> Optional[int]:
+        """一次 os.stat 同時回答 exists 與 isdir；不存在時為 None"""
+        key = self._key(p)
+        now = time.monotonic()
+        hit = self._modes.get(key)
+        if hit is not None and now - hit[0] < self._ttl:
+            return hit[1]
+        try:
+            mode = os.stat(p).st_mode
+        except (OSError, ValueError):
+            mode = None
+        self._modes[key] = (now, mode)
+        return mode
+    
+    def exists(self, p: str) -> bool:
+        return self._mode(p) is not None
+    
+    def isdir(self, p: str) -> bool:
+        mode = self._mode(p)
+        return mode is not None and stat.S_ISDIR(mode)
+    
+    def listdir_empty(self, p: str) -> bool:
+        """資料夾是否為空（讀到第一個項目即停止）；讀取失敗時拋出 OSError"""
+        key = self._key(p)
+        now = time.monotonic()
+        hit = self._empty.get(key)
+        if hit is not None and now - hit[0] < self._ttl:
+            return hit[1]
+        empty = not _dir_nonempty(p)
+        self._empty[key] = (now, empty)
+        return empty
+    
+    def invalidate(self, p: str):
+        key = self._key(p)
+        self._modes.pop(key, None)
+        self._empty.pop(key, None)
+
+
+_fs_cache = _FsCache()
+
+
+# -----------------------------
+# 工具層：常駐 PowerShell
+# -----------------------------
+class PowerShellHost:
+    """
+    常駐的 powershell.exe（-Command -），腳本經 stdin 送入，避免每次呼叫的冷啟動
+    """
+    _SENTINEL = "<<<END>>>"
+
+    def __init__(self):
+        self._proc: subprocess.Popen | None = None
+        self._lock = threading.Lock()
+        # 已在目前程序中建立的 scriptblock：腳本內容 -> 變數名稱
+        self._blocks: dict[str, str] = {}
+
+    def _ensure(self) -> subprocess.Popen:
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = subprocess.Popen(
+                ["powershell", "-NoProfile", "-NoLogo", "-NonInteractive", "-WindowStyle", "Hidden", "-Command", "-"],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                text=True, encoding="utf-8", errors="replace", **_NO_WINDOW,
+            )
+            self._proc.stdin.write("[Console]::OutputEncoding = [Text.Encoding]::UTF8\n")
+            self._proc.stdin.flush()
+            self._blocks = {}
+        return self._proc
+
+    @staticmethod
+    def _decode_expr(text: str) -> str:
+        """產生還原 text 的 PowerShell 運算式（Base64，不會被當成程式碼解讀）"""
+        encoded = base64.b64encode(text.encode("utf-8")).decode("ascii")
+        return f"[Text.Encoding]::UTF8.GetString([Convert]::FromBase64String('{encoded}'))"
+
+    def run(self, script: str, env: Optional[dict[str, str]] = None) -> tuple[bool, str]:
+        """
+        執行腳本並讀取輸出直到結束標記
+        參數經 env 以環境變數傳入；相同腳本只在首次執行時解析成 scriptblock
+        """
+        with self._lock:
+            try:
+                proc = self._ensure()
+                # 以 Base64 包成單行，避免多行區塊在 stdin 模式下被提前執行
+                command = ""
+                name = self._blocks.get(script)
+                if name is None:
+                    name = self._blocks[script] = f"__sb{len(self._blocks)}"
+                    command += f"${name} = [scriptblock]::Create({self._decode_expr(script)})\n"
+                for key, value in (env or {}).items():
+                    command += f"$env:{key} = {self._decode_expr(value)}\n"
+                command += f"& ${name}\nWrite-Output '{self._SENTINEL}'\n"
+                
+                proc.stdin.write(command)
+                proc.stdin.flush()
+                lines = []
+                for line in proc.stdout:
+                    line = line.rstrip("\r\n")
+                    if line == self._SENTINEL:
+                        return True, "\n".join(lines)
+                    lines.append(line)
+                self._proc = None
+                return False, "\n".join(lines) or "PowerShell 已結束"
+            except Exception as e:
+                self.close()
+                return False, str(e)
+
+    def close(self):
+        proc, self._proc = self._proc, None
+        if proc is not None and proc.poll() is None:
+            try:
+                proc.kill()
+            except Exception:
+                pass
+
+
+_ps_host = PowerShellHost()
+
+# 關閉指向 $env:TARGET_PATH（含子資料夾）的檔案總管視窗
+_PS_CLOSE_EXPLORER = '''
+$t = $env:TARGET_PATH.ToLower()
+$shell = New-Object -ComObject Shell.Application
+$windows = $shell.Windows()
+$closed = 0
+foreach ($window in $windows) {
+    try {
+        $path = $window.LocationURL
+        if ($path -like "*file:///*") {
+            $localPath = $window.Document.Folder.Self.Path
+            if ($localPath -and $localPath.ToLower().StartsWith($t)) {
+                $window.Quit()
+                $closed++
+            }
+        }
+    } catch {
+        # 忽略錯誤，繼續下一個視窗
+    }
+}
+Write-Output "已關閉 $closed 個檔案總管視窗"
+'''
+
 # -----------------------------
 # 工具層：WIM 掛載（使用 DISM）
 # -----------------------------
+# /Get-WimInfo 各欄位（載入時編譯一次，逐行解析時不必再查 re 快取）
+_RE_INDEX = re.compile(r"Index\s*:\s*(\d+)", re.IGNORECASE)
+_RE_NAME = re.compile(r"Name\s*:\s*(.*)", re.IGNORECASE)
+_RE_DESC = re.compile(r"Description\s*:\s*(.*)", re.IGNORECASE)
+# DISM 進度列，例如 [=====      10.0%        ]
+_RE_DISM_PCT = re.compile(r"^\s*\[[= ]*(\d{1,3})(?:\.\d+)?%")
+
+
 class WIMManager:
     @staticmethod
     def _norm_path(p: str) -> str:
-        try:
-            return os.path.normpath(p)
-        except Exception:
-            return p
+        return _norm(p)
     @staticmethod
+    @lru_cache(maxsize=1)
     def is_admin() -> bool:
+        # 執行期間權限不會改變，只查詢一次
         try:
-            import ctypes
-            return bool(ctypes.windll.shell32.IsUserAnAdmin())
+            return bool(_IsUserAnAdmin())
         except Exception:
             return False
 
@@ -61,13 +354,81 @@ class WIMManager:
     def _run_dism(args: list[str]) -> tuple[int, str, str]:
         # 直接呼叫系統 dism
         try:
-            cp = subprocess.run(["dism", "/English", *args], capture_output=True, text=True)
+            cp = subprocess.run(["dism", "/English", *args], capture_output=True, text=True, **_NO_WINDOW)
             return cp.returncode, cp.stdout or "", cp.stderr or ""
         except FileNotFoundError as e:
             return 9001, "", f"找不到 DISM：{e}"
         except Exception as e:
             return 9002, "", str(e)
 
+    @staticmethod
+    def _iter_dism(args: list[str]) -> Iterator[str]:
+        """
+        逐行產出 DISM 輸出（stderr 併入 stdout），結束時回傳 (returncode, 最後數十行)
+        """
+        try:
+            p = subprocess.Popen(["dism", "/English", *args], stdout=subprocess.PIPE,
+                                 stderr=subprocess.STDOUT, text=True, bufsize=1, **_NO_WINDOW)
+        except FileNotFoundError as e:
+            return 9001, f"找不到 DISM：{e}"
+        except Exception as e:
+            return 9002, str(e)
+        
+        tail: deque[str] = deque(maxlen=50)
+        with p:
+            for line in p.stdout:
+                line = line.rstrip("\n")
+                tail.append(line)
+                yield line
+        return p.returncode, "\n".join(tail)
+
+    @staticmethod
+    def _run_dism_stream(args: list[str], line_cb) -> tuple[int, str]:
+        """
+        執行 DISM 並將每一行交給 line_cb，不保留完整輸出
+        """
+        it = WIMManager._iter_dism(args)
+        while True:
+            try:
+                line_cb(next(it))
+            except StopIteration as stop:
+                return stop.value
+
+    @staticmethod
+    def _run_dism_tail(args: list[str], progress_cb=None) -> tuple[int, str]:
+        """
+        掛載 / 卸載用：逐行讀取 DISM 輸出，只保留最後數十行供錯誤訊息使用；
+        進度列每前進 10% 才交給 progress_cb 一次
+        """
+        last = -1
+        
+        def feed(line: str):
+            nonlocal last
+            if progress_cb is None:
+                return
+            m = _RE_DISM_PCT.match(line)
+            if m:
+                step = min(int(m.group(1)), 100) // 10 * 10
+                if step > last:
+                    last = step
+                    progress_cb(f"  進度: {step}%")
+        
+        return WIMManager._run_dism_stream(args, feed)
+
+    @staticmethod
+    def _dism_progress(args: list[str]):
+        """
+        smart_cleanup_and_fix 用：將 DISM 輸出轉為進度訊息，回傳 (returncode, 最後數十行)
+        """
+        it = WIMManager._iter_dism(args)
+        while True:
+            try:
+                line = next(it).strip()
+            except StopIteration as stop:
+                return stop.value
+            if line and not line.startswith(_DISM_NOISE_PREFIXES):
+                yield f"      {line}", None
+
     @staticmethod
     def get_wim_images(wim_path: str) -> tuple[bool, list[dict], str]:
         # 優先使用 /Get-WimInfo
@@ -89,20 +450,21 @@ class WIMManager:
         cur: dict | None = None
         for line in text.splitlines():
             line = line.strip()
-            if not line:
+            # 只有 Index / Name / Description 開頭的行需要比對
+            if not line or line[0] not in "IiNnDd":
                 continue
-            m = re.match(r"Index\s*:\s*(\d+)", line, re.IGNORECASE)
+            m = _RE_INDEX.match(line)
             if m:
                 if cur:
                     imgs.append(cur)
                 cur = {"Index": int(m.group(1)), "Name": "", "Description": ""}
                 continue
             if cur is not None:
-                m = re.match(r"Name\s*:\s*(.*)", line, re.IGNORECASE)
+                m = _RE_NAME.match(line)
                 if m:
                     cur["Name"] = m.group(1).strip()
                     continue
-                m = re.match(r"Description\s*:\s*(.*)", line, re.IGNORECASE)
+                m = _RE_DESC.match(line)
                 if m:
                     cur["Description"] = m.group(1).strip()
                     continue
@@ -111,7 +473,7 @@ class WIMManager:
         return imgs
 
     @staticmethod
-    def mount_wim(wim_path: str, index: int, mount_dir: str, readonly: bool) -> tuple[bool, str]:
+    def mount_wim(wim_path: str, index: int, mount_dir: str, readonly: bool, progress_cb=None) -> tuple[bool, str]:
         w = WIMManager._norm_path(wim_path)
         m = WIMManager._norm_path(mount_dir)
         args = [
@@ -122,23 +484,23 @@ class WIMManager:
         ]
         if readonly:
             args.append("/ReadOnly")
-        rc, out, err = WIMManager._run_dism(args)
+        rc, out = WIMManager._run_dism_tail(args, progress_cb)
         if rc == 0:
             return True, "WIM 掛載完成"
-        return False, err or out
+        return False, out
 
     @staticmethod
-    def unmount_wim(mount_dir: str, commit: bool = False) -> tuple[bool, str]:
+    def unmount_wim(mount_dir: str, commit: bool = False, progress_cb=None) -> tuple[bool, str]:
         m = WIMManager._norm_path(mount_dir)
         args = [
             "/Unmount-Image",
             f"/MountDir:{m}",
             "/Commit" if commit else "/Discard",
         ]
-        rc, out, err = WIMManager._run_dism(args)
+        rc, out = WIMManager._run_dism_tail(args, progress_cb)
         if rc == 0:
             return True, "WIM 卸載完成"
-        return False, err or out
+        return False, out
     
     @staticmethod
     def get_mount_info() -> tuple[bool, list[dict], str]:
@@ -196,28 +558,27 @@ class WIMManager:
         return images
     
     @staticmethod
-    @staticmethod
-    def smart_cleanup_and_fix() -> tuple[bool, str]:
+    def smart_cleanup_and_fix() -> Iterator[tuple[str, Optional[bool]]]:
         """
         智能一鍵修復 - 自動診斷並解決所有 WIM 掛載問題
         包含檢查狀態、清理衝突、修復損壞掛載、強力清理等所有功能
+        逐行產出 (訊息, 結果)，結果在最後一行為 True/False，其餘為 None
         """
-        messages = []
-        messages.append("🚀 開始智能診斷和修復...")
+        yield "🚀 開始智能診斷和修復...", None
         
         try:
             # === 第1步：檢查當前掛載狀態 ===
-            messages.append("\n📋 第1步：檢查系統掛載狀態")
+            yield "\n📋 第1步：檢查系統掛載狀態", None
             args = ["/Get-MountedWimInfo"]
             rc, out, err = WIMManager._run_dism(args)
             
             if rc != 0:
-                messages.append(f"❌ 無法檢查掛載狀態: {err or out}")
-                return False, "\n".join(messages)
+                yield f"❌ 無法檢查掛載狀態: {err or out}", False
+                return
             
             if "No mounted images found" in out:
-                messages.append("✅ 系統中沒有掛載的映像，狀態良好")
-                return True, "\n".join(messages)
+                yield "✅ 系統中沒有掛載的映像，狀態良好", True
+                return
             
             # 解析掛載資訊
             lines = out.split('\n')
@@ -237,81 +598,76 @@ class WIMManager:
                 elif line.startswith("Status"):
                     status = line.split(":", 1)[1].strip()
                     current_mount["status"] = status
-                    mounted_images.append(current_mount.copy())
-                    
-                    # 分類掛載狀態
-                    if status in ["Invalid", "Needs Remount", "Corrupted"]:
-                        broken_mounts.append(current_mount.copy())
-                    else:
-                        normal_mounts.append(current_mount.copy())
+                    # 解析同時分類，同一筆記錄共用，不再複製
+                    (broken_mounts if status in _BAD_STATES else normal_mounts).append(current_mount)
+                    mounted_images.append(current_mount)
                     current_mount = {}
             
-            messages.append(f"📊 發現 {len(mounted_images)} 個掛載的映像:")
+            yield f"📊 發現 {len(mounted_images)} 個掛載的映像:", None
             for mount in mounted_images:
-                status_icon = "❌" if mount["status"] in ["Invalid", "Needs Remount", "Corrupted"] else "✅"
-                messages.append(f"   {status_icon} {mount['dir']} - 狀態: {mount['status']}")
+                status_icon = "❌" if mount["status"] in _BAD_STATES else "✅"
+                yield f"   {status_icon} {mount['dir']} - 狀態: {mount['status']}", None
             
             # === 第2步：處理正常掛載 ===
             if normal_mounts:
-                messages.append(f"\n🔧 第2步：清理 {len(normal_mounts)} 個正常掛載")
+                yield f"\n🔧 第2步：清理 {len(normal_mounts)} 個正常掛載", None
                 for mount in normal_mounts:
                     mount_dir = mount["dir"]
-                    messages.append(f"   處理: {mount_dir}")
+                    yield f"   處理: {mount_dir}", None
                     
                     # 嘗試正常卸載 (提交)
                     rc, out, err = WIMManager._run_dism(["/Unmount-Wim", f"/MountDir:{mount_dir}", "/Commit"])
                     if rc == 0:
-                        messages.append(f"   ✅ 正常卸載成功")
+                        yield f"   ✅ 正常卸載成功", None
                     else:
                         # 如果提交失敗，嘗試丟棄
                         rc, out, err = WIMManager._run_dism(["/Unmount-Wim", f"/MountDir:{mount_dir}", "/Discard"])
                         if rc == 0:
-                            messages.append(f"   ✅ 丟棄卸載成功")
+                            yield f"   ✅ 丟棄卸載成功", None
                         else:
-                            messages.append(f"   ⚠️  卸載失敗，稍後統一處理")
+                            yield f"   ⚠️  卸載失敗，稍後統一處理", None
             
             # === 第3步：修復損壞掛載 ===
             if broken_mounts:
-                messages.append(f"\n🔨 第3步：修復 {len(broken_mounts)} 個損壞掛載")
+                yield f"\n🔨 第3步：修復 {len(broken_mounts)} 個損壞掛載", None
                 for mount in broken_mounts:
                     mount_dir = mount["dir"]
                     status = mount["status"]
-                    messages.append(f"   修復: {mount_dir} (狀態: {status})")
+                    yield f"   修復: {mount_dir} (狀態: {status})", None
                     
                     # 直接使用實測有效的 Discard 方法
                     rc, out, err = WIMManager._run_dism(["/Unmount-Wim", f"/MountDir:{mount_dir}", "/Discard"])
                     if rc == 0:
-                        messages.append(f"   ✅ 損壞掛載修復成功")
+                        yield f"   ✅ 損壞掛載修復成功", None
                     else:
-                        messages.append(f"   ⚠️  修復失敗: {err or out}")
+                        yield f"   ⚠️  修復失敗: {err or out}", None
             
             # === 第4步：系統級清理 ===
-            messages.append(f"\n🧹 第4步：執行系統級清理")
+            yield f"\n🧹 第4步：執行系統級清理", None
             
             # 清理 WIM 緩存
-            messages.append("   清理 WIM 緩存...")
-            rc, out, err = WIMManager._run_dism(["/Cleanup-Wim"])
+            yield "   清理 WIM 緩存...", None
+            rc, out = yield from WIMManager._dism_progress(["/Cleanup-Wim"])
             if rc == 0:
-                messages.append("   ✅ WIM 緩存清理完成")
+                yield "   ✅ WIM 緩存清理完成", None
             else:
-                messages.append(f"   ⚠️  WIM 緩存清理警告: {err or out}")
+                yield f"   ⚠️  WIM 緩存清理警告: {out}", None
             
             # 清理所有掛載點
-            messages.append("   清理所有掛載點...")
-            rc, out, err = WIMManager._run_dism(["/Cleanup-Mountpoints"])
+            yield "   清理所有掛載點...", None
+            rc, out = yield from WIMManager._dism_progress(["/Cleanup-Mountpoints"])
             if rc == 0:
-                messages.append("   ✅ 掛載點清理完成")
+                yield "   ✅ 掛載點清理完成", None
             else:
-                messages.append(f"   ⚠️  掛載點清理警告: {err or out}")
+                yield f"   ⚠️  掛載點清理警告: {out}", None
             
             # === 第5步：驗證最終結果 ===
-            messages.append(f"\n🔍 第5步：驗證修復結果")
+            yield f"\n🔍 第5步：驗證修復結果", None
             rc, out, err = WIMManager._run_dism(["/Get-MountedWimInfo"])
             
             if rc == 0 and "No mounted images found" in out:
-                messages.append("🎉 一鍵修復完成！所有掛載問題已解決")
-                messages.append("💡 系統現在處於乾淨狀態，可以正常進行新的掛載操作")
-                return True, "\n".join(messages)
+                yield "🎉 一鍵修復完成！所有掛載問題已解決", None
+                yield "💡 系統現在處於乾淨狀態，可以正常進行新的掛載操作", True
             elif rc == 0:
                 # 檢查是否還有問題
                 remaining_issues = 0
@@ -322,28 +678,27 @@ class WIMManager:
                         current_dir = line.split(":", 1)[1].strip()
                     elif line.startswith("Status"):
                         status = line.split(":", 1)[1].strip()
-                        if status in ["Invalid", "Needs Remount", "Corrupted"]:
+                        if status in _BAD_STATES:
                             remaining_issues += 1
                             remaining_details.append(f"{current_dir} ({status})")
                 
                 if remaining_issues == 0:
-                    messages.append("✅ 一鍵修復完成！所有問題已解決")
-                    messages.append("💡 仍有正常掛載存在，但狀態健康")
-                    return True, "\n".join(messages)
+                    yield "✅ 一鍵修復完成！所有問題已解決", None
+                    yield "💡 仍有正常掛載存在，但狀態健康", True
                 else:
-                    messages.append(f"⚠️  還有 {remaining_issues} 個問題需要手動處理:")
+                    yield f"⚠️  還有 {remaining_issues} 個問題需要手動處理:", None
                     for detail in remaining_details:
-                        messages.append(f"     - {detail}")
-                    messages.append("💡 建議：重新啟動電腦以完全清除頑固問題")
-                    return True, "\n".join(messages)  # 仍算成功，已盡力修復
+                        yield f"     - {detail}", None
+                    yield "💡 建議：重新啟動電腦以完全清除頑固問題", True  # 仍算成功，已盡力修復
             else:
-                messages.append(f"⚠️  無法驗證修復結果: {err or out}")
-                messages.append("💡 建議：重新啟動電腦確保所有更改生效")
-                return True, "\n".join(messages)
+                yield f"⚠️  無法驗證修復結果: {err or out}", None
+                yield "💡 建議：重新啟動電腦確保所有更改生效", True
                 
         except Exception as e:
-            messages.append(f"❌ 修復過程發生錯誤: {str(e)}")
-            return False, "\n".join(messages)
+            yield f"❌ 修復過程發生錯誤: {str(e)}", False
+
+    @staticmethod
+    def fix_broken_mounts() -> tuple[bool, str]:
         """
         修復損壞的掛載點 - 基於實測成功的解決方案
         專門處理 "Invalid", "Needs Remount", "Corrupted" 等狀態
@@ -379,8 +734,8 @@ class WIMManager:
                 current_mount["status"] = status
                 
                 # 檢查是否為損壞狀態
-                if status in ["Invalid", "Needs Remount", "Corrupted"]:
-                    broken_mounts.append(current_mount.copy())
+                if status in _BAD_STATES:
+                    broken_mounts.append(current_mount)
                 current_mount = {}
         
         if not broken_mounts:
@@ -461,7 +816,7 @@ class WIMManager:
             for line in out.split('\n'):
                 if line.strip().startswith("Status"):
                     status = line.split(":", 1)[1].strip()
-                    if status in ["Invalid", "Needs Remount", "Corrupted"]:
+                    if status in _BAD_STATES:
                         remaining_broken += 1
             
             if remaining_broken == 0:
@@ -521,10 +876,9 @@ class WIMManager:
         # 方法 4: 重啟 DISM 服務
         messages.append("嘗試重啟相關服務...")
         try:
-            import subprocess
             # 停止可能的服務
-            subprocess.run(["net", "stop", "TrustedInstaller"], capture_output=True, text=True, timeout=10)
-            subprocess.run(["net", "start", "TrustedInstaller"], capture_output=True, text=True, timeout=10)
+            subprocess.run(["net", "stop", "TrustedInstaller"], capture_output=True, text=True, timeout=10, **_NO_WINDOW)
+            subprocess.run(["net", "start", "TrustedInstaller"], capture_output=True, text=True, timeout=10, **_NO_WINDOW)
             messages.append("服務重啟完成")
         except Exception as e:
             messages.append(f"服務重啟失敗: {str(e)}")
@@ -730,13 +1084,12 @@ class WIMManager:
         try:
             # 1. 強制終止可能相關的進程
             messages.append("=== 步驟 1: 終止相關進程 ===")
-            import subprocess
             processes_to_kill = ["dism.exe", "DismHost.exe", "TiWorker.exe"]
             
             for proc in processes_to_kill:
                 try:
                     result = subprocess.run(["taskkill", "/F", "/IM", proc], 
-                                          capture_output=True, text=True)
+                                          capture_output=True, text=True, **_NO_WINDOW)
                     if result.returncode == 0:
                         messages.append(f"✓ 終止進程: {proc}")
                         success_count += 1
@@ -784,12 +1137,11 @@ class WIMManager:
             for service in services:
                 try:
                     # 停止服務
-                    subprocess.run(["sc", "stop", service], capture_output=True, text=True, timeout=10)
+                    subprocess.run(["sc", "stop", service], capture_output=True, text=True, timeout=10, **_NO_WINDOW)
                     # 等待一下
-                    import time
                     time.sleep(2)
                     # 啟動服務
-                    result = subprocess.run(["sc", "start", service], capture_output=True, text=True, timeout=15)
+                    result = subprocess.run(["sc", "start", service], capture_output=True, text=True, timeout=15, **_NO_WINDOW)
                     
                     if result.returncode == 0:
                         messages.append(f"✓ 重啟服務: {service}")
@@ -810,6 +1162,7 @@ class WIMManager:
                     ["/Cleanup-Mountpoints", "/RevertPendingActions"],
                 ]
                 
+                # DISM 共用掛載存放區，各組參數依序嘗試，任一成功即停止
                 for cmd in cleanup_commands:
                     try:
                         rc, out, err = WIMManager._run_dism(cmd)
@@ -844,55 +1197,52 @@ class WIMManager:
             messages.append(f"\n✗ 終極清理發生嚴重錯誤: {str(e)}")
             return False, "\n".join(messages)
     
+    @staticmethod
+    def _has_explorer_windows() -> bool:
+        """
+        以 EnumWindows 在程序內檢查是否有開啟中的檔案總管資料夾視窗
+        """
+        import ctypes
+        from ctypes import wintypes
+        
+        user32 = ctypes.WinDLL("user32")
+        buf = ctypes.create_unicode_buffer(64)
+        found = False
+        
+        @ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+        def enum_proc(hwnd, lparam):
+            nonlocal found
+            user32.GetClassNameW(hwnd, buf, len(buf))
+            if buf.value in ("CabinetWClass", "ExploreWClass"):
+                found = True
+                return False  # 找到即停止列舉
+            return True
+        
+        user32.EnumWindows(enum_proc, 0)
+        return found
+
     @staticmethod
     def close_explorer_windows(target_path: str) -> tuple[bool, str]:
         """
         關閉指向特定路徑的檔案總管視窗
         """
         try:
-            import ctypes
-            from ctypes import wintypes
-            
             # 正規化路徑
             target_path = os.path.normpath(target_path).lower()
             
-            # 使用 tasklist 找到 explorer.exe 進程
-            result = subprocess.run(['tasklist', '/FI', 'IMAGENAME eq explorer.exe', '/FO', 'CSV'], 
-                                  capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                return False, "無法查詢 explorer 進程"
-            
-            # 嘗試使用 PowerShell 關閉特定資料夾的檔案總管視窗
-            ps_script = f'''
-$shell = New-Object -ComObject Shell.Application
-$windows = $shell.Windows()
-$closed = 0
-foreach ($window in $windows) {{
-    try {{
-        $path = $window.LocationURL
-        if ($path -like "*file:///*") {{
-            $localPath = $window.Document.Folder.Self.Path
-            if ($localPath -and $localPath.ToLower().StartsWith("{target_path}")) {{
-                $window.Quit()
-                $closed++
-            }}
-        }}
-    }} catch {{
-        # 忽略錯誤，繼續下一個視窗
-    }}
-}}
-Write-Output "已關閉 $closed 個檔案總管視窗"
-'''
-            
-            result = subprocess.run(['powershell', '-Command', ps_script], 
-                                  capture_output=True, text=True)
+            # 沒有任何資料夾視窗時不需要經過 PowerShell/COM
+            try:
+                if not WIMManager._has_explorer_windows():
+                    return True, "已關閉 0 個檔案總管視窗"
+            except Exception:
+                pass
             
-            if result.returncode == 0:
-                output = result.stdout.strip()
-                return True, output
+            # 使用 PowerShell 關閉特定資料夾的檔案總管視窗（路徑經環境變數傳入）
+            ok, output = _ps_host.run(_PS_CLOSE_EXPLORER, env={"TARGET_PATH": target_path})
+            if ok:
+                return True, output.strip()
             else:
-                return False, f"PowerShell 執行失敗: {result.stderr}"
+                return False, f"PowerShell 執行失敗: {output}"
                 
         except Exception as e:
             return False, f"關閉檔案總管視窗時發生錯誤: {str(e)}"
@@ -900,19 +1250,128 @@ Write-Output "已關閉 $closed 個檔案總管視窗"
 # -----------------------------
 # 工具層：Driver 離線安裝（使用 DISM）
 # -----------------------------
+# 掃描資料夾時比對的 .inf 副檔名常見大小寫（避免每個檔名都 lower()）
+_INF_SUFFIXES = ('.inf', '.INF', '.Inf')
+
+# .inf 開頭是否含 DriverVer 的快速判斷（ANSI/UTF-8 與 UTF-16LE 兩種編碼）
+_DRIVERVER_ASCII = b'DriverVer'
+_DRIVERVER_UTF16 = 'DriverVer'.encode('utf-16-le')
+
+# DISM /Get-Drivers 欄位名稱 -> 結果字典的 key
+_DRIVER_FIELD_KEYS = {
+    "published name": "PublishedName",
+    "original file name": "OriginalFileName",
+    "class name": "ClassName",
+    "provider name": "Provider",
+    "date": "Date",
+    "version": "Version",
+}
+_DRIVER_FIELDS = tuple(_DRIVER_FIELD_KEYS.values())
+_DRIVER_FIELD_RE = re.compile(
+    r"^[ \t]*(Published Name|Original File Name|Class Name|Provider Name|Date|Version)[ \t]*:[ \t]*(.*)$",
+    re.MULTILINE | re.IGNORECASE,
+)
+
+
+class _DriverListParser:
+    """
+    /Get-Drivers 輸出的逐行解析器，可邊讀 DISM 輸出邊解析
+    """
+    def __init__(self):
+        self.drivers: list[dict] = []
+        self._cur: dict | None = None
+
+    def feed(self, line: str):
+        m = _DRIVER_FIELD_RE.match(line)
+        if not m:
+            return
+        key = _DRIVER_FIELD_KEYS[m.group(1).lower()]
+        if key == "PublishedName":
+            # 檢測新驅動程式開始
+            if self._cur:
+                self.drivers.append(self._cur)
+            self._cur = dict.fromkeys(_DRIVER_FIELDS, "")
+        elif self._cur is None:
+            return
+        self._cur[key] = m.group(2).strip()
+
+    def close(self) -> list[dict]:
+        if self._cur:
+            self.drivers.append(self._cur)
+            self._cur = None
+        return self.drivers
+
 class DriverManager:
+    # 查詢結果快取：key 為（種類, 路徑[, 檔案系統指紋]），指紋改變即失效；每個路徑只保留最新一筆
+    _cache: dict = {}
+    _inflight: dict = {}
+    _cache_lock = threading.Lock()
+
     @staticmethod
     def _norm_path(p: str) -> str:
+        return _norm(p)
+
+    @staticmethod
+    def _fingerprint(path: str) -> Optional[int]:
         try:
-            return os.path.normpath(p)
-        except Exception:
-            return p
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def _cached_call(key: tuple, fn):
+        """
+        以 key 快取 fn() 的成功結果；同時進行的相同查詢共用同一次執行
+        """
+        with DriverManager._cache_lock:
+            if key in DriverManager._cache:
+                return DriverManager._cache[key]
+            fut = DriverManager._inflight.get(key)
+            owner = fut is None
+            if owner:
+                fut = DriverManager._inflight[key] = Future()
+        if not owner:
+            return fut.result()
+        
+        try:
+            result = fn()
+        except BaseException as e:
+            with DriverManager._cache_lock:
+                DriverManager._inflight.pop(key, None)
+            fut.set_exception(e)
+            raise
+        with DriverManager._cache_lock:
+            DriverManager._inflight.pop(key, None)
+            if result[0]:
+                # 同一路徑舊指紋的結果已不可能再命中，直接取代
+                for old in [k for k in DriverManager._cache if k[:2] == key[:2]]:
+                    del DriverManager._cache[old]
+                DriverManager._cache[key] = result
+        fut.set_result(result)
+        return result
+
+    @staticmethod
+    def _peek_cache(key: tuple):
+        """只讀取已快取的結果，不執行查詢；沒有快取時回傳 None"""
+        with DriverManager._cache_lock:
+            return DriverManager._cache.get(key)
+
+    @staticmethod
+    def invalidate_cache(path: Optional[str] = None):
+        """清除快取；指定 path 時只清除該路徑的項目"""
+        with DriverManager._cache_lock:
+            if path is None:
+                DriverManager._cache.clear()
+                return
+            p = DriverManager._norm_path(path)
+            for key in [k for k in DriverManager._cache if k[1] == p]:
+                del DriverManager._cache[key]
 
     @staticmethod
     def _run_dism(args: list[str]) -> tuple[int, str, str]:
         # 直接呼叫系統 dism
         try:
-            cp = subprocess.run(["dism", "/English", *args], capture_output=True, text=True)
+            cp = subprocess.run(["dism", "/English", *args], capture_output=True, text=True, **_NO_WINDOW)
             return cp.returncode, cp.stdout or "", cp.stderr or ""
         except FileNotFoundError as e:
             return 9001, "", f"找不到 DISM：{e}"
@@ -920,17 +1379,55 @@ class DriverManager:
             return 9002, "", str(e)
 
     @staticmethod
-    def add_driver_to_offline_image(mount_dir: str, driver_path: str, recurse: bool = True, force_unsigned: bool = False) -> tuple[bool, str]:
+    def _run_dism_stream(args: list[str], line_cb) -> tuple[int, str]:
+        return WIMManager._run_dism_stream(args, line_cb)
+
+    @staticmethod
+    def add_driver_to_offline_image(mount_dir: str, driver_path: str, recurse: bool = True, force_unsigned: bool = False,
+                                    skip_installed: bool = False) -> tuple[bool, str]:
         """
         離線安裝驅動程式到已掛載的映像
+        skip_installed 為 True 時先查詢映像中的驅動並略過已安裝者；否則只在清單已快取時比對
         """
         m = DriverManager._norm_path(mount_dir)
         d = DriverManager._norm_path(driver_path)
         
+        # 比對映像中已安裝的驅動（檔名、版本、提供者、類別），已存在的就不必呼叫 DISM
+        installed = DriverManager._installed_driver_keys(m, query=skip_installed)
+        if not installed:
+            return DriverManager._add_driver(m, d, recurse and os.path.isdir(d), force_unsigned)
+        if not os.path.isdir(d):
+            if DriverManager._inf_key(d) in installed:
+                return True, "已安裝，略過"
+            return DriverManager._add_driver(m, d, False, force_unsigned)
+        
+        ok, infs, _ = DriverManager.get_driver_info_from_path(d, refresh=True)
+        if not recurse:
+            infs = [i for i in infs if os.path.dirname(i["path"]) == d]
+        if not ok or not infs:
+            # 交給 DISM 回報（例如找不到驅動程式）
+            return DriverManager._add_driver(m, d, recurse, force_unsigned)
+            
+        pending = [i["path"] for i in infs if DriverManager._inf_key(i["path"]) not in installed]
+        if not pending:
+            return True, "已安裝，略過"
+        if len(pending) == len(infs):
+            # 都需要安裝：整個資料夾交給一次 DISM
+            return DriverManager._add_driver(m, d, recurse, force_unsigned)
+        
+        # 部分已安裝：其餘 INF 逐一安裝（DISM 對掛載映像持有獨占鎖，不能同時執行）
+        for inf in pending:
+            ok, msg = DriverManager._add_driver(m, inf, False, force_unsigned)
+            if not ok:
+                return False, f"{os.path.basename(inf)}: {msg.strip()}"
+        return True, f"驅動程式安裝完成（{len(pending)} 個，略過 {len(infs) - len(pending)} 個已安裝的驅動）"
+
+    @staticmethod
+    def _add_driver(m: str, target: str, recurse: bool, force_unsigned: bool) -> tuple[bool, str]:
         args = [
             "/Add-Driver",
             f"/Image:{m}",
-            f"/Driver:{d}",
+            f"/Driver:{target}",
         ]
         
         if recurse:
@@ -941,9 +1438,64 @@ class DriverManager:
             
         rc, out, err = DriverManager._run_dism(args)
         if rc == 0:
+            DriverManager.invalidate_cache(m)
             return True, "驅動程式安裝完成"
         return False, err or out
 
+    @staticmethod
+    def _installed_driver_keys(m: str, query: bool) -> set[tuple[str, str, str, str]]:
+        """
+        映像中已安裝驅動的 (inf 檔名, 版本, 提供者, 類別) 集合
+        query 為 False 時只使用已快取的清單，不為了比對多執行一次 /Get-Drivers；
+        沒有快取或查詢失敗時為空集合
+        """
+        if query:
+            result = DriverManager.get_drivers_in_offline_image(m)
+        else:
+            key = DriverManager._drivers_cache_key(m)
+            result = DriverManager._peek_cache(key) if key else None
+        if not result or not result[0]:
+            return set()
+        return {(os.path.basename(drv["OriginalFileName"]).lower(), drv["Version"],
+                 drv["Provider"].lower(), drv["ClassName"].lower())
+                for drv in result[1] if drv["OriginalFileName"] and drv["Version"]}
+
+    @staticmethod
+    def _inf_key(inf_path: str) -> Optional[tuple[str, str, str, str]]:
+        """
+        讀取 INF 的 [Version] 區段，回傳 (inf 檔名, 版本, 提供者, 類別)；無法判斷時回傳 None
+        oem.inf 之類的通用檔名在不同套件間常重複，因此一併比對提供者與類別
+        """
+        try:
+            with open(inf_path, "rb") as f:
+                raw = f.read()
+            if raw.startswith((b"\xff\xfe", b"\xfe\xff")):
+                text = raw.decode("utf-16")
+            else:
+                text = raw.decode("utf-8-sig", errors="replace")
+            
+            cp = configparser.ConfigParser(strict=False, allow_no_value=True, interpolation=None,
+                                           comment_prefixes=(";",), inline_comment_prefixes=(";",))
+            cp.read_string(text)
+            sections = {sec.lower(): sec for sec in cp.sections()}
+            section = sections.get("version")
+            if not section:
+                return None
+            driver_ver = cp.get(section, "DriverVer", fallback="") or ""
+            provider = cp.get(section, "Provider", fallback="") or ""
+            cls = cp.get(section, "Class", fallback="") or ""
+            # Provider 通常是 %字串代號%，由 [Strings] 區段取得實際名稱
+            if provider.startswith("%") and provider.endswith("%") and "strings" in sections:
+                provider = cp.get(sections["strings"], provider.strip("%"), fallback="") or ""
+        except Exception:
+            return None
+        
+        parts = driver_ver.split(",")
+        provider = provider.strip().strip('"')
+        if len(parts) < 2 or not parts[1].strip() or not provider or not cls:
+            return None
+        return os.path.basename(inf_path).lower(), parts[1].strip(), provider.lower(), cls.strip().lower()
+
     @staticmethod  
     def export_drivers_from_offline_image(mount_dir: str, export_dir: str) -> tuple[bool, str]:
         """
@@ -963,17 +1515,26 @@ class DriverManager:
             
         rc, out, err = DriverManager._run_dism(args)
         if rc == 0:
+            DriverManager.invalidate_cache(e)
             return True, "驅動程式萃取完成"
         return False, err or out
 
     @staticmethod
-    def get_driver_info_from_path(driver_path: str) -> tuple[bool, list[dict], str]:
+    def get_driver_info_from_path(driver_path: str, refresh: bool = False) -> tuple[bool, list[dict], str]:
         """
         取得指定路徑中的驅動程式資訊
+        掃描結果依路徑快取（檢查整棵樹是否變動的成本等同重新掃描），
+        本程式寫入該路徑後以 invalidate_cache 清除；refresh 為 True 時一律重新掃描
         """
         if not os.path.exists(driver_path):
             return False, [], "路徑不存在"
-            
+        key = ("inf", DriverManager._norm_path(driver_path))
+        if refresh:
+            DriverManager.invalidate_cache(driver_path)
+        return DriverManager._cached_call(key, lambda: DriverManager._scan_driver_path(driver_path))
+
+    @staticmethod
+    def _scan_driver_path(driver_path: str) -> tuple[bool, list[dict], str]:
         drivers = []
         try:
             if os.path.isfile(driver_path) and driver_path.lower().endswith('.inf'):
@@ -982,30 +1543,61 @@ class DriverManager:
                 drivers.append(driver_info)
             elif os.path.isdir(driver_path):
                 # 資料夾，搜尋所有 .inf 檔案
-                for root, dirs, files in os.walk(driver_path):
-                    for file in files:
-                        if file.lower().endswith('.inf'):
-                            full_path = os.path.join(root, file)
-                            driver_info = {"path": full_path, "name": file, "folder": root}
-                            drivers.append(driver_info)
+                for e in DriverManager._iter_inf(driver_path):
+                    drivers.append({"path": e.path, "name": e.name, "folder": os.path.dirname(e.path)})
             
             return True, drivers, f"找到 {len(drivers)} 個驅動程式檔案"
         except Exception as e:
             return False, [], f"掃描驅動程式時發生錯誤: {str(e)}"
 
     @staticmethod
-    def get_drivers_in_offline_image(mount_dir: str) -> tuple[bool, list[dict], str]:
+    def _iter_inf(root: str) -> Iterator[os.DirEntry]:
+        """以 os.scandir 遞迴產出 .inf 檔案項目（無法讀取的資料夾略過，同 os.walk）"""
+        try:
+            it = os.scandir(root)
+        except OSError:
+            return
+        with it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False):
+                    yield from DriverManager._iter_inf(e.path)
+                elif e.name.endswith(_INF_SUFFIXES):
+                    yield e
+
+    @staticmethod
+    def get_drivers_in_offline_image(mount_dir: str) -> tuple[bool, tuple[Mapping, ...], str]:
         """
         列出已安裝在離線映像中的驅動程式
+        結果會被快取共用，因此以唯讀的 tuple/MappingProxyType 回傳
         """
         m = DriverManager._norm_path(mount_dir)
+        key = DriverManager._drivers_cache_key(m)
+        if key is None:
+            return DriverManager._query_drivers(m)
+        return DriverManager._cached_call(key, lambda: DriverManager._query_drivers(m))
+
+    @staticmethod
+    def _drivers_cache_key(m: str) -> Optional[tuple]:
+        """
+        映像驅動清單的快取 key：新增/移除驅動套件時會在 FileRepository 下建立/刪除資料夾，
+        以其修改時間作為指紋，其他工具（DISM 命令列等）變動映像後快取也會失效
+        """
+        fingerprint = DriverManager._fingerprint(os.path.join(m, "Windows", "System32", "DriverStore", "FileRepository"))
+        if fingerprint is None:
+            return None
+        return "drivers", m, fingerprint
+
+    @staticmethod
+    def _query_drivers(m: str) -> tuple[bool, tuple[Mapping, ...], str]:
         args = ["/Get-Drivers", f"/Image:{m}"]
         
-        rc, out, err = DriverManager._run_dism(args)
+        # 邊讀邊解析，不必等 DISM 結束後再處理整段輸出
+        parser = _DriverListParser()
+        rc, tail = DriverManager._run_dism_stream(args, parser.feed)
         if rc != 0:
-            return False, [], err or out
+            return False, (), tail
             
-        drivers = DriverManager._parse_drivers(out)
+        drivers = tuple(MappingProxyType(d) for d in parser.close())
         return True, drivers, ""
 
     @staticmethod
@@ -1013,40 +1605,100 @@ class DriverManager:
         """
         解析 DISM 驅動程式輸出
         """
-        drivers: list[dict] = []
-        cur: dict | None = None
-        
+        parser = _DriverListParser()
         for line in text.splitlines():
-            line = line.strip()
-            if not line:
-                continue
-                
-            # 檢測新驅動程式開始
-            if line.startswith("Published Name"):
-                if cur:
-                    drivers.append(cur)
-                cur = {"PublishedName": "", "OriginalFileName": "", "ClassName": "", "Provider": "", "Date": "", "Version": ""}
-                match = re.search(r"Published Name\s*:\s*(.*)", line, re.IGNORECASE)
-                if match:
-                    cur["PublishedName"] = match.group(1).strip()
-                continue
-                
-            if cur is not None:
-                for field in ["OriginalFileName", "ClassName", "Provider", "Date", "Version"]:
-                    pattern = f"{field.replace('Name', ' Name')}\\s*:\\s*(.*)"
-                    match = re.search(pattern, line, re.IGNORECASE)
-                    if match:
-                        cur[field] = match.group(1).strip()
-                        break
-                        
-        if cur:
-            drivers.append(cur)
-            
-        return drivers
+            parser.feed(line)
+        return parser.close()
 
 # -----------------------------
 # GUI 層
 # -----------------------------
+class _MountInfoCache:
+    """WIMManager.get_mount_info 結果的 TTL 快取（兩組 WIM 連續掛載、查詢狀態共用一次 DISM）"""
+    
+    def __init__(self, ttl: float = 5.0):
+        self._ttl = ttl
+        self._t = 0.0
+        self._v: tuple[bool, list[dict], str] | None = None
+        self._lock = threading.Lock()
+    
+    def get(self) -> tuple[bool, list[dict], str]:
+        # 同時有兩個執行緒查詢時只執行一次 DISM
+        with self._lock:
+            now = time.monotonic()
+            if self._v is not None and now - self._t < self._ttl:
+                return self._v
+            result = WIMManager.get_mount_info()
+            if result[0]:
+                self._v, self._t = result, now
+            return result
+    
+    def invalidate(self):
+        self._v = None
+
+
+@dataclass
+class MountRequest:
+    """一次掛載所需的參數（掛載前檢查通過後建立，整路傳給背景執行緒）"""
+    wim: str
+    index: int
+    mdir: str
+    ro: bool
+    # 比對已掛載映像用的正規化路徑；呼叫端已有時直接傳入，否則在此計算一次
+    wim_norm: str = ''
+    mdir_norm: str = ''
+    
+    def __post_init__(self):
+        if not self.wim_norm:
+            self.wim_norm = _mount_key(self.wim)
+        if not self.mdir_norm:
+            self.mdir_norm = _mount_key(self.mdir)
+
+
+def _single_flight(key: str):
+    """同一組 WIM 的掛載 / 卸載進行中時忽略重複點擊。
+    被包裝的處理函式回傳 True 表示已排入背景工作，之後由背景流程結束時呼叫 _end_flight(key)；
+    其他情況（檢查未通過）立即解除。"""
+    def deco(fn):
+        @wraps(fn)
+        def wrap(self, *args, **kwargs):
+            if key in self._busy:
+                self._log("上一個掛載 / 卸載操作尚未完成，請稍候")
+                return
+            self._busy.add(key)
+            for btn in self._flight_buttons[key]:
+                btn.configure(state=tk.DISABLED)
+            started = False
+            try:
+                started = fn(self, *args, **kwargs)
+            finally:
+                if not started:
+                    self._end_flight(key)
+        return wrap
+    return deco
+
+
+# 兩組 WIM 共用流程中，訊息裡指稱該組的前綴
+_SLOT_LABEL = {1: "", 2: "第二個"}
+_SLOT_WIM = {1: "WIM", 2: "第二個 WIM"}
+
+# 日誌視窗保留的最大行數
+_LOG_MAX_LINES = 5000
+# 日誌批次寫入間隔（毫秒）
+_LOG_FLUSH_MS = 33
+
+# 一鍵修復按鈕的工具提示
+_SMART_FIX_TIP = "\n".join([
+    "🔧 智能一鍵修復",
+    "自動診斷並修復所有 WIM 掛載問題",
+    "",
+    "包含功能：",
+    "• 狀態檢查與診斷",
+    "• 清理掛載衝突",
+    "• 修復損壞掛載",
+    "• 系統級清理",
+])
+
 class App(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -1059,11 +1711,78 @@ class App(tk.Tk):
             self._elevate_and_exit()
             return
             
+        # DISM / PowerShell 等外部程序統一交給背景執行緒池，避免阻塞主迴圈
+        self._io_pool = ThreadPoolExecutor(max_workers=2)
+        
+        # get_mount_info 的短暫快取 (時間戳記, 結果)；掛載狀態變動後清除
+        self._mount_info_cache = _MountInfoCache()
+        # 已知的掛載（掛載目錄 -> (WIM 路徑, Index)），None 表示狀態未知需查詢 DISM
+        self._active_mount_dirs: dict[str, tuple[str, str]] | None = None
+        
+        # 單一背景工作執行緒：WIM 資訊、掛載/卸載、狀態檢查等依序執行
+        self._work_q: queue.Queue = queue.Queue()
+        threading.Thread(target=self._worker_loop, daemon=True).start()
+        
+        # 日誌緩衝：任何執行緒都只寫入 deque，由主執行緒批次寫進 Text
+        self._log_buf: deque[str] = deque()
+        self._log_scheduled = False
+        self._ts_sec = -1
+        self._ts_str = ''
+        
+        # 設定變更旗標與延遲寫檔排程
+        self._cfg_dirty = False
+        self._cfg_after: str | None = None
+        
+        # Index 下拉選單目前的選項與上次處理的選擇（相同時不重設 Tk）
+        self._wim1_cached_values: tuple[str, ...] = ()
+        self._wim2_cached_values: tuple[str, ...] = ()
+        self._last_wim1_idx: str | None = None
+        self._last_wim2_idx: str | None = None
+        
+        # 錯誤建議對話框（首次顯示時建立，之後重複使用）
+        self._err_dialog: tk.Toplevel | None = None
+        self._err_title_label: ttk.Label | None = None
+        self._err_text: tk.Text | None = None
+        self._err_message = ''
+        self._err_pending: deque[tuple[str, str, str]] = deque()
+        
+        # 進度對話框（首次顯示時建立，之後重複使用）
+        self._progress_win: tk.Toplevel | None = None
+        self._progress_var: tk.StringVar | None = None
+        
+        # 掛載路徑輸入的延遲同步排程
+        self._mount_after: str | None = None
+        
+        # 工具提示視窗（首次顯示時建立，之後重複使用）
+        self._tooltip: tk.Toplevel | None = None
+        self._tooltip_label: tk.Label | None = None
+        self._tooltip_after: str | None = None
+            
         # 設定檔
         self.cfg = configparser.ConfigParser()
         self._load_config()
+        
+        # 各分頁的變數先建立，之後的事件處理都可直接存取
+        self._init_wim_vars()
+        self._init_driver_vars()
+        # 成功提示改顯示在狀態列（不彈出對話框）
+        self.var_suppress_info_dialogs = tk.BooleanVar(
+            value=_as_bool(self._cfg_get('UI', 'suppress_info_dialogs', '0')))
+        self.status_var = tk.StringVar()
+        
+        # 建構期間先隱藏視窗，全部元件與設定就緒後一次計算版面並顯示
+        self.withdraw()
         self._build_ui()
+        # 掛載 / 卸載進行中的 WIM 組別，以及進行中要停用的按鈕
+        self._busy: set[str] = set()
+        self._flight_buttons = {
+            'wim1': (self.btn_mount, self.btn_unmount),
+            'wim2': (self.btn_mount2, self.btn_unmount2),
+        }
         self._load_wim_config()  # 載入 WIM 分頁配置（在 UI 建構後）
+        self.update_idletasks()
+        self.deiconify()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
         self._log("應用程式已啟動 (管理員權限)")  # 修改啟動訊息
 
     # UI 組件
@@ -1094,10 +1813,11 @@ class App(tk.Tk):
         wim_sub_notebook.add(wim2_frame, text="掛載 #2")
         self._build_wim2_tab(wim2_frame)
 
-        # 分頁 2：Driver 管理（使用子分頁）
-        driver_frame = ttk.Frame(self.notebook)
-        self.notebook.add(driver_frame, text="Driver 管理")
-        self._build_driver_tab(driver_frame)
+        # 分頁 2：Driver 管理（使用子分頁，首次切換到此分頁時才建立元件）
+        self._driver_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self._driver_frame, text="Driver 管理")
+        self._driver_built = False
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
 
         # Log 視窗（共用）
         log_frame = ttk.LabelFrame(main_frame, text="狀態 / 訊息", padding=8)
@@ -1115,11 +1835,50 @@ class App(tk.Tk):
         copyright_frame = ttk.Frame(main_frame)
         copyright_frame.pack(fill=tk.X)
         
+        # 狀態列與「不彈出成功提示」選項
+        ttk.Checkbutton(copyright_frame, text="不彈出成功提示", variable=self.var_suppress_info_dialogs,
+                        command=self._schedule_save).pack(side=tk.LEFT, padx=(8, 0))
+        ttk.Label(copyright_frame, textvariable=self.status_var, foreground='gray').pack(side=tk.LEFT, padx=(8, 0))
+        
         # 使用 Frame 來控制對齊
         copyright_label = tk.Label(copyright_frame, text="Developed by RexPeng", 
                                  font=('Arial', 8), fg='gray', anchor='e')
         copyright_label.pack(side=tk.RIGHT, padx=(0, 8), pady=(2, 4))
 
+    def _init_wim_vars(self):
+        """WIM#1 / WIM#2 分頁的變數"""
+        self.var_wim = tk.StringVar()
+        self.var_wim_index = tk.StringVar()
+        self.var_wim_readonly = tk.BooleanVar(value=True)
+        self.var_mount_dir = tk.StringVar()
+        self.var_unmount_commit = tk.BooleanVar(value=False)
+        self.wim1_available_indices: tuple[str, ...] = ()
+        
+        self.var_wim2 = tk.StringVar()
+        self.var_wim_index2 = tk.StringVar()
+        self.var_wim_readonly2 = tk.BooleanVar(value=True)
+        self.var_mount_dir2 = tk.StringVar()
+        self.var_unmount_commit2 = tk.BooleanVar(value=False)
+        self.wim2_available_indices: tuple[str, ...] = ()
+        
+        # 路徑變數寫入時就先正規化，比對時直接讀取
+        self._path_keys: dict[str, str] = {}
+        self._track_path_key('wim', self.var_wim)
+        self._track_path_key('mount_dir', self.var_mount_dir)
+        self._track_path_key('wim2', self.var_wim2)
+        self._track_path_key('mount_dir2', self.var_mount_dir2)
+
+    def _track_path_key(self, name: str, var: tk.StringVar):
+        """var 每次寫入時更新 self._path_keys[name]（_mount_key 正規化後的路徑）"""
+        def update(*_):
+            self._path_keys[name] = _mount_key(var.get().strip())
+        var.trace_add('write', update)
+        update()
+
+    def _slot_mount_var(self, slot: int) -> tk.StringVar:
+        """WIM#1 / WIM#2 的掛載路徑變數"""
+        return self.var_mount_dir if slot == 1 else self.var_mount_dir2
+
     # WIM 掛載分頁
     def _build_wim1_tab(self, parent: tk.Misc):
         # 使用 padding 的 frame
@@ -1134,7 +1893,6 @@ class App(tk.Tk):
         row1 = ttk.Frame(wim1_frame)
         row1.pack(fill=tk.X, pady=(0, 10))
         ttk.Label(row1, text="WIM 檔案", width=12).pack(side=tk.LEFT)
-        self.var_wim = tk.StringVar()
         ent_wim = ttk.Entry(row1, textvariable=self.var_wim, width=45)
         ent_wim.pack(side=tk.LEFT, padx=(8, 6), fill=tk.X, expand=True)
         
@@ -1148,19 +1906,16 @@ class App(tk.Tk):
         row2 = ttk.Frame(wim1_frame)
         row2.pack(fill=tk.X, pady=(0, 10))
         ttk.Label(row2, text="Index", width=12).pack(side=tk.LEFT)
-        self.var_wim_index = tk.StringVar()
         self.cbo_wim_index = ttk.Combobox(row2, textvariable=self.var_wim_index, width=8, state="readonly")
         self.cbo_wim_index.pack(side=tk.LEFT, padx=(8, 20))
         self.cbo_wim_index.bind('<<ComboboxSelected>>', self._on_wim1_index_changed)
 
-        self.var_wim_readonly = tk.BooleanVar(value=True)
-        ttk.Checkbutton(row2, text="唯讀掛載 (ReadOnly)", variable=self.var_wim_readonly, command=self._save_config).pack(side=tk.LEFT)
+        ttk.Checkbutton(row2, text="唯讀掛載 (ReadOnly)", variable=self.var_wim_readonly, command=self._schedule_save).pack(side=tk.LEFT)
 
         # 行 3：掛載資料夾
         row3 = ttk.Frame(wim1_frame)
         row3.pack(fill=tk.X, pady=(0, 10))
         ttk.Label(row3, text="掛載資料夾", width=12).pack(side=tk.LEFT)
-        self.var_mount_dir = tk.StringVar()
         # 監聽掛載路徑變更，自動同步到 Driver 分頁
         self.var_mount_dir.trace_add('write', self._on_mount_dir_changed)
         ent_mdir = ttk.Entry(row3, textvariable=self.var_mount_dir, width=40)
@@ -1177,13 +1932,12 @@ class App(tk.Tk):
         row4 = ttk.Frame(wim1_frame)
         row4.pack(fill=tk.X, pady=(0, 10))
         ttk.Label(row4, text="卸載模式", width=12).pack(side=tk.LEFT)
-        self.var_unmount_commit = tk.BooleanVar(value=False)
         
         # 卸載選項組
         unmount_options_frame = ttk.Frame(row4)
         unmount_options_frame.pack(side=tk.LEFT, padx=(8, 0))
-        ttk.Radiobutton(unmount_options_frame, text="丟棄變更 (/Discard)", variable=self.var_unmount_commit, value=False, command=self._save_config).pack(side=tk.LEFT)
-        ttk.Radiobutton(unmount_options_frame, text="提交變更 (/Commit)", variable=self.var_unmount_commit, value=True, command=self._save_config).pack(side=tk.LEFT, padx=(20, 0))
+        ttk.Radiobutton(unmount_options_frame, text="丟棄變更 (/Discard)", variable=self.var_unmount_commit, value=False, command=self._schedule_save).pack(side=tk.LEFT)
+        ttk.Radiobutton(unmount_options_frame, text="提交變更 (/Commit)", variable=self.var_unmount_commit, value=True, command=self._schedule_save).pack(side=tk.LEFT, padx=(20, 0))
 
         # 行 5：動作按鈕
         row5 = ttk.Frame(wim1_frame)
@@ -1192,66 +1946,22 @@ class App(tk.Tk):
         # WIM 操作按鈕組
         wim_action_frame = ttk.Frame(row5)
         wim_action_frame.pack(side=tk.LEFT)
-        ttk.Button(wim_action_frame, text="掛載 WIM", command=self._on_wim_mount, width=12).pack(side=tk.LEFT)
-        ttk.Button(wim_action_frame, text="卸載 WIM", command=self._on_wim_unmount, width=12).pack(side=tk.LEFT, padx=(8, 0))
-        ttk.Button(wim_action_frame, text="關閉檔案總管", command=self._on_close_explorer).pack(side=tk.LEFT, padx=(8, 0))
+        self.btn_mount = ttk.Button(wim_action_frame, text="掛載 WIM", command=self._on_wim_mount, width=12)
+        self.btn_mount.pack(side=tk.LEFT)
+        self.btn_unmount = ttk.Button(wim_action_frame, text="卸載 WIM", command=self._on_wim_unmount, width=12)
+        self.btn_unmount.pack(side=tk.LEFT, padx=(8, 0))
+        self.btn_close_explorer = ttk.Button(wim_action_frame, text="關閉檔案總管", command=self._on_close_explorer)
+        self.btn_close_explorer.pack(side=tk.LEFT, padx=(8, 0))
         
         # 一鍵修復按鈕 - 整合所有診斷和修復功能
         smart_fix_btn = ttk.Button(wim_action_frame, text="🔧 一鍵修復", 
                                   command=self._on_smart_cleanup_fix, width=12)
         smart_fix_btn.pack(side=tk.LEFT, padx=(8, 0))
+        self.btn_smart_fix = smart_fix_btn
         
-        # 添加工具提示
-        tooltip_window = None  # 用於追蹤當前的工具提示窗口
-        
-        def show_tooltip(event):
-            nonlocal tooltip_window
-            # 如果已經有工具提示窗口存在，先關閉它
-            if tooltip_window:
-                tooltip_window.destroy()
-                tooltip_window = None
-            
-            tooltip_window = tk.Toplevel()
-            tooltip_window.wm_overrideredirect(True)
-            tooltip_window.wm_geometry(f"+{event.x_root+10}+{event.y_root+10}")
-            
-            # 使用 Frame 來控制寬度和添加邊距
-            frame = tk.Frame(tooltip_window, bg="lightyellow", relief="solid", bd=1)
-            frame.pack()
-            
-            # 分行顯示，避免文字過長
-            lines = [
-                "🔧 智能一鍵修復",
-                "自動診斷並修復所有 WIM 掛載問題",
-                "",
-                "包含功能：",
-                "• 狀態檢查與診斷", 
-                "• 清理掛載衝突",
-                "• 修復損壞掛載",
-                "• 系統級清理"
-            ]
-            
-            for line in lines:
-                label = tk.Label(frame, text=line, bg="lightyellow", 
-                               font=("Arial", 9), anchor="w", justify="left")
-                label.pack(anchor="w", padx=8, pady=1)
-            
-            def hide_tooltip():
-                nonlocal tooltip_window
-                if tooltip_window:
-                    tooltip_window.destroy()
-                    tooltip_window = None
-                    
-            tooltip_window.after(4000, hide_tooltip)  # 延長顯示時間
-        
-        def hide_tooltip_on_leave(event):
-            nonlocal tooltip_window
-            if tooltip_window:
-                tooltip_window.destroy()
-                tooltip_window = None
-        
-        smart_fix_btn.bind("<Enter>", show_tooltip)
-        smart_fix_btn.bind("<Leave>", hide_tooltip_on_leave)
+        # 添加工具提示（共用同一個提示視窗）
+        smart_fix_btn.bind("<Enter>", lambda e: self._show_tooltip(_SMART_FIX_TIP, e.x_root + 10, e.y_root + 10))
+        smart_fix_btn.bind("<Leave>", lambda e: self._hide_tooltip())
 
     def _build_wim2_tab(self, parent: tk.Misc):
         # 使用 padding 的 frame
@@ -1266,7 +1976,6 @@ class App(tk.Tk):
         row1_2 = ttk.Frame(wim2_frame)
         row1_2.pack(fill=tk.X, pady=(0, 10))
         ttk.Label(row1_2, text="WIM 檔案", width=12).pack(side=tk.LEFT)
-        self.var_wim2 = tk.StringVar()
         ent_wim2 = ttk.Entry(row1_2, textvariable=self.var_wim2, width=45)
         ent_wim2.pack(side=tk.LEFT, padx=(8, 6), fill=tk.X, expand=True)
         
@@ -1280,19 +1989,16 @@ class App(tk.Tk):
         row2_2 = ttk.Frame(wim2_frame)
         row2_2.pack(fill=tk.X, pady=(0, 10))
         ttk.Label(row2_2, text="Index", width=12).pack(side=tk.LEFT)
-        self.var_wim_index2 = tk.StringVar()
         self.cbo_wim_index2 = ttk.Combobox(row2_2, textvariable=self.var_wim_index2, width=8, state="readonly")
         self.cbo_wim_index2.pack(side=tk.LEFT, padx=(8, 20))
         self.cbo_wim_index2.bind('<<ComboboxSelected>>', self._on_wim2_index_changed)
 
-        self.var_wim_readonly2 = tk.BooleanVar(value=True)
-        ttk.Checkbutton(row2_2, text="唯讀掛載 (ReadOnly)", variable=self.var_wim_readonly2, command=self._save_config).pack(side=tk.LEFT)
+        ttk.Checkbutton(row2_2, text="唯讀掛載 (ReadOnly)", variable=self.var_wim_readonly2, command=self._schedule_save).pack(side=tk.LEFT)
 
         # 行 3：掛載資料夾 #2
         row3_2 = ttk.Frame(wim2_frame)
         row3_2.pack(fill=tk.X, pady=(0, 10))
         ttk.Label(row3_2, text="掛載資料夾", width=12).pack(side=tk.LEFT)
-        self.var_mount_dir2 = tk.StringVar()
         ent_mdir2 = ttk.Entry(row3_2, textvariable=self.var_mount_dir2, width=40)
         ent_mdir2.pack(side=tk.LEFT, padx=(8, 6), fill=tk.X, expand=True)
         
@@ -1307,13 +2013,12 @@ class App(tk.Tk):
         row4_2 = ttk.Frame(wim2_frame)
         row4_2.pack(fill=tk.X, pady=(0, 10))
         ttk.Label(row4_2, text="卸載模式", width=12).pack(side=tk.LEFT)
-        self.var_unmount_commit2 = tk.BooleanVar(value=False)
         
         # 卸載選項組 #2
         unmount2_options_frame = ttk.Frame(row4_2)
         unmount2_options_frame.pack(side=tk.LEFT, padx=(8, 0))
-        ttk.Radiobutton(unmount2_options_frame, text="丟棄變更 (/Discard)", variable=self.var_unmount_commit2, value=False, command=self._save_config).pack(side=tk.LEFT)
-        ttk.Radiobutton(unmount2_options_frame, text="提交變更 (/Commit)", variable=self.var_unmount_commit2, value=True, command=self._save_config).pack(side=tk.LEFT, padx=(20, 0))
+        ttk.Radiobutton(unmount2_options_frame, text="丟棄變更 (/Discard)", variable=self.var_unmount_commit2, value=False, command=self._schedule_save).pack(side=tk.LEFT)
+        ttk.Radiobutton(unmount2_options_frame, text="提交變更 (/Commit)", variable=self.var_unmount_commit2, value=True, command=self._schedule_save).pack(side=tk.LEFT, padx=(20, 0))
 
         # 行 5：動作按鈕 #2
         row5_2 = ttk.Frame(wim2_frame)
@@ -1322,104 +2027,96 @@ class App(tk.Tk):
         # WIM 操作按鈕組 #2
         wim2_action_frame = ttk.Frame(row5_2)
         wim2_action_frame.pack(side=tk.LEFT)
-        ttk.Button(wim2_action_frame, text="掛載 WIM", command=self._on_wim_mount2, width=12).pack(side=tk.LEFT)
-        ttk.Button(wim2_action_frame, text="卸載 WIM", command=self._on_wim_unmount2, width=12).pack(side=tk.LEFT, padx=(8, 0))
-        ttk.Button(wim2_action_frame, text="關閉檔案總管", command=self._on_close_explorer2).pack(side=tk.LEFT, padx=(8, 0))
+        self.btn_mount2 = ttk.Button(wim2_action_frame, text="掛載 WIM", command=self._on_wim_mount2, width=12)
+        self.btn_mount2.pack(side=tk.LEFT)
+        self.btn_unmount2 = ttk.Button(wim2_action_frame, text="卸載 WIM", command=self._on_wim_unmount2, width=12)
+        self.btn_unmount2.pack(side=tk.LEFT, padx=(8, 0))
+        self.btn_close_explorer2 = ttk.Button(wim2_action_frame, text="關閉檔案總管", command=self._on_close_explorer2)
+        self.btn_close_explorer2.pack(side=tk.LEFT, padx=(8, 0))
         
         # 一鍵修復按鈕 - 整合所有診斷和修復功能
         smart_fix_btn2 = ttk.Button(wim2_action_frame, text="🔧 一鍵修復", 
                                    command=self._on_smart_cleanup_fix, width=12)
         smart_fix_btn2.pack(side=tk.LEFT, padx=(8, 0))
+        self.btn_smart_fix2 = smart_fix_btn2
         
-        # 添加工具提示
-        tooltip_window2 = None  # 用於追蹤當前的工具提示窗口
-        
-        def show_tooltip2(event):
-            nonlocal tooltip_window2
-            # 如果已經有工具提示窗口存在，先關閉它
-            if tooltip_window2:
-                tooltip_window2.destroy()
-                tooltip_window2 = None
-            
-            tooltip_window2 = tk.Toplevel()
-            tooltip_window2.wm_overrideredirect(True)
-            tooltip_window2.wm_geometry(f"+{event.x_root+10}+{event.y_root+10}")
+        # 添加工具提示（共用同一個提示視窗）
+        smart_fix_btn2.bind("<Enter>", lambda e: self._show_tooltip(_SMART_FIX_TIP, e.x_root + 10, e.y_root + 10))
+        smart_fix_btn2.bind("<Leave>", lambda e: self._hide_tooltip())
+
+    def _show_tooltip(self, text: str, x: int, y: int):
+        """在 (x, y) 顯示工具提示，4 秒後自動隱藏"""
+        if self._tooltip is None:
+            self._tooltip = tk.Toplevel(self)
+            self._tooltip.wm_overrideredirect(True)
             
             # 使用 Frame 來控制寬度和添加邊距
-            frame = tk.Frame(tooltip_window2, bg="lightyellow", relief="solid", bd=1)
+            frame = tk.Frame(self._tooltip, bg="lightyellow", relief="solid", bd=1)
             frame.pack()
-            
-            # 分行顯示，避免文字過長
-            lines = [
-                "🔧 智能一鍵修復",
-                "自動診斷並修復所有 WIM 掛載問題",
-                "",
-                "包含功能：",
-                "• 狀態檢查與診斷", 
-                "• 清理掛載衝突",
-                "• 修復損壞掛載",
-                "• 系統級清理"
-            ]
-            
-            for line in lines:
-                label = tk.Label(frame, text=line, bg="lightyellow", 
-                               font=("Arial", 9), anchor="w", justify="left")
-                label.pack(anchor="w", padx=8, pady=1)
-            
-            def hide_tooltip():
-                nonlocal tooltip_window2
-                if tooltip_window2:
-                    tooltip_window2.destroy()
-                    tooltip_window2 = None
-                    
-            tooltip_window2.after(4000, hide_tooltip)  # 延長顯示時間
-        
-        def hide_tooltip2_on_leave(event):
-            nonlocal tooltip_window2
-            if tooltip_window2:
-                tooltip_window2.destroy()
-                tooltip_window2 = None
-        
-        smart_fix_btn2.bind("<Enter>", show_tooltip2)
-        smart_fix_btn2.bind("<Leave>", hide_tooltip2_on_leave)
+            self._tooltip_label = tk.Label(frame, bg="lightyellow", font=("Arial", 9),
+                                           anchor="w", justify="left")
+            self._tooltip_label.pack(anchor="w", padx=8, pady=2)
+            
+        self._tooltip_label.configure(text=text)
+        self._tooltip.wm_geometry(f"+{x}+{y}")
+        self._tooltip.deiconify()
+        self._tooltip.lift()
+        
+        if self._tooltip_after:
+            self.after_cancel(self._tooltip_after)
+        self._tooltip_after = self.after(4000, self._hide_tooltip)
+
+    def _hide_tooltip(self):
+        if self._tooltip_after:
+            self.after_cancel(self._tooltip_after)
+            self._tooltip_after = None
+        if self._tooltip is not None:
+            self._tooltip.withdraw()
 
     # WIM 分頁配置載入
     def _load_wim_config(self):
         """載入 WIM 分頁的配置設定"""
-        wim = self._cfg_get('WIM', 'wim_file')
-        if wim:
-            self.var_wim.set(wim)
-        mdir = self._cfg_get('WIM', 'mount_dir')
-        if mdir:
-            self.var_mount_dir.set(mdir)
-        idx = self._cfg_get('WIM', 'index')
-        if idx:
-            self.var_wim_index.set(idx)
-        ro = self._cfg_get('WIM', 'readonly')
-        if ro is not None:
-            self.var_wim_readonly.set(ro.lower() in ('1', 'true', 'yes', 'on'))
-        commit = self._cfg_get('WIM', 'unmount_commit')
-        if commit is not None:
-            self.var_unmount_commit.set(commit.lower() in ('1', 'true', 'yes', 'on'))
+        if v := self._cfg_get('WIM', 'wim_file'):
+            self.var_wim.set(v)
+        if v := self._cfg_get('WIM', 'mount_dir'):
+            self.var_mount_dir.set(v)
+        if v := self._cfg_get('WIM', 'index'):
+            self._set_wim_index(1, v)
+        if (v := self._cfg_get('WIM', 'readonly')) is not None:
+            self.var_wim_readonly.set(_as_bool(v))
+        if (v := self._cfg_get('WIM', 'unmount_commit')) is not None:
+            self.var_unmount_commit.set(_as_bool(v))
             
         # 載入設定值 - WIM #2
-        wim2 = self._cfg_get('WIM2', 'wim_file')
-        if wim2:
-            self.var_wim2.set(wim2)
-        mdir2 = self._cfg_get('WIM2', 'mount_dir')
-        if mdir2:
-            self.var_mount_dir2.set(mdir2)
-        idx2 = self._cfg_get('WIM2', 'index')
-        if idx2:
-            self.var_wim_index2.set(idx2)
-        ro2 = self._cfg_get('WIM2', 'readonly')
-        if ro2 is not None:
-            self.var_wim_readonly2.set(ro2.lower() in ('1', 'true', 'yes', 'on'))
-        commit2 = self._cfg_get('WIM2', 'unmount_commit')
-        if commit2 is not None:
-            self.var_unmount_commit2.set(commit2.lower() in ('1', 'true', 'yes', 'on'))
+        if v := self._cfg_get('WIM2', 'wim_file'):
+            self.var_wim2.set(v)
+        if v := self._cfg_get('WIM2', 'mount_dir'):
+            self.var_mount_dir2.set(v)
+        if v := self._cfg_get('WIM2', 'index'):
+            self._set_wim_index(2, v)
+        if (v := self._cfg_get('WIM2', 'readonly')) is not None:
+            self.var_wim_readonly2.set(_as_bool(v))
+        if (v := self._cfg_get('WIM2', 'unmount_commit')) is not None:
+            self.var_unmount_commit2.set(_as_bool(v))
 
     # Driver 管理分頁（使用子分頁：萃取和安裝）
+    def _init_driver_vars(self):
+        """Driver 分頁的變數先建立並載入設定，讓分頁建立前也能同步路徑與存檔"""
+        self.var_extract_source = tk.StringVar()
+        self.var_extract_output = tk.StringVar()
+        self.var_driver_mount_dir = tk.StringVar()
+        self.var_driver_source = tk.StringVar()
+        self.var_driver_recurse = tk.BooleanVar(value=True)
+        self.var_driver_force_unsigned = tk.BooleanVar(value=False)
+        self._track_path_key('driver_mount_dir', self.var_driver_mount_dir)
+        self._load_driver_config()
+
+    def _on_tab_changed(self, event=None):
+        """第一次切換到 Driver 分頁時才建立其元件"""
+        if not self._driver_built and self.notebook.select() == str(self._driver_frame):
+            self._driver_built = True
+            self._build_driver_tab(self._driver_frame)
+
     def _build_driver_tab(self, parent: tk.Misc):
         # 建立子分頁
         driver_sub_notebook = ttk.Notebook(parent)
@@ -1435,15 +2132,11 @@ class App(tk.Tk):
         driver_sub_notebook.add(install_frame, text="驅動安裝")
         self._build_install_subtab(install_frame)
 
-        # 載入設定
-        self._load_driver_config()
-
     def _build_extract_subtab(self, parent: tk.Misc):
         # 來源 WIM 檔案路徑
         row1 = ttk.Frame(parent)
         row1.pack(fill=tk.X, pady=(8, 12), padx=8)
         ttk.Label(row1, text="來源 WIM 檔案", width=12).pack(side=tk.LEFT)
-        self.var_extract_source = tk.StringVar()
         ent_extract_source = ttk.Entry(row1, textvariable=self.var_extract_source, width=40)
         ent_extract_source.pack(side=tk.LEFT, padx=(8, 6), fill=tk.X, expand=True)
         
@@ -1458,7 +2151,6 @@ class App(tk.Tk):
         row2 = ttk.Frame(parent)
         row2.pack(fill=tk.X, pady=(0, 12), padx=8)
         ttk.Label(row2, text="驅動萃取目錄", width=12).pack(side=tk.LEFT)
-        self.var_extract_output = tk.StringVar()
         ent_extract_output = ttk.Entry(row2, textvariable=self.var_extract_output, width=40)
         ent_extract_output.pack(side=tk.LEFT, padx=(8, 6), fill=tk.X, expand=True)
         
@@ -1474,7 +2166,8 @@ class App(tk.Tk):
         row3.pack(fill=tk.X, pady=(0, 8), padx=8)
         extract_action_frame = ttk.Frame(row3)
         extract_action_frame.pack(side=tk.LEFT)
-        ttk.Button(extract_action_frame, text="萃取驅動程式", command=self._on_extract_drivers, width=15).pack(side=tk.LEFT)
+        self.btn_extract_drivers = ttk.Button(extract_action_frame, text="萃取驅動程式", command=self._on_extract_drivers, width=15)
+        self.btn_extract_drivers.pack(side=tk.LEFT)
         ttk.Button(extract_action_frame, text="查看萃取結果", command=self._on_view_extracted_drivers).pack(side=tk.LEFT, padx=(10, 0))
 
     def _build_install_subtab(self, parent: tk.Misc):
@@ -1482,7 +2175,6 @@ class App(tk.Tk):
         row1 = ttk.Frame(parent)
         row1.pack(fill=tk.X, pady=(8, 12), padx=8)
         ttk.Label(row1, text="目標映像路徑", width=12).pack(side=tk.LEFT)
-        self.var_driver_mount_dir = tk.StringVar()
         ent_driver_mount = ttk.Entry(row1, textvariable=self.var_driver_mount_dir, width=40)
         ent_driver_mount.pack(side=tk.LEFT, padx=(8, 6), fill=tk.X, expand=True)
         
@@ -1498,7 +2190,6 @@ class App(tk.Tk):
         row2 = ttk.Frame(parent)
         row2.pack(fill=tk.X, pady=(0, 12), padx=8)
         ttk.Label(row2, text="驅動程式來源", width=12).pack(side=tk.LEFT)
-        self.var_driver_source = tk.StringVar()
         ent_driver_source = ttk.Entry(row2, textvariable=self.var_driver_source, width=40)
         ent_driver_source.pack(side=tk.LEFT, padx=(8, 6), fill=tk.X, expand=True)
         
@@ -1517,11 +2208,9 @@ class App(tk.Tk):
         # 安裝選項框
         options_frame = ttk.Frame(row3)
         options_frame.pack(side=tk.LEFT, padx=(8, 0))
-        self.var_driver_recurse = tk.BooleanVar(value=True)
-        ttk.Checkbutton(options_frame, text="遞迴搜尋子資料夾 (/Recurse)", variable=self.var_driver_recurse, command=self._save_config).pack(side=tk.LEFT)
+        ttk.Checkbutton(options_frame, text="遞迴搜尋子資料夾 (/Recurse)", variable=self.var_driver_recurse, command=self._schedule_save).pack(side=tk.LEFT)
         
-        self.var_driver_force_unsigned = tk.BooleanVar(value=False)
-        ttk.Checkbutton(options_frame, text="強制未簽署驱動 (/ForceUnsigned)", variable=self.var_driver_force_unsigned, command=self._save_config).pack(side=tk.LEFT, padx=(20, 0))
+        ttk.Checkbutton(options_frame, text="強制未簽署驱動 (/ForceUnsigned)", variable=self.var_driver_force_unsigned, command=self._schedule_save).pack(side=tk.LEFT, padx=(20, 0))
 
         # 安裝操作按鈕
         row4 = ttk.Frame(parent)
@@ -1530,45 +2219,75 @@ class App(tk.Tk):
         # 驅動操作按鈕組
         driver_action_frame = ttk.Frame(row4)
         driver_action_frame.pack(side=tk.LEFT)
-        ttk.Button(driver_action_frame, text="安裝驅動程式", command=self._on_install_driver, width=15).pack(side=tk.LEFT)
-        ttk.Button(driver_action_frame, text="列出已安裝驅動", command=self._on_list_drivers, width=15).pack(side=tk.LEFT, padx=(10, 0))
+        self.btn_install_driver = ttk.Button(driver_action_frame, text="安裝驅動程式", command=self._on_install_driver, width=15)
+        self.btn_install_driver.pack(side=tk.LEFT)
+        self.btn_list_drivers = ttk.Button(driver_action_frame, text="列出已安裝驅動", command=self._on_list_drivers, width=15)
+        self.btn_list_drivers.pack(side=tk.LEFT, padx=(10, 0))
 
     def _load_driver_config(self):
         """載入驅動程式相關設定"""
         # 載入安裝設定
-        driver_mount = self._cfg_get('DRIVER', 'mount_dir')
-        if driver_mount:
-            self.var_driver_mount_dir.set(driver_mount)
+        if v := self._cfg_get('DRIVER', 'mount_dir'):
+            self.var_driver_mount_dir.set(v)
         else:
             # 如果沒有設定且 WIM 路徑已設定，則自動同步
             wim_mount = self._cfg_get('WIM', 'mount_dir')
             if wim_mount:
                 self.var_driver_mount_dir.set(wim_mount)
                 
-        driver_source = self._cfg_get('DRIVER', 'source_path')
-        if driver_source:
-            self.var_driver_source.set(driver_source)
-        recurse = self._cfg_get('DRIVER', 'recurse')
-        if recurse is not None:
-            self.var_driver_recurse.set(recurse.lower() in ('1', 'true', 'yes', 'on'))
-        force_unsigned = self._cfg_get('DRIVER', 'force_unsigned')
-        if force_unsigned is not None:
-            self.var_driver_force_unsigned.set(force_unsigned.lower() in ('1', 'true', 'yes', 'on'))
+        if v := self._cfg_get('DRIVER', 'source_path'):
+            self.var_driver_source.set(v)
+        if (v := self._cfg_get('DRIVER', 'recurse')) is not None:
+            self.var_driver_recurse.set(_as_bool(v))
+        if (v := self._cfg_get('DRIVER', 'force_unsigned')) is not None:
+            self.var_driver_force_unsigned.set(_as_bool(v))
         
         # 載入萃取設定
-        extract_source = self._cfg_get('EXTRACT', 'source_path')
-        if extract_source:
-            self.var_extract_source.set(extract_source)
-        
-        extract_output = self._cfg_get('EXTRACT', 'output_path') 
-        if extract_output:
-            self.var_extract_output.set(extract_output)
+        if v := self._cfg_get('EXTRACT', 'source_path'):
+            self.var_extract_source.set(v)
+        if v := self._cfg_get('EXTRACT', 'output_path'):
+            self.var_extract_output.set(v)
 
     # 工具方法
     def _log(self, msg: str):
-        ts = datetime.now().strftime('%H:%M:%S')
+        # 同一秒內的多筆日誌共用已格式化的時間字串
+        sec = int(time.time())
+        if sec != self._ts_sec:
+            self._ts_sec = sec
+            self._ts_str = time.strftime('%H:%M:%S', time.localtime(sec))
+        self._log_buf.append(f"[{self._ts_str}] {msg}\n")
+        if not self._log_scheduled:
+            # 最多每 33ms（約 30 fps）重繪一次，大量輸出時讓畫面稍微落後即可
+            self._log_scheduled = True
+            self.after(_LOG_FLUSH_MS, self._flush_log)
+
+    def _info(self, title: str, msg: str):
+        """成功 / 完成提示；使用者選擇不彈出時改寫到狀態列（錯誤與警告仍使用對話框）"""
+        if self.var_suppress_info_dialogs.get():
+            self.status_var.set(f"{title}：{msg.splitlines()[0] if msg else ''}")
+        else:
+            messagebox.showinfo(title, msg)
+
+    def _log_block(self, msg: str):
+        """多行訊息略過空白行後合併為一筆日誌"""
+        text = "\n".join(line for line in msg.splitlines() if line.strip())
+        if text:
+            self._log(text)
+
+    def _flush_log(self):
+        """一次寫入所有待處理的日誌行，並限制 Text 的總行數"""
+        self._log_scheduled = False
+        lines = []
+        while self._log_buf:
+            lines.append(self._log_buf.popleft())
+        if not lines:
+            return
+            
         self.txt.configure(state=tk.NORMAL)
-        self.txt.insert(tk.END, f"[{ts}] {msg}\n")
+        self.txt.insert(tk.END, "".join(lines))
+        end_line = int(self.txt.index('end-1c').split('.')[0])
+        if end_line > _LOG_MAX_LINES:
+            self.txt.delete('1.0', f'{end_line - _LOG_MAX_LINES + 1}.0')
         self.txt.see(tk.END)
         self.txt.configure(state=tk.DISABLED)
 
@@ -1579,19 +2298,53 @@ class App(tk.Tk):
         error_type, advice, solutions = WIMManager.get_error_solution_advice(error_message)
         
         # 構建完整的錯誤訊息
-        full_message = f"錯誤詳情:\n{error_message}\n\n"
-        full_message += f"錯誤類型: {error_type}\n"
-        full_message += f"說明: {advice}\n\n"
-        full_message += "建議解決方案:\n"
-        for solution in solutions:
-            full_message += f"{solution}\n"
-        
-        # 使用自定義對話框顯示
-        dialog = tk.Toplevel(self)
+        parts = [
+            "錯誤詳情:", error_message, "",
+            f"錯誤類型: {error_type}",
+            f"說明: {advice}", "",
+            "建議解決方案:",
+            *solutions,
+        ]
+        full_message = "\n".join(parts)
+        
+        # 使用自定義對話框顯示（非模態，重複使用同一個視窗）
+        if self._err_dialog is None:
+            self._build_err_dialog()
+        elif self._err_dialog.state() != "withdrawn":
+            # 正在顯示前一個錯誤時排隊，關閉後依序顯示
+            self._err_pending.append((title, error_type, full_message))
+            return
+        self._display_error(title, error_type, full_message)
+
+    def _display_error(self, title: str, error_type: str, full_message: str):
+        dialog = self._err_dialog
+        self._err_message = full_message
+        
         dialog.title(f"{title} - 解決建議")
+        self._err_title_label.configure(text=f"{title} - {error_type}")
+        self._err_text.configure(state="normal")
+        self._err_text.delete("1.0", tk.END)
+        self._err_text.insert("1.0", full_message)
+        self._err_text.configure(state="disabled")  # 只讀
+        
+        dialog.deiconify()
+        dialog.lift()
+        dialog.focus_set()
+
+    def _show_next_error_or_hide(self):
+        """關閉錯誤對話框：有排隊中的錯誤就顯示下一個，否則隱藏以便重複使用"""
+        if self._err_pending:
+            self._display_error(*self._err_pending.popleft())
+        else:
+            self._err_dialog.withdraw()
+
+    def _build_err_dialog(self):
+        """建立錯誤建議對話框（只在第一次顯示時建立）"""
+        dialog = tk.Toplevel(self)
+        dialog.withdraw()
         dialog.geometry("600x400")
         dialog.resizable(True, True)
-        dialog.grab_set()  # 模態對話框
+        dialog.protocol("WM_DELETE_WINDOW", self._show_next_error_or_hide)
         
         # 主框架
         main_frame = ttk.Frame(dialog)
@@ -1602,25 +2355,21 @@ class App(tk.Tk):
         title_frame.pack(fill=tk.X, pady=(0, 10))
         
         ttk.Label(title_frame, text="⚠️", font=("Arial", 24)).pack(side=tk.LEFT, padx=(0, 10))
-        ttk.Label(title_frame, text=f"{title} - {error_type}", 
-                 font=("Arial", 14, "bold"), foreground="red").pack(side=tk.LEFT)
+        self._err_title_label = ttk.Label(title_frame, font=("Arial", 14, "bold"), foreground="red")
+        self._err_title_label.pack(side=tk.LEFT)
         
         # 滾動文本框
         text_frame = ttk.Frame(main_frame)
         text_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
         
         # 創建文本框和滾動條
-        text_widget = tk.Text(text_frame, wrap=tk.WORD, font=("Consolas", 10))
-        scrollbar = ttk.Scrollbar(text_frame, orient=tk.VERTICAL, command=text_widget.yview)
-        text_widget.configure(yscrollcommand=scrollbar.set)
+        self._err_text = tk.Text(text_frame, wrap=tk.WORD, font=("Consolas", 10))
+        scrollbar = ttk.Scrollbar(text_frame, orient=tk.VERTICAL, command=self._err_text.yview)
+        self._err_text.configure(yscrollcommand=scrollbar.set)
         
-        text_widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self._err_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        # 插入文本內容
-        text_widget.insert("1.0", full_message)
-        text_widget.configure(state="disabled")  # 只讀
-        
         # 按鈕框架
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill=tk.X)
@@ -1628,7 +2377,7 @@ class App(tk.Tk):
         # 複製到剪貼板按鈕
         def copy_to_clipboard():
             dialog.clipboard_clear()
-            dialog.clipboard_append(full_message)
+            dialog.clipboard_append(self._err_message)
             messagebox.showinfo("已複製", "錯誤訊息和建議已複製到剪貼板")
         
         ttk.Button(button_frame, text="複製內容", 
@@ -1636,56 +2385,140 @@ class App(tk.Tk):
         
         # 關閉按鈕
         ttk.Button(button_frame, text="關閉", 
-                  command=dialog.destroy).pack(side=tk.RIGHT)
+                  command=self._show_next_error_or_hide).pack(side=tk.RIGHT)
         
         # 居中顯示對話框
         dialog.transient(self)
-        dialog.update_idletasks()
-        
-        # 計算居中位置
         x = (dialog.winfo_screenwidth() // 2) - (600 // 2)
         y = (dialog.winfo_screenheight() // 2) - (400 // 2)
         dialog.geometry(f"600x400+{x}+{y}")
         
-        # 聚焦到對話框
-        dialog.focus_set()
-        
-        # 等待對話框關閉
-        dialog.wait_window()
+        self._err_dialog = dialog
 
     def _thread(self, target, *args):
-        t = threading.Thread(target=target, args=args, daemon=True)
-        t.start()
+        """交給單一背景工作執行緒依序執行（DISM 本身也是全域序列化）"""
+        self._work_q.put((target, args))
+
+    def _cached_mount_info(self) -> tuple[bool, list[dict], str]:
+        """get_mount_info 的短暫快取，連續操作時不必重複執行 DISM"""
+        result = self._mount_info_cache.get()
+        if result[0]:
+            self._active_mount_dirs = {
+                _mount_key(img.get('MountDir', '')): (_mount_key(img.get('ImageFile', '')), img.get('ImageIndex', ''))
+                for img in result[1]
+            }
+        return result
+
+    def _prefetch_mount_info(self):
+        """掛載前檢查期間先在 I/O 執行緒查詢 DISM 掛載狀態；背景掛載時由快取直接取得結果
+        （查詢中則在快取鎖上等待，不會重複執行 DISM）"""
+        if self._active_mount_dirs is None:
+            self._io_pool.submit(self._cached_mount_info)
+
+    def _invalidate_mount_info(self, forget_mounts: bool = True):
+        """掛載狀態已變動；forget_mounts 為 False 表示呼叫端會自行更新已知掛載"""
+        self._mount_info_cache.invalidate()
+        if forget_mounts:
+            self._active_mount_dirs = None
+
+    def _mount_known_free(self, req: MountRequest) -> bool:
+        """依已知掛載判斷目錄與 (WIM, Index) 都未被使用，可略過 DISM 查詢"""
+        active = self._active_mount_dirs
+        if active is None:
+            return False
+        return req.mdir_norm not in active and (req.wim_norm, str(req.index)) not in active.values()
+
+    def _remember_mount(self, req: MountRequest):
+        if self._active_mount_dirs is not None:
+            self._active_mount_dirs[req.mdir_norm] = (req.wim_norm, str(req.index))
+
+    def _forget_mount(self, mdir: str):
+        if self._active_mount_dirs is not None:
+            self._active_mount_dirs.pop(_mount_key(mdir), None)
+
+    def _in_flight(self, key: str, fn, *args):
+        """
+        執行 fn（背景或主執行緒皆可），結束後解除 key 的進行中狀態；
+        fn 回傳 True 表示後續步驟已另行排程（同樣經由 _in_flight），由最後一步解除
+        """
+        handed_off = False
+        try:
+            handed_off = fn(*args)
+        finally:
+            if not handed_off:
+                self.after(0, self._end_flight, key)
+
+    def _end_flight(self, key: str):
+        """解除進行中狀態並恢復按鈕（主執行緒）"""
+        self._busy.discard(key)
+        for btn in self._flight_buttons[key]:
+            btn.configure(state=tk.NORMAL)
+
+    def _worker_loop(self):
+        while True:
+            fn, args = self._work_q.get()
+            try:
+                fn(*args)
+            except Exception as e:
+                self._log(f"背景作業發生錯誤: {e}")
+
+    def _run_async(self, fn, *args, on_done, buttons=()):
+        """在背景執行緒池執行 fn，完成後於主執行緒呼叫 on_done(結果)"""
+        for btn in buttons:
+            btn.configure(state=tk.DISABLED)
+            
+        def finish(fut: Future):
+            for btn in buttons:
+                btn.configure(state=tk.NORMAL)
+            try:
+                result = fut.result()
+            except Exception as e:
+                self._log(f"背景作業發生錯誤: {e}")
+                messagebox.showerror("錯誤", f"操作失敗: {e}")
+                return
+            on_done(result)
+            
+        def post(fut: Future):
+            try:
+                self.after(0, finish, fut)
+            except (RuntimeError, tk.TclError):
+                pass  # 視窗已關閉，不再回報結果
+            
+        fut = self._io_pool.submit(fn, *args)
+        fut.add_done_callback(post)
+        return fut
 
     def _on_mount_dir_changed(self, *args):
+        """WIM 掛載路徑變更（每次按鍵都會觸發），延遲 250ms 只處理最後一次"""
+        if self._mount_after:
+            self.after_cancel(self._mount_after)
+        self._mount_after = self.after(250, self._apply_mount_dir_change)
+
+    def _apply_mount_dir_change(self):
         """當 WIM 掛載路徑變更時自動同步到 Driver 分頁"""
-        if hasattr(self, 'var_driver_mount_dir') and hasattr(self, 'var_mount_dir'):
-            wim_path = self.var_mount_dir.get().strip()
-            current_driver_path = self.var_driver_mount_dir.get().strip()
+        self._mount_after = None
+        wim_path = self.var_mount_dir.get().strip()
             
-            # 只有當 driver 路徑為空或與 wim 路徑不同時才同步
-            if wim_path and (not current_driver_path or current_driver_path != wim_path):
-                self.var_driver_mount_dir.set(wim_path)
-                self._log(f"自動同步掛載路徑到 Driver 分頁: {wim_path}")
+        # 只有當 driver 路徑為空或與 wim 路徑不同時才同步（以正規化後的路徑比較）
+        if wim_path and self._path_keys['driver_mount_dir'] != self._path_keys['mount_dir']:
+            self.var_driver_mount_dir.set(wim_path)
+            self._log(f"自動同步掛載路徑到 Driver 分頁: {wim_path}")
 
     def _elevate_and_exit(self):
         """自動提升權限並退出當前程序（靜默執行）"""
-        import sys
-        import ctypes
         try:
             print("檢測到非管理員權限，正在提升權限...")
-            script = os.path.abspath(sys.argv[0])
-            params = " ".join([f'"{p}"' if ' ' in p else p for p in sys.argv[1:]])
+            exe, params = _ELEVATED_CMD
             
             # 使用 SW_HIDE (0) 參數來隱藏視窗，實現靜默執行
-            r = ctypes.windll.shell32.ShellExecuteW(
+            r = _ShellExecuteW(
                 None,           # hwnd
                 "runas",        # lpOperation (以管理員身分執行)
-                sys.executable, # lpFile (python.exe)
-                f'"{script}" {params}',  # lpParameters
+                exe,            # lpFile (python.exe)
+                params,         # lpParameters
                 None,           # lpDirectory
                 0               # nShowCmd (0 = SW_HIDE, 隱藏視窗)
-            )
+            ) or 0
             
             if r <= 32:
                 print(f"提升權限失敗，錯誤代碼：{r}")
@@ -1706,97 +2539,113 @@ class App(tk.Tk):
             return
         
         try:
-            if os.path.exists(path):
-                if os.path.isdir(path):
-                    if os.listdir(path):
+            if _fs_cache.exists(path):
+                if _fs_cache.isdir(path):
+                    if not _fs_cache.listdir_empty(path):
                         self._log(f"資料夾已存在但非空：{path}")
                         messagebox.showinfo("資料夾狀態", "資料夾已存在但包含檔案。DISM 需要空的掛載資料夾。")
                     else:
                         self._log(f"資料夾已存在且為空：{path}")
-                        messagebox.showinfo("資料夾狀態", "資料夾已存在且為空，可以使用。")
+                        self._info("資料夾狀態", "資料夾已存在且為空，可以使用。")
                 else:
                     self._log(f"路徑已存在但不是資料夾：{path}")
                     messagebox.showerror("路徑錯誤", "指定路徑已存在但不是資料夾")
             else:
                 os.makedirs(path, exist_ok=True)
+                _fs_cache.invalidate(path)
                 self._log(f"成功建立掛載資料夾：{path}")
-                messagebox.showinfo("建立成功", f"已建立掛載資料夾：{path}")
-                self._save_config()
+                self._info("建立成功", f"已建立掛載資料夾：{path}")
+                self._schedule_save()
         except Exception as e:
             self._log(f"建立資料夾失敗：{e}")
             messagebox.showerror("建立失敗", f"無法建立資料夾：{e}")
 
     # ---------- WIM 事件 ----------
+    def _set_wim_index(self, slot: int, value: str):
+        """在程式中設定 Index，並記錄為最後處理的值（選擇事件以此判斷是否真的變更）"""
+        if slot == 1:
+            self.var_wim_index.set(value)
+            self._last_wim1_idx = value
+        else:
+            self.var_wim_index2.set(value)
+            self._last_wim2_idx = value
+
     # WIM Index 防呆檢查
     def _on_wim1_index_changed(self, event=None):
         """WIM1 Index 變更時的防呆檢查"""
         selected_index = self.var_wim_index.get()
-        wim2_index = self.var_wim_index2.get() if hasattr(self, 'var_wim_index2') else None
+        if selected_index == self._last_wim1_idx:
+            return
+        wim2_index = self.var_wim_index2.get()
         
         # 檢查是否與 WIM2 的選擇衝突
         if selected_index and selected_index == wim2_index:
             self._log(f"⚠️  Index {selected_index} 已被 WIM#2 使用，請選擇其他 Index")
             # 清空當前選擇
-            self.var_wim_index.set('')
+            self._set_wim_index(1, '')
             messagebox.showwarning("Index 衝突", f"Index {selected_index} 已被 WIM#2 使用\n請選擇不同的 Index")
             return
         
+        self._last_wim1_idx = selected_index
         if selected_index:
             self._log(f"✓ WIM#1 選擇 Index: {selected_index}")
             # 更新 WIM2 的可用選項
             self._update_wim2_available_indices()
         
-        self._save_config()
+        self._schedule_save()
 
     def _on_wim2_index_changed(self, event=None):
         """WIM2 Index 變更時的防呆檢查"""
         selected_index = self.var_wim_index2.get()
-        wim1_index = self.var_wim_index.get() if hasattr(self, 'var_wim_index') else None
+        if selected_index == self._last_wim2_idx:
+            return
+        wim1_index = self.var_wim_index.get()
         
         # 檢查是否與 WIM1 的選擇衝突
         if selected_index and selected_index == wim1_index:
             self._log(f"⚠️  Index {selected_index} 已被 WIM#1 使用，請選擇其他 Index")
             # 清空當前選擇
-            self.var_wim_index2.set('')
+            self._set_wim_index(2, '')
             messagebox.showwarning("Index 衝突", f"Index {selected_index} 已被 WIM#1 使用\n請選擇不同的 Index")
             return
         
+        self._last_wim2_idx = selected_index
         if selected_index:
             self._log(f"✓ WIM#2 選擇 Index: {selected_index}")
             # 更新 WIM1 的可用選項
             self._update_wim1_available_indices()
         
-        self._save_config()
+        self._schedule_save()
 
     def _update_wim1_available_indices(self):
         """更新 WIM1 的可用 Index 列表"""
-        if not hasattr(self, 'wim1_available_indices'):
-            return
+        used_by_wim2 = self.var_wim_index2.get()
+        available_indices = tuple(idx for idx in self.wim1_available_indices if idx != used_by_wim2)
         
-        used_by_wim2 = self.var_wim_index2.get() if hasattr(self, 'var_wim_index2') else None
-        available_indices = [idx for idx in self.wim1_available_indices if idx != used_by_wim2]
-        
-        self.cbo_wim_index['values'] = available_indices
+        # 選項沒有變化就不重設 Tk 下拉選單
+        if available_indices != self._wim1_cached_values:
+            self._wim1_cached_values = available_indices
+            self.cbo_wim_index['values'] = available_indices
         
         # 檢查當前選擇是否還有效
         current = self.var_wim_index.get()
         if current and current not in available_indices:
-            self.var_wim_index.set('')
+            self._set_wim_index(1, '')
 
     def _update_wim2_available_indices(self):
         """更新 WIM2 的可用 Index 列表"""
-        if not hasattr(self, 'wim2_available_indices'):
-            return
+        used_by_wim1 = self.var_wim_index.get()
+        available_indices = tuple(idx for idx in self.wim2_available_indices if idx != used_by_wim1)
         
-        used_by_wim1 = self.var_wim_index.get() if hasattr(self, 'var_wim_index') else None
-        available_indices = [idx for idx in self.wim2_available_indices if idx != used_by_wim1]
-        
-        self.cbo_wim_index2['values'] = available_indices
+        # 選項沒有變化就不重設 Tk 下拉選單
+        if available_indices != self._wim2_cached_values:
+            self._wim2_cached_values = available_indices
+            self.cbo_wim_index2['values'] = available_indices
         
         # 檢查當前選擇是否還有效
         current = self.var_wim_index2.get()
         if current and current not in available_indices:
-            self.var_wim_index2.set('')
+            self._set_wim_index(2, '')
 
     def _on_browse_wim(self):
         path = filedialog.askopenfilename(
@@ -1806,7 +2655,7 @@ class App(tk.Tk):
         if path:
             self.var_wim.set(path)
             self._log(f"已選擇 WIM 檔案：{path}")
-            self._save_config()
+            self._schedule_save()
             # 自動讀取映像資訊
             self._thread(self._do_wim_info, path)
 
@@ -1815,18 +2664,25 @@ class App(tk.Tk):
         if path:
             self.var_mount_dir.set(path)
             self._log(f"已選擇掛載資料夾：{path}")
-            self._save_config()
+            self._schedule_save()
 
     def _on_open_mount_dir(self):
         path = self.var_mount_dir.get().strip()
-        if not path or not os.path.exists(path):
-            self._log("掛載資料夾不存在或路徑無效")
+        if not path:
+            self._log("掛載資料夾路徑無效")
             return
-        try:
-            os.startfile(path)
-            self._log(f"已開啟掛載資料夾：{path}")
-        except Exception as e:
-            self._log(f"開啟掛載資料夾失敗：{e}")
+        self._open_dir_async(path, "掛載資料夾")
+
+    def _open_dir_async(self, path: str, label: str):
+        """在背景以 ShellExecuteW 開啟資料夾（不先檢查存在，損壞的掛載點上 stat 可能卡住數秒；
+        殼層擴充功能很慢時也不會卡住介面）"""
+        def run():
+            r = _ShellExecuteW(None, "open", path, None, None, 1) or 0  # SW_SHOWNORMAL
+            if r > 32:
+                self._log(f"已開啟{label}：{path}")
+            else:
+                self._log(f"開啟{label}失敗：ShellExecute 錯誤代碼 {r}")
+        self._io_pool.submit(run)
 
     def _on_wim_info(self):
         wim = self.var_wim.get().strip()
@@ -1834,7 +2690,7 @@ class App(tk.Tk):
             messagebox.showwarning("輸入不完整", "請先選擇 WIM 檔案")
             return
         self._log("開始讀取 WIM 映像資訊...")
-        self._save_config()
+        self._schedule_save()
         self._thread(self._do_wim_info, wim)
 
     def _do_wim_info(self, wim: str):
@@ -1848,42 +2704,46 @@ class App(tk.Tk):
             return
         
         self._log(f"成功解析 WIM，找到 {len(images)} 個映像")
-        # 更新下拉
-        idxes = [str(img["Index"]) + (f" - {img['Name']}" if img.get("Name") else "") for img in images]
-        indices_only = [str(img["Index"]) for img in images]
+        # 各欄位各取一次成 tuple，下拉選單與日誌共用
+        indices = tuple(str(img["Index"]) for img in images)
+        names = tuple(img.get('Name', '(無名稱)') for img in images)
+        descs = tuple(img.get('Description', '(無描述)') for img in images)
         
         # 儲存 WIM1 的所有可用 Index
-        self.wim1_available_indices = indices_only.copy()
+        self.wim1_available_indices = indices
         
-        def update_combo():
-            # 檢查 WIM2 是否已選擇 Index，排除已被使用的
-            used_by_wim2 = self.var_wim_index2.get() if hasattr(self, 'var_wim_index2') else None
-            available_indices = [idx for idx in indices_only if idx != used_by_wim2]
-            
-            self.cbo_wim_index['values'] = available_indices
-            
-            # 若目前選擇的 Index 已被 WIM2 使用，需要重新選擇
-            current_selection = self.var_wim_index.get()
-            if current_selection and current_selection == used_by_wim2:
-                self.var_wim_index.set('')
-                self._log(f"⚠️  Index {current_selection} 已被 WIM#2 使用，請重新選擇")
-            
-            # 若尚未選擇且有可用選項，預設第一個可用的
-            if not self.var_wim_index.get() and available_indices:
-                self.var_wim_index.set(available_indices[0])
-                self._save_config()
-                self._log(f"✓ 自動選擇第一個可用映像 Index：{available_indices[0]}")
-            elif not available_indices:
-                self._log("⚠️  所有 Index 都已被使用，請檢查 WIM#2 的選擇")
-        
-        self.after(0, update_combo)
-        
-        for i, img in enumerate(images):
-            name = img.get('Name', '(無名稱)')
-            desc = img.get('Description', '(無描述)')
-            self._log(f"映像 {img['Index']}: {name} - {desc}")
+        # 在工作執行緒先算好可用的 Index，GUI 執行緒只負責套用；WIM2 未選擇時不必過濾
+        used_by_wim2 = self.var_wim_index2.get()
+        if used_by_wim2:
+            available_indices = tuple(idx for idx in indices if idx != used_by_wim2)
+        else:
+            available_indices = indices
+        self.after(0, self._apply_wim1_combo, available_indices, used_by_wim2)
+        
+        self._log("\n".join(f"映像 {i}: {n} - {d}" for i, n, d in zip(indices, names, descs)))
         self._log("映像資訊讀取完成")
 
+    def _apply_wim1_combo(self, available_indices: tuple[str, ...], used_by_wim2: str):
+        """套用 WIM#1 的 Index 下拉選項（GUI 執行緒）"""
+        if available_indices != self._wim1_cached_values:
+            self._wim1_cached_values = available_indices
+            self.cbo_wim_index['values'] = available_indices
+        
+        # 若目前選擇的 Index 已被 WIM2 使用，需要重新選擇
+        current_selection = self.var_wim_index.get()
+        if current_selection and current_selection == used_by_wim2:
+            self._set_wim_index(1, '')
+            self._log(f"⚠️  Index {current_selection} 已被 WIM#2 使用，請重新選擇")
+        
+        # 若尚未選擇且有可用選項，預設第一個可用的
+        if not self.var_wim_index.get() and available_indices:
+            self._set_wim_index(1, available_indices[0])
+            self._schedule_save()
+            self._log(f"✓ 自動選擇第一個可用映像 Index：{available_indices[0]}")
+        elif not available_indices:
+            self._log("⚠️  所有 Index 都已被使用，請檢查 WIM#2 的選擇")
+
+    @_single_flight('wim1')
     def _on_wim_mount(self):
         wim = self.var_wim.get().strip()
         idx = self.var_wim_index.get().strip()
@@ -1896,9 +2756,10 @@ class App(tk.Tk):
             self._log("掛載檢查失敗：缺少 WIM 檔案或掛載資料夾")
             messagebox.showwarning("輸入不完整", "請選擇 WIM 與掛載資料夾")
             return
+        self._prefetch_mount_info()
         
         # Index 衝突檢查
-        if idx and hasattr(self, 'var_wim_index2'):
+        if idx:
             wim2_index = self.var_wim_index2.get()
             if idx == wim2_index:
                 self._log(f"❌ Index 衝突：WIM#1 和 WIM#2 都選擇了 Index {idx}")
@@ -1915,20 +2776,20 @@ class App(tk.Tk):
                 return
             if len(images) == 1:
                 idx = str(images[0]['Index'])
-                self.var_wim_index.set(idx)
-                self._save_config()
+                self._set_wim_index(1, idx)
+                self._schedule_save()
                 self._log(f"自動選擇唯一映像 Index：{idx}")
             else:
                 self._log(f"WIM 包含 {len(images)} 個映像，需要手動選擇")
                 messagebox.showwarning("需要選擇 Index", "此 WIM 有多個映像，請先選擇 Index")
                 return
                 
-        if not os.path.exists(mdir):
+        if not _fs_cache.exists(mdir):
             self._log(f"掛載資料夾不存在：{mdir}")
             messagebox.showwarning("路徑不存在", "掛載資料夾不存在，請先建立")
             return
             
-        if os.listdir(mdir):
+        if not _fs_cache.listdir_empty(mdir):
             self._log(f"掛載資料夾非空：{mdir}")
             messagebox.showwarning("資料夾非空", "DISM 需要空的掛載資料夾，請清空後再試")
             return
@@ -1941,10 +2802,13 @@ class App(tk.Tk):
             return
             
         self._log("掛載前檢查通過，開始掛載...")
-        self._save_config()
-        self._thread(self._do_wim_mount, wim, index, mdir, ro)
+        self._schedule_save()
+        self._thread(self._in_flight, 'wim1', self._do_wim_mount,
+                     MountRequest(wim, index, mdir, ro, self._path_keys['wim'], self._path_keys['mount_dir']))
+        return True
 
-    def _do_wim_mount(self, wim: str, index: int, mdir: str, ro: bool):
+    def _do_wim_mount(self, req: MountRequest):
+        wim, index, mdir, ro = req.wim, req.index, req.mdir, req.ro
         readonly_text = "唯讀" if ro else "讀寫"
         self._log(f"正在掛載 WIM...")
         self._log(f"  WIM 檔案: {wim}")
@@ -1952,76 +2816,92 @@ class App(tk.Tk):
         self._log(f"  掛載位置: {mdir}")
         self._log(f"  掛載模式: {readonly_text}")
         
+        # 已知掛載中目錄與映像都未被使用時，不必再查詢 DISM
+        if self._mount_known_free(req):
+            return self._perform_mount(req)
+        
         # 先檢查是否已有掛載
         self._log("檢查現有掛載狀態...")
-        check_ok, mounted_images, check_err = WIMManager.get_mount_info()
+        check_ok, mounted_images, check_err = self._cached_mount_info()
         if check_ok and mounted_images:
-            # 檢查是否有衝突的掛載
-            conflict_found = False
-            for img in mounted_images:
-                img_file = img.get('ImageFile', '').lower()
-                img_index = img.get('ImageIndex', '')
-                img_mount_dir = img.get('MountDir', '')
+            # 檢查是否有衝突的掛載：路徑只正規化一次，先以 (路徑, Index) 直接查表
+            wim_norm = req.wim_norm
+            idx_str = str(index)
+            mounted = {(os.path.normpath(img.get('ImageFile', '')).casefold(), img.get('ImageIndex', '')): img
+                       for img in mounted_images}
+            conflict = mounted.get((wim_norm, idx_str))
+            if conflict is None:
+                # 路徑寫法不同時才退回子字串比對
+                for img in mounted_images:
+                    img_file = img.get('ImageFile', '').casefold()
+                    if img.get('ImageIndex', '') == idx_str and img_file and (img_file in wim_norm or wim_norm in img_file):
+                        conflict = img
+                        break
                 
-                # 檢查是否相同的 WIM 文件和 Index
-                if (os.path.normpath(wim).lower() in img_file or img_file in os.path.normpath(wim).lower()) and str(index) == img_index:
-                    conflict_found = True
-                    self._log(f"⚠️ 發現衝突: WIM {wim} Index {index} 已掛載到 {img_mount_dir}")
-                    
-                    def ask_user():
-                        response = messagebox.askyesnocancel(
-                            "掛載衝突",
-                            f"映像 {os.path.basename(wim)} Index {index} 已經掛載到:\n{img_mount_dir}\n\n"
-                            f"請選擇處理方式:\n"
-                            f"是(Y) = 強制清理後重新掛載\n"
-                            f"否(N) = 取消掛載操作\n"
-                            f"取消 = 查看所有掛載狀態"
-                        )
-                        
-                        if response is True:  # 是 - 強制清理
-                            self._log("使用者選擇強制清理後重新掛載...")
-                            cleanup_ok, cleanup_msg = WIMManager.cleanup_mount()
-                            if cleanup_ok:
-                                self._log(f"✓ {cleanup_msg}")
-                                # 清理後重新嘗試掛載
-                                self._perform_mount(wim, index, mdir, ro)
-                            else:
-                                self._log(f"✗ 清理失敗: {cleanup_msg}")
-                                messagebox.showerror("清理失敗", f"無法清理掛載狀態:\n{cleanup_msg}")
-                                # 為清理錯誤提供詳細建議
-                                self.after(100, lambda: self.show_error_with_advice("清理失敗", cleanup_msg))
-                        elif response is False:  # 否 - 取消
-                            self._log("使用者選擇取消掛載操作")
-                            return
-                        else:  # 取消 - 查看狀態
-                            self._log("顯示所有掛載狀態...")
-                            self._do_check_wim_mount_status()
-                            return
+            if conflict is not None:
+                img_mount_dir = conflict.get('MountDir', '')
+                self._log(f"⚠️ 發現衝突: WIM {wim} Index {index} 已掛載到 {img_mount_dir}")
+                
+                def ask_user():
+                    response = messagebox.askyesnocancel(
+                        "掛載衝突",
+                        f"映像 {os.path.basename(wim)} Index {index} 已經掛載到:\n{img_mount_dir}\n\n"
+                        f"請選擇處理方式:\n"
+                        f"是(Y) = 強制清理後重新掛載\n"
+                        f"否(N) = 取消掛載操作\n"
+                        f"取消 = 查看所有掛載狀態"
+                    )
                     
-                    self.after(0, ask_user)
-                    return
-            
+                    if response is True:  # 是 - 強制清理
+                        self._log("使用者選擇強制清理後重新掛載...")
+                        cleanup_ok, cleanup_msg = WIMManager.cleanup_mount()
+                        self._invalidate_mount_info()
+                        if cleanup_ok:
+                            self._log(f"✓ {cleanup_msg}")
+                            # 清理後重新嘗試掛載
+                            return self._perform_mount(req)
+                        else:
+                            self._log(f"✗ 清理失敗: {cleanup_msg}")
+                            messagebox.showerror("清理失敗", f"無法清理掛載狀態:\n{cleanup_msg}")
+                            # 為清理錯誤提供詳細建議
+                            self.after(100, lambda: self.show_error_with_advice("清理失敗", cleanup_msg))
+                    elif response is False:  # 否 - 取消
+                        self._log("使用者選擇取消掛載操作")
+                        return
+                    else:  # 取消 - 查看狀態
+                        self._log("顯示所有掛載狀態...")
+                        self._do_check_wim_mount_status()
+                        return
+                
+                # 使用者選擇前仍視為進行中，避免重複點擊另外開始掛載
+                self.after(0, self._in_flight, 'wim1', ask_user)
+                return True
+        
         # 沒有衝突，直接掛載
-        self._perform_mount(wim, index, mdir, ro)
+        return self._perform_mount(req)
     
-    def _perform_mount(self, wim: str, index: int, mdir: str, ro: bool):
-        """實際執行掛載操作"""
-        ok, msg = WIMManager.mount_wim(wim, index, mdir, ro)
+    def _perform_mount(self, req: MountRequest) -> bool:
+        """實際執行掛載操作；已排定清理後重試的詢問時回傳 True"""
+        wim, index, mdir, ro = req.wim, req.index, req.mdir, req.ro
+        ok, msg = WIMManager.mount_wim(wim, index, mdir, ro, self._log)
+        self._invalidate_mount_info(forget_mounts=not ok)
+        _fs_cache.invalidate(mdir)
         if ok:
+            self._remember_mount(req)
             self._log("✓ WIM 掛載成功！")
             self._log(f"掛載位置: {mdir}")
             
             # 自動同步掛載路徑到 Driver 分頁
-            if hasattr(self, 'var_driver_mount_dir'):
-                self.var_driver_mount_dir.set(mdir)
-                self._log(f"✓ 已自動同步掛載路徑到 Driver 分頁: {mdir}")
+            self.var_driver_mount_dir.set(mdir)
+            self._log(f"✓ 已自動同步掛載路徑到 Driver 分頁: {mdir}")
             
-            messagebox.showinfo("掛載成功", f"WIM 已成功掛載到:\n{mdir}\n\n已自動同步路徑到 Driver 分頁")
+            self._info("掛載成功", f"WIM 已成功掛載到:\n{mdir}\n\n已自動同步路徑到 Driver 分頁")
         else:
             self._log(f"✗ WIM 掛載失敗: {msg}")
             
             # 檢查是否是常見的掛載錯誤
-            if "0xc1420127" in msg or "already mounted" in msg.lower():
+            m = msg.lower()
+            if any(p in m for p in _ALREADY_MOUNTED):
                 def handle_mount_error():
                     response = messagebox.askyesno(
                         "掛載失敗 - 映像已掛載",
@@ -2030,22 +2910,25 @@ class App(tk.Tk):
                     if response:
                         self._log("嘗試清理掛載狀態後重試...")
                         cleanup_ok, cleanup_msg = WIMManager.cleanup_mount()
+                        self._invalidate_mount_info()
                         if cleanup_ok:
                             self._log(f"✓ 清理成功: {cleanup_msg}")
                             self._log("重新嘗試掛載...")
-                            self._perform_mount(wim, index, mdir, ro)
+                            return self._perform_mount(req)
                         else:
                             self._log(f"✗ 清理失敗: {cleanup_msg}")
                             messagebox.showerror("清理失敗", f"無法清理掛載狀態:\n{cleanup_msg}")
                             # 為清理錯誤提供詳細建議
                             self.after(100, lambda: self.show_error_with_advice("清理失敗", cleanup_msg))
                 
-                self.after(0, handle_mount_error)
+                self.after(0, self._in_flight, 'wim1', handle_mount_error)
+                return True
             else:
                 messagebox.showerror("掛載失敗", f"掛載失敗:\n{msg}")
                 # 為掛載錯誤提供詳細建議
                 self.after(100, lambda: self.show_error_with_advice("掛載失敗", msg))
 
+    @_single_flight('wim1')
     def _on_wim_unmount(self):
         mdir = self.var_mount_dir.get().strip()
         commit = self.var_unmount_commit.get()
@@ -2057,33 +2940,37 @@ class App(tk.Tk):
             
         commit_text = "提交變更" if commit else "丟棄變更"
         self._log(f"準備卸載 WIM (模式: {commit_text})...")
-        self._thread(self._do_wim_unmount, mdir, commit)
+        self._thread(self._in_flight, 'wim1', self._do_wim_unmount, mdir, commit)
+        return True
 
     def _on_close_explorer(self):
         """手動關閉指向掛載資料夾的檔案總管視窗"""
-        mdir = self.var_mount_dir.get().strip()
+        self._close_explorer_impl(slot=1)
+
+    def _close_explorer_impl(self, *, slot: int):
+        label = _SLOT_LABEL[slot]
+        mdir = self._slot_mount_var(slot).get().strip()
         
         if not mdir:
-            messagebox.showwarning("輸入不完整", "請先指定掛載資料夾")
+            messagebox.showwarning("輸入不完整", f"請先指定{label}掛載資料夾")
             return
             
-        self._log("手動關閉檔案總管視窗...")
-        self._thread(self._do_close_explorer, mdir)
+        self._log(f"手動關閉{label}檔案總管視窗...")
+        self._log(f"正在關閉指向 {mdir} 的檔案總管視窗...")
+        btn = self.btn_close_explorer if slot == 1 else self.btn_close_explorer2
+        self._run_async(WIMManager.close_explorer_windows, mdir,
+                        on_done=lambda result: self._on_close_explorer_done(result, slot), buttons=(btn,))
 
-    def _do_close_explorer(self, mdir: str):
-        """執行關閉檔案總管的操作"""
-        try:
-            self._log(f"正在關閉指向 {mdir} 的檔案總管視窗...")
-            ok, msg = WIMManager.close_explorer_windows(mdir)
-            if ok:
-                self._log(f"✓ {msg}")
-                messagebox.showinfo("完成", f"已處理檔案總管視窗\n{msg}")
-            else:
-                self._log(f"⚠ {msg}")
-                messagebox.showwarning("注意", f"處理檔案總管視窗時遇到問題:\n{msg}")
-        except Exception as e:
-            self._log(f"關閉檔案總管視窗時發生錯誤: {e}")
-            messagebox.showerror("錯誤", f"操作失敗: {e}")
+    def _on_close_explorer_done(self, result: tuple[bool, str], slot: int):
+        """關閉檔案總管完成（主執行緒）"""
+        label = _SLOT_LABEL[slot]
+        ok, msg = result
+        if ok:
+            self._log(f"✓ {msg}")
+            self._info("完成", f"已處理{label}檔案總管視窗\n{msg}")
+        else:
+            self._log(f"⚠ {msg}")
+            messagebox.showwarning("注意", f"處理{label}檔案總管視窗時遇到問題:\n{msg}")
 
     def _on_check_wim_mount_status(self):
         """檢查當前 WIM 掛載狀態"""
@@ -2093,7 +2980,7 @@ class App(tk.Tk):
     def _do_check_wim_mount_status(self):
         """執行檢查 WIM 掛載狀態"""
         try:
-            ok, mounted_images, err = WIMManager.get_mount_info()
+            ok, mounted_images, err = self._cached_mount_info()
             if not ok:
                 self._log(f"✗ 檢查掛載狀態失敗: {err}")
                 messagebox.showerror("檢查失敗", f"無法檢查掛載狀態:\n{err}")
@@ -2104,7 +2991,7 @@ class App(tk.Tk):
                 messagebox.showinfo("掛載狀態", "系統中沒有已掛載的映像")
                 return
                 
-            self._log(f"✓ 找到 {len(mounted_images)} 個已掛載的映像:")
+            lines = [f"✓ 找到 {len(mounted_images)} 個已掛載的映像:"]
             for i, img in enumerate(mounted_images, 1):
                 mount_dir = img.get('MountDir', 'N/A')
                 image_file = img.get('ImageFile', 'N/A')
@@ -2112,12 +2999,13 @@ class App(tk.Tk):
                 status = img.get('Status', 'N/A')
                 read_write = img.get('ReadWrite', 'N/A')
                 
-                self._log(f"  {i}. 掛載目錄: {mount_dir}")
-                self._log(f"     映像檔案: {image_file}")
-                self._log(f"     映像索引: {image_index}")
-                self._log(f"     狀態: {status}")
-                self._log(f"     權限: {read_write}")
-                self._log("")
+                lines.append(f"  {i}. 掛載目錄: {mount_dir}")
+                lines.append(f"     映像檔案: {image_file}")
+                lines.append(f"     映像索引: {image_index}")
+                lines.append(f"     狀態: {status}")
+                lines.append(f"     權限: {read_write}")
+                lines.append("")
+            self._log("\n".join(lines))
                 
             messagebox.showinfo("掛載狀態", f"找到 {len(mounted_images)} 個已掛載的映像\n詳細資訊請查看日誌")
             
@@ -2139,9 +3027,10 @@ class App(tk.Tk):
         """執行清理掛載點操作"""
         try:
             ok, msg = WIMManager.cleanup_mount()
+            self._invalidate_mount_info()
             if ok:
                 self._log(f"✓ 清理完成: {msg}")
-                messagebox.showinfo("清理成功", f"掛載點清理完成:\n{msg}")
+                self._info("清理成功", f"掛載點清理完成:\n{msg}")
             else:
                 self._log(f"✗ 清理失敗: {msg}")
                 messagebox.showerror("清理失敗", f"掛載點清理失敗:\n{msg}")
@@ -2160,11 +3049,10 @@ class App(tk.Tk):
         """執行修復損壞掛載點操作"""
         try:
             ok, msg = WIMManager.fix_broken_mounts()
+            self._invalidate_mount_info()
             
-            # 將詳細訊息寫入日誌
-            for line in msg.split('\n'):
-                if line.strip():
-                    self._log(line)
+            # 將詳細訊息一次寫入日誌
+            self._log_block(msg)
             
             if ok:
                 self._log("✅ 損壞掛載點修復完成！")
@@ -2190,30 +3078,61 @@ class App(tk.Tk):
     def _on_smart_cleanup_fix(self):
         """一鍵智能修復所有 WIM 掛載問題"""
         self._log("🚀 開始一鍵智能修復...")
-        self._thread(self._do_smart_cleanup_fix)
-
-    def _do_smart_cleanup_fix(self):
-        """執行一鍵智能修復操作"""
+        # 背景執行緒逐行產出訊息，主執行緒定時取出並即時顯示
+        q: queue.Queue = queue.Queue()
+        for btn in (self.btn_smart_fix, self.btn_smart_fix2):
+            btn.configure(state=tk.DISABLED)
+        # 與其他 DISM 操作共用循序工作佇列，不會與排隊中的掛載 / 卸載同時執行
+        self._thread(self._do_smart_cleanup_fix, q)
+        self.after(50, self._drain_smart_cleanup_fix, q, [])
+
+    def _do_smart_cleanup_fix(self, q: queue.Queue):
+        """執行一鍵智能修復操作（背景執行緒）；發生例外時將例外物件放入佇列"""
         try:
-            ok, msg = WIMManager.smart_cleanup_and_fix()
+            for item in WIMManager.smart_cleanup_and_fix():
+                q.put(item)
+        except Exception as e:
+            q.put(e)
+        finally:
+            self._invalidate_mount_info()
+
+    def _drain_smart_cleanup_fix(self, q: queue.Queue, lines: list[str]):
+        """將修復進度寫入日誌，收到最終結果後顯示對話框（失敗時顯示完整過程）"""
+        while True:
+            try:
+                item = q.get_nowait()
+            except queue.Empty:
+                break
+            
+            if isinstance(item, Exception):
+                for btn in (self.btn_smart_fix, self.btn_smart_fix2):
+                    btn.configure(state=tk.NORMAL)
+                self._log(f"一鍵智能修復錯誤: {item}")
+                messagebox.showerror("修復錯誤", f"一鍵智能修復時發生錯誤:\n{item}")
+                # 為修復錯誤提供詳細建議
+                self.after(100, lambda: self.show_error_with_advice("修復錯誤", str(item)))
+                return
             
-            # 將詳細訊息寫入日誌
-            for line in msg.split('\n'):
-                if line.strip():
-                    self._log(line)
+            line, ok = item
+            self._log_block(line)
+            lines.append(line)
             
+            if ok is None:
+                continue
+            for btn in (self.btn_smart_fix, self.btn_smart_fix2):
+                btn.configure(state=tk.NORMAL)
             if ok:
                 self._log("✅ 一鍵智能修復完成")
                 messagebox.showinfo("修復完成", "🎉 一鍵智能修復已完成！\n\n所有 WIM 掛載問題已自動診斷和修復。\n系統現在處於良好狀態，可以正常進行新的掛載操作。")
             else:
+                msg = "\n".join(lines)
                 self._log("❌ 一鍵智能修復失敗")
                 messagebox.showerror("修復失敗", f"一鍵智能修復過程中遇到問題:\n{msg}")
-                
-        except Exception as e:
-            self._log(f"一鍵智能修復錯誤: {e}")
-            messagebox.showerror("修復錯誤", f"一鍵智能修復時發生錯誤:\n{e}")
-            # 為修復錯誤提供詳細建議
-            self.after(100, lambda: self.show_error_with_advice("修復錯誤", str(e)))
+                # 為修復失敗提供詳細建議
+                self.after(100, lambda: self.show_error_with_advice("修復失敗", msg))
+            return
+        
+        self.after(50, self._drain_smart_cleanup_fix, q, lines)
 
     def _on_force_cleanup(self):
         """強力清理掛載點 - 最後手段"""
@@ -2235,44 +3154,51 @@ class App(tk.Tk):
 
     def _show_progress_and_execute(self, target_func, message):
         """顯示進度對話框並執行長時間任務"""
-        import tkinter.messagebox as mb
-        
-        # 創建一個簡單的進度提示
-        progress_window = tk.Toplevel(self)
-        progress_window.title("執行中...")
-        progress_window.geometry("400x150")
-        progress_window.transient(self)
+        if self._progress_win is None:
+            self._build_progress_win()
+        progress_window = self._progress_win
+        self._progress_var.set(message)
+        progress_window.deiconify()
         progress_window.grab_set()
         
-        # 居中顯示
-        progress_window.update_idletasks()
-        x = (progress_window.winfo_screenwidth() // 2) - (400 // 2)
-        y = (progress_window.winfo_screenheight() // 2) - (150 // 2)
-        progress_window.geometry(f"400x150+{x}+{y}")
-        
-        progress_label = tk.Label(progress_window, text=message, wraplength=350, justify=tk.CENTER)
-        progress_label.pack(expand=True)
-        
         # 執行清理任務
         def execute_task():
             try:
                 target_func()
             finally:
-                progress_window.destroy()
+                progress_window.grab_release()
+                progress_window.withdraw()
         
         # 延遲執行以確保進度窗口顯示
         self.after(100, execute_task)
 
+    def _build_progress_win(self):
+        """建立進度對話框（只在第一次顯示時建立，之後隱藏/顯示重複使用）"""
+        progress_window = tk.Toplevel(self)
+        progress_window.withdraw()
+        progress_window.title("執行中...")
+        progress_window.transient(self)
+        progress_window.protocol("WM_DELETE_WINDOW", lambda: None)
+        
+        # 居中顯示（螢幕尺寸不需等版面計算，直接算出一次即可）
+        x = (progress_window.winfo_screenwidth() // 2) - (400 // 2)
+        y = (progress_window.winfo_screenheight() // 2) - (150 // 2)
+        progress_window.geometry(f"400x150+{x}+{y}")
+        
+        self._progress_var = tk.StringVar()
+        tk.Label(progress_window, textvariable=self._progress_var,
+                 wraplength=350, justify=tk.CENTER).pack(expand=True)
+        self._progress_win = progress_window
+
     def _do_force_cleanup(self):
         """執行強力清理操作"""
         try:
             self._log("🚀 啟動終極清理程序...")
             ok, msg = WIMManager.ultimate_cleanup()
+            self._invalidate_mount_info()
             
-            # 將詳細訊息寫入日誌
-            for line in msg.split('\n'):
-                if line.strip():
-                    self._log(line)
+            # 將詳細訊息一次寫入日誌
+            self._log_block(msg)
             
             if ok:
                 self._log("✅ 強力清理完成！")
@@ -2303,11 +3229,24 @@ class App(tk.Tk):
                     if restart_confirm:
                         self._log("🔄 使用者選擇重啟電腦...")
                         try:
-                            import subprocess
-                            subprocess.run(["shutdown", "/r", "/t", "10", "/c", "WIM工具：重啟清理掛載狀態"], check=True)
+                            # 分離啟動 shutdown.exe，不閃出主控台視窗；它排定重啟後立即結束，
+                            # 短暫等待其結束代碼，拒絕存取或已有排定的關機（1190）等失敗才能回報
+                            proc = subprocess.Popen(
+                                ["shutdown", "/r", "/t", "10", "/c", "WIM工具：重啟清理掛載狀態"],
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors="replace",
+                                creationflags=_DETACHED_NO_WINDOW,
+                                close_fds=True,
+                            )
+                            try:
+                                out, _ = proc.communicate(timeout=5)
+                                rc = proc.returncode
+                            except subprocess.TimeoutExpired:
+                                out, rc = "", 0  # 仍在執行，視為已排定
+                            if rc != 0:
+                                raise OSError(f"shutdown 結束代碼 {rc}: {(out or '').strip()}")
                             self._log("⏰ 系統將在 10 秒後重啟...")
                             messagebox.showinfo("重啟排程", "系統將在 10 秒後重啟\n請保存重要工作！")
-                        except Exception as e:
+                        except OSError as e:
                             self._log(f"❌ 重啟失敗: {e}")
                             messagebox.showerror("重啟失敗", f"無法重啟系統: {e}")
                 
@@ -2324,7 +3263,7 @@ class App(tk.Tk):
         if path:
             self.var_wim2.set(path)
             self._log(f"已選擇第二個 WIM 檔案：{path}")
-            self._save_config()
+            self._schedule_save()
             # 自動讀取映像資訊
             self._thread(self._do_wim_info2, path)
 
@@ -2333,7 +3272,7 @@ class App(tk.Tk):
         if path:
             self.var_mount_dir2.set(path)
             self._log(f"已選擇第二個掛載資料夾：{path}")
-            self._save_config()
+            self._schedule_save()
 
     def _on_create_mount_dir2(self):
         """建立第二個掛載資料夾"""
@@ -2343,36 +3282,33 @@ class App(tk.Tk):
             return
         
         try:
-            if os.path.exists(path):
-                if os.path.isdir(path):
-                    if os.listdir(path):
+            if _fs_cache.exists(path):
+                if _fs_cache.isdir(path):
+                    if not _fs_cache.listdir_empty(path):
                         self._log(f"資料夾已存在但非空：{path}")
                         messagebox.showinfo("資料夾狀態", "資料夾已存在但包含檔案。DISM 需要空的掛載資料夾。")
                     else:
                         self._log(f"資料夾已存在且為空：{path}")
-                        messagebox.showinfo("資料夾狀態", "資料夾已存在且為空，可以使用。")
+                        self._info("資料夾狀態", "資料夾已存在且為空，可以使用。")
                 else:
                     self._log(f"路徑已存在但不是資料夾：{path}")
                     messagebox.showerror("路徑錯誤", "指定路徑已存在但不是資料夾")
             else:
                 os.makedirs(path, exist_ok=True)
+                _fs_cache.invalidate(path)
                 self._log(f"成功建立第二個掛載資料夾：{path}")
-                messagebox.showinfo("建立成功", f"已建立第二個掛載資料夾：{path}")
-                self._save_config()
+                self._info("建立成功", f"已建立第二個掛載資料夾：{path}")
+                self._schedule_save()
         except Exception as e:
             self._log(f"建立資料夾失敗：{e}")
             messagebox.showerror("建立失敗", f"無法建立資料夾：{e}")
 
     def _on_open_mount_dir2(self):
         path = self.var_mount_dir2.get().strip()
-        if not path or not os.path.exists(path):
-            self._log("第二個掛載資料夾不存在或路徑無效")
+        if not path:
+            self._log("第二個掛載資料夾路徑無效")
             return
-        try:
-            os.startfile(path)
-            self._log(f"已開啟第二個掛載資料夾：{path}")
-        except Exception as e:
-            self._log(f"開啟第二個掛載資料夾失敗：{e}")
+        self._open_dir_async(path, "第二個掛載資料夾")
 
     def _on_wim_info2(self):
         wim = self.var_wim2.get().strip()
@@ -2380,7 +3316,7 @@ class App(tk.Tk):
             messagebox.showwarning("輸入不完整", "請先選擇第二個 WIM 檔案")
             return
         self._log("開始讀取第二個 WIM 映像資訊...")
-        self._save_config()
+        self._schedule_save()
         self._thread(self._do_wim_info2, wim)
 
     def _do_wim_info2(self, wim: str):
@@ -2394,40 +3330,46 @@ class App(tk.Tk):
             return
         
         self._log(f"成功解析第二個 WIM，找到 {len(images)} 個映像")
-        indices_only = [str(img["Index"]) for img in images]
+        # 各欄位各取一次成 tuple，下拉選單與日誌共用
+        indices = tuple(str(img["Index"]) for img in images)
+        names = tuple(img.get('Name', '(無名稱)') for img in images)
+        descs = tuple(img.get('Description', '(無描述)') for img in images)
         
         # 儲存 WIM2 的所有可用 Index
-        self.wim2_available_indices = indices_only.copy()
+        self.wim2_available_indices = indices
         
-        def update_combo():
-            # 檢查 WIM1 是否已選擇 Index，排除已被使用的
-            used_by_wim1 = self.var_wim_index.get() if hasattr(self, 'var_wim_index') else None
-            available_indices = [idx for idx in indices_only if idx != used_by_wim1]
-            
-            self.cbo_wim_index2['values'] = available_indices
-            
-            # 若目前選擇的 Index 已被 WIM1 使用，需要重新選擇
-            current_selection = self.var_wim_index2.get()
-            if current_selection and current_selection == used_by_wim1:
-                self.var_wim_index2.set('')
-                self._log(f"⚠️  Index {current_selection} 已被 WIM#1 使用，請重新選擇")
-            
-            # 若尚未選擇且有可用選項，預設第一個可用的
-            if not self.var_wim_index2.get() and available_indices:
-                self.var_wim_index2.set(available_indices[0])
-                self._save_config()
-                self._log(f"✓ 自動選擇第一個可用映像 Index：{available_indices[0]}")
-            elif not available_indices:
-                self._log("⚠️  所有 Index 都已被使用，請檢查 WIM#1 的選擇")
-        
-        self.after(0, update_combo)
-        
-        for i, img in enumerate(images):
-            name = img.get('Name', '(無名稱)')
-            desc = img.get('Description', '(無描述)')
-            self._log(f"第二個映像 {img['Index']}: {name} - {desc}")
+        # 在工作執行緒先算好可用的 Index，GUI 執行緒只負責套用；WIM1 未選擇時不必過濾
+        used_by_wim1 = self.var_wim_index.get()
+        if used_by_wim1:
+            available_indices = tuple(idx for idx in indices if idx != used_by_wim1)
+        else:
+            available_indices = indices
+        self.after(0, self._apply_wim2_combo, available_indices, used_by_wim1)
+        
+        self._log("\n".join(f"第二個映像 {i}: {n} - {d}" for i, n, d in zip(indices, names, descs)))
         self._log("第二個映像資訊讀取完成")
 
+    def _apply_wim2_combo(self, available_indices: tuple[str, ...], used_by_wim1: str):
+        """套用 WIM#2 的 Index 下拉選項（GUI 執行緒）"""
+        if available_indices != self._wim2_cached_values:
+            self._wim2_cached_values = available_indices
+            self.cbo_wim_index2['values'] = available_indices
+        
+        # 若目前選擇的 Index 已被 WIM1 使用，需要重新選擇
+        current_selection = self.var_wim_index2.get()
+        if current_selection and current_selection == used_by_wim1:
+            self._set_wim_index(2, '')
+            self._log(f"⚠️  Index {current_selection} 已被 WIM#1 使用，請重新選擇")
+        
+        # 若尚未選擇且有可用選項，預設第一個可用的
+        if not self.var_wim_index2.get() and available_indices:
+            self._set_wim_index(2, available_indices[0])
+            self._schedule_save()
+            self._log(f"✓ 自動選擇第一個可用映像 Index：{available_indices[0]}")
+        elif not available_indices:
+            self._log("⚠️  所有 Index 都已被使用，請檢查 WIM#1 的選擇")
+
+    @_single_flight('wim2')
     def _on_wim_mount2(self):
         wim = self.var_wim2.get().strip()
         idx = self.var_wim_index2.get().strip()
@@ -2440,9 +3382,10 @@ class App(tk.Tk):
             self._log("第二個掛載檢查失敗：缺少 WIM 檔案或掛載資料夾")
             messagebox.showwarning("輸入不完整", "請選擇第二個 WIM 與掛載資料夾")
             return
+        self._prefetch_mount_info()
         
         # Index 衝突檢查
-        if idx and hasattr(self, 'var_wim_index'):
+        if idx:
             wim1_index = self.var_wim_index.get()
             if idx == wim1_index:
                 self._log(f"❌ Index 衝突：WIM#1 和 WIM#2 都選擇了 Index {idx}")
@@ -2459,20 +3402,20 @@ class App(tk.Tk):
                 return
             if len(images) == 1:
                 idx = str(images[0]['Index'])
-                self.var_wim_index2.set(idx)
-                self._save_config()
+                self._set_wim_index(2, idx)
+                self._schedule_save()
                 self._log(f"自動選擇唯一映像 Index：{idx}")
             else:
                 self._log(f"第二個 WIM 包含 {len(images)} 個映像，需要手動選擇")
                 messagebox.showwarning("需要選擇 Index", "此 WIM 有多個映像，請先選擇 Index")
                 return
                 
-        if not os.path.exists(mdir):
+        if not _fs_cache.exists(mdir):
             self._log(f"第二個掛載資料夾不存在：{mdir}")
             messagebox.showwarning("路徑不存在", "第二個掛載資料夾不存在，請先建立")
             return
             
-        if os.listdir(mdir):
+        if not _fs_cache.listdir_empty(mdir):
             self._log(f"第二個掛載資料夾非空：{mdir}")
             messagebox.showwarning("資料夾非空", "DISM 需要空的掛載資料夾，請清空後再試")
             return
@@ -2485,10 +3428,13 @@ class App(tk.Tk):
             return
             
         self._log("第二個掛載前檢查通過，開始掛載...")
-        self._save_config()
-        self._thread(self._do_wim_mount2, wim, index, mdir, ro)
+        self._schedule_save()
+        self._thread(self._in_flight, 'wim2', self._do_wim_mount2,
+                     MountRequest(wim, index, mdir, ro, self._path_keys['wim2'], self._path_keys['mount_dir2']))
+        return True
 
-    def _do_wim_mount2(self, wim: str, index: int, mdir: str, ro: bool):
+    def _do_wim_mount2(self, req: MountRequest):
+        wim, index, mdir, ro = req.wim, req.index, req.mdir, req.ro
         readonly_text = "唯讀" if ro else "讀寫"
         self._log(f"正在掛載第二個 WIM...")
         self._log(f"  WIM 檔案: {wim}")
@@ -2496,68 +3442,85 @@ class App(tk.Tk):
         self._log(f"  掛載位置: {mdir}")
         self._log(f"  掛載模式: {readonly_text}")
         
+        # 已知掛載中目錄與映像都未被使用時，不必再查詢 DISM
+        if self._mount_known_free(req):
+            return self._perform_mount2(req)
+        
         # 先檢查是否已有掛載
         self._log("檢查現有掛載狀態...")
-        check_ok, mounted_images, check_err = WIMManager.get_mount_info()
+        check_ok, mounted_images, check_err = self._cached_mount_info()
         if check_ok and mounted_images:
-            # 檢查是否有衝突的掛載
-            conflict_found = False
-            for img in mounted_images:
-                img_file = img.get('ImageFile', '').lower()
-                img_index = img.get('ImageIndex', '')
-                img_mount_dir = img.get('MountDir', '')
+            # 檢查是否有衝突的掛載：路徑只正規化一次，先以 (路徑, Index) 直接查表
+            wim_norm = req.wim_norm
+            idx_str = str(index)
+            mounted = {(os.path.normpath(img.get('ImageFile', '')).casefold(), img.get('ImageIndex', '')): img
+                       for img in mounted_images}
+            conflict = mounted.get((wim_norm, idx_str))
+            if conflict is None:
+                # 路徑寫法不同時才退回子字串比對
+                for img in mounted_images:
+                    img_file = img.get('ImageFile', '').casefold()
+                    if img.get('ImageIndex', '') == idx_str and img_file and (img_file in wim_norm or wim_norm in img_file):
+                        conflict = img
+                        break
                 
-                # 檢查是否相同的 WIM 文件和 Index
-                if (os.path.normpath(wim).lower() in img_file or img_file in os.path.normpath(wim).lower()) and str(index) == img_index:
-                    conflict_found = True
-                    self._log(f"⚠️ 發現衝突: WIM {wim} Index {index} 已掛載到 {img_mount_dir}")
-                    
-                    def ask_user():
-                        response = messagebox.askyesnocancel(
-                            "掛載衝突 - WIM #2",
-                            f"映像 {os.path.basename(wim)} Index {index} 已經掛載到:\n{img_mount_dir}\n\n"
-                            f"請選擇處理方式:\n"
-                            f"是(Y) = 強制清理後重新掛載\n"
-                            f"否(N) = 取消掛載操作\n"
-                            f"取消 = 查看所有掛載狀態"
-                        )
-                        
-                        if response is True:  # 是 - 強制清理
-                            self._log("使用者選擇強制清理後重新掛載...")
-                            cleanup_ok, cleanup_msg = WIMManager.cleanup_mount()
-                            if cleanup_ok:
-                                self._log(f"✓ {cleanup_msg}")
-                                # 清理後重新嘗試掛載
-                                self._perform_mount2(wim, index, mdir, ro)
-                            else:
-                                self._log(f"✗ 清理失敗: {cleanup_msg}")
-                                messagebox.showerror("清理失敗", f"無法清理掛載狀態:\n{cleanup_msg}")
-                        elif response is False:  # 否 - 取消
-                            self._log("使用者選擇取消第二個掛載操作")
-                            return
-                        else:  # 取消 - 查看狀態
-                            self._log("顯示所有掛載狀態...")
-                            self._do_check_wim_mount_status()
-                            return
+            if conflict is not None:
+                img_mount_dir = conflict.get('MountDir', '')
+                self._log(f"⚠️ 發現衝突: WIM {wim} Index {index} 已掛載到 {img_mount_dir}")
+                
+                def ask_user():
+                    response = messagebox.askyesnocancel(
+                        "掛載衝突 - WIM #2",
+                        f"映像 {os.path.basename(wim)} Index {index} 已經掛載到:\n{img_mount_dir}\n\n"
+                        f"請選擇處理方式:\n"
+                        f"是(Y) = 強制清理後重新掛載\n"
+                        f"否(N) = 取消掛載操作\n"
+                        f"取消 = 查看所有掛載狀態"
+                    )
                     
-                    self.after(0, ask_user)
-                    return
-            
+                    if response is True:  # 是 - 強制清理
+                        self._log("使用者選擇強制清理後重新掛載...")
+                        cleanup_ok, cleanup_msg = WIMManager.cleanup_mount()
+                        self._invalidate_mount_info()
+                        if cleanup_ok:
+                            self._log(f"✓ {cleanup_msg}")
+                            # 清理後重新嘗試掛載
+                            return self._perform_mount2(req)
+                        else:
+                            self._log(f"✗ 清理失敗: {cleanup_msg}")
+                            messagebox.showerror("清理失敗", f"無法清理掛載狀態:\n{cleanup_msg}")
+                    elif response is False:  # 否 - 取消
+                        self._log("使用者選擇取消第二個掛載操作")
+                        return
+                    else:  # 取消 - 查看狀態
+                        self._log("顯示所有掛載狀態...")
+                        self._do_check_wim_mount_status()
+                        return
+                
+                # 使用者選擇前仍視為進行中，避免重複點擊另外開始掛載
+                self.after(0, self._in_flight, 'wim2', ask_user)
+                return True
+        
         # 沒有衝突，直接掛載
-        self._perform_mount2(wim, index, mdir, ro)
+        return self._perform_mount2(req)
     
-    def _perform_mount2(self, wim: str, index: int, mdir: str, ro: bool):
-        """實際執行第二個 WIM 掛載操作"""
-        ok, msg = WIMManager.mount_wim(wim, index, mdir, ro)
+    def _perform_mount2(self, req: MountRequest) -> bool:
+        """實際執行第二個 WIM 掛載操作；已排定清理後重試的詢問時回傳 True"""
+        wim, index, mdir, ro = req.wim, req.index, req.mdir, req.ro
+        ok, msg = WIMManager.mount_wim(wim, index, mdir, ro, self._log)
+        self._invalidate_mount_info(forget_mounts=not ok)
+        _fs_cache.invalidate(mdir)
         if ok:
+            self._remember_mount(req)
             self._log("✓ 第二個 WIM 掛載成功！")
             self._log(f"掛載位置: {mdir}")
-            messagebox.showinfo("掛載成功", f"第二個 WIM 已成功掛載到:\n{mdir}")
+            self._info("掛載成功", f"第二個 WIM 已成功掛載到:\n{mdir}")
         else:
             self._log(f"✗ 第二個 WIM 掛載失敗: {msg}")
             
             # 檢查是否是常見的掛載錯誤
-            if "0xc1420127" in msg or "already mounted" in msg.lower():
+            m = msg.lower()
+            if any(p in m for p in _ALREADY_MOUNTED):
                 def handle_mount_error():
                     response = messagebox.askyesno(
                         "掛載失敗 - 映像已掛載 (WIM #2)",
@@ -2566,18 +3529,21 @@ class App(tk.Tk):
                     if response:
                         self._log("嘗試清理掛載狀態後重試...")
                         cleanup_ok, cleanup_msg = WIMManager.cleanup_mount()
+                        self._invalidate_mount_info()
                         if cleanup_ok:
                             self._log(f"✓ 清理成功: {cleanup_msg}")
                             self._log("重新嘗試掛載第二個 WIM...")
-                            self._perform_mount2(wim, index, mdir, ro)
+                            return self._perform_mount2(req)
                         else:
                             self._log(f"✗ 清理失敗: {cleanup_msg}")
                             messagebox.showerror("清理失敗", f"無法清理掛載狀態:\n{cleanup_msg}")
                 
-                self.after(0, handle_mount_error)
+                self.after(0, self._in_flight, 'wim2', handle_mount_error)
+                return True
             else:
                 messagebox.showerror("掛載失敗", f"第二個掛載失敗:\n{msg}")
 
+    @_single_flight('wim2')
     def _on_wim_unmount2(self):
         mdir = self.var_mount_dir2.get().strip()
         commit = self.var_unmount_commit2.get()
@@ -2589,108 +3555,24 @@ class App(tk.Tk):
             
         commit_text = "提交變更" if commit else "丟棄變更"
         self._log(f"準備卸載第二個 WIM (模式: {commit_text})...")
-        self._thread(self._do_wim_unmount2, mdir, commit)
-
-    def _do_wim_unmount2(self, mdir: str, commit: bool):
-        commit_text = "提交變更 (/Commit)" if commit else "丟棄變更 (/Discard)"
-        self._log(f"正在卸載第二個 WIM...")
-        self._log(f"  掛載位置: {mdir}")
-        self._log(f"  卸載模式: {commit_text}")
-        
-        # 防呆：嘗試關閉指向掛載資料夾的檔案總管視窗
-        self._log("正在檢查並關閉相關檔案總管視窗...")
-        try:
-            close_ok, close_msg = WIMManager.close_explorer_windows(mdir)
-            if close_ok:
-                self._log(f"✓ {close_msg}")
-            else:
-                self._log(f"⚠ 關閉檔案總管視窗時出現問題: {close_msg}")
-                self._log("  繼續執行卸載程序...")
-        except Exception as e:
-            self._log(f"⚠ 關閉檔案總管視窗時發生錯誤: {e}")
-            self._log("  繼續執行卸載程序...")
-        
-        # 短暫等待以確保檔案總管完全關閉
-        import time
-        time.sleep(1)
-        
-        ok, msg = WIMManager.unmount_wim(mdir, commit)
-        if ok:
-            self._log("✓ 第二個 WIM 卸載成功！")
-            messagebox.showinfo("卸載成功", f"第二個 WIM 已成功卸載\n模式: {commit_text}")
-        else:
-            self._log(f"✗ 第二個 WIM 卸載失敗: {msg}")
-            if "is currently in use" in msg or "正在使用" in msg or "檔案正在使用中" in msg:
-                response = messagebox.askyesno(
-                    "卸載失敗", 
-                    f"第二個卸載失敗，可能有程式正在使用掛載資料夾:\n{msg}\n\n是否要強制重試？"
-                )
-                if response:
-                    self._log("使用者選擇強制重試第二個...")
-                    self._force_unmount_retry2(mdir, commit)
-            else:
-                messagebox.showerror("卸載失敗", f"第二個卸載失敗:\n{msg}")
-
-    def _force_unmount_retry2(self, mdir: str, commit: bool):
-        """強制重試卸載第二個 WIM"""
-        self._log("正在執行第二個強制卸載重試...")
-        
-        try:
-            self._log("嘗試關閉可能鎖定檔案的程式...")
-            
-            result = subprocess.run(['taskkill', '/F', '/IM', 'explorer.exe'], 
-                                  capture_output=True, text=True)
-            if result.returncode == 0:
-                self._log("已終止 explorer.exe 程序")
-                subprocess.Popen(['explorer.exe'])
-                self._log("已重新啟動 explorer.exe")
-            
-            import time
-            time.sleep(2)
-            
-            self._log("重新嘗試卸載第二個...")
-            ok, msg = WIMManager.unmount_wim(mdir, commit)
-            
-            if ok:
-                self._log("✓ 第二個強制卸載成功！")
-                messagebox.showinfo("卸載成功", "第二個強制卸載成功！")
-            else:
-                self._log(f"✗ 第二個強制卸載仍然失敗: {msg}")
-                messagebox.showerror("卸載失敗", f"第二個強制卸載仍然失敗:\n{msg}")
-                
-        except Exception as e:
-            self._log(f"第二個強制卸載過程中發生錯誤: {e}")
-            messagebox.showerror("錯誤", f"第二個強制卸載過程中發生錯誤: {e}")
+        self._thread(self._in_flight, 'wim2', self._do_wim_unmount2, mdir, commit)
+        return True
 
     def _on_close_explorer2(self):
         """手動關閉指向第二個掛載資料夾的檔案總管視窗"""
-        mdir = self.var_mount_dir2.get().strip()
-        
-        if not mdir:
-            messagebox.showwarning("輸入不完整", "請先指定第二個掛載資料夾")
-            return
-            
-        self._log("手動關閉第二個檔案總管視窗...")
-        self._thread(self._do_close_explorer2, mdir)
+        self._close_explorer_impl(slot=2)
 
-    def _do_close_explorer2(self, mdir: str):
-        """執行關閉第二個檔案總管的操作"""
-        try:
-            self._log(f"正在關閉指向 {mdir} 的檔案總管視窗...")
-            ok, msg = WIMManager.close_explorer_windows(mdir)
-            if ok:
-                self._log(f"✓ {msg}")
-                messagebox.showinfo("完成", f"已處理第二個檔案總管視窗\n{msg}")
-            else:
-                self._log(f"⚠ {msg}")
-                messagebox.showwarning("注意", f"處理第二個檔案總管視窗時遇到問題:\n{msg}")
-        except Exception as e:
-            self._log(f"關閉第二個檔案總管視窗時發生錯誤: {e}")
-            messagebox.showerror("錯誤", f"操作失敗: {e}")
+    def _do_wim_unmount(self, mdir: str, commit: bool) -> bool:
+        return self._do_wim_unmount_impl(mdir, commit, slot=1)
+
+    def _do_wim_unmount2(self, mdir: str, commit: bool) -> bool:
+        return self._do_wim_unmount_impl(mdir, commit, slot=2)
 
-    def _do_wim_unmount(self, mdir: str, commit: bool):
+    def _do_wim_unmount_impl(self, mdir: str, commit: bool, *, slot: int) -> bool:
+        """卸載前置作業；排定實際卸載後回傳 True，由 _finish_wim_unmount 解除進行中狀態"""
+        label = _SLOT_LABEL[slot]
         commit_text = "提交變更 (/Commit)" if commit else "丟棄變更 (/Discard)"
-        self._log(f"正在卸載 WIM...")
+        self._log(f"正在卸載{_SLOT_WIM[slot]}...")
         self._log(f"  掛載位置: {mdir}")
         self._log(f"  卸載模式: {commit_text}")
         
@@ -2707,63 +3589,86 @@ class App(tk.Tk):
             self._log(f"⚠ 關閉檔案總管視窗時發生錯誤: {e}")
             self._log("  繼續執行卸載程序...")
         
-        # 短暫等待以確保檔案總管完全關閉
-        import time
-        time.sleep(1)
-        
-        ok, msg = WIMManager.unmount_wim(mdir, commit)
-        if ok:
-            self._log("✓ WIM 卸載成功！")
-            messagebox.showinfo("卸載成功", f"WIM 已成功卸載\n模式: {commit_text}")
-        else:
-            self._log(f"✗ WIM 卸載失敗: {msg}")
-            if "is currently in use" in msg or "正在使用" in msg or "檔案正在使用中" in msg:
-                response = messagebox.askyesno(
-                    "卸載失敗", 
-                    f"卸載失敗，可能有程式正在使用掛載資料夾:\n{msg}\n\n是否要強制重試？\n（將嘗試更積極地關閉相關程式）"
-                )
-                if response:
-                    self._log("使用者選擇強制重試...")
-                    self._force_unmount_retry(mdir, commit)
+        # 等待檔案總管完全關閉：交回事件迴圈 1 秒後再排入背景執行卸載，不佔住工作執行緒
+        self.after(1000, self._thread, self._finish_wim_unmount, mdir, commit, slot)
+        return True
+
+    def _finish_wim_unmount(self, mdir: str, commit: bool, slot: int):
+        label = _SLOT_LABEL[slot]
+        commit_text = "提交變更 (/Commit)" if commit else "丟棄變更 (/Discard)"
+        retrying = False
+        try:
+            ok, msg = WIMManager.unmount_wim(mdir, commit, self._log)
+            self._invalidate_mount_info(forget_mounts=not ok)
+            _fs_cache.invalidate(mdir)
+            if ok:
+                self._forget_mount(mdir)
+                self._log(f"✓ {_SLOT_WIM[slot]} 卸載成功！")
+                self._info("卸載成功", f"{_SLOT_WIM[slot]} 已成功卸載\n模式: {commit_text}")
             else:
-                messagebox.showerror("卸載失敗", f"卸載失敗:\n{msg}")
+                self._log(f"✗ {_SLOT_WIM[slot]} 卸載失敗: {msg}")
+                m = msg.lower()
+                if any(p in m for p in _IN_USE_PATTERNS):
+                    response = messagebox.askyesno(
+                        "卸載失敗", 
+                        f"{label}卸載失敗，可能有程式正在使用掛載資料夾:\n{msg}\n\n是否要強制重試？\n（將嘗試更積極地關閉相關程式）"
+                    )
+                    if response:
+                        self._log(f"使用者選擇強制重試{label}...")
+                        retrying = self._force_unmount_retry_impl(mdir, commit, slot=slot)
+                else:
+                    messagebox.showerror("卸載失敗", f"{label}卸載失敗:\n{msg}")
+        finally:
+            # 轉交強制重試時由重試流程結束後解除
+            if not retrying:
+                self.after(0, self._end_flight, f"wim{slot}")
 
-    def _force_unmount_retry(self, mdir: str, commit: bool):
-        """強制重試卸載，使用更積極的方法"""
-        self._log("正在執行強制卸載重試...")
+    def _force_unmount_retry_impl(self, mdir: str, commit: bool, *, slot: int) -> bool:
+        """強制重試卸載，使用更積極的方法；已排定重試時回傳 True"""
+        label = _SLOT_LABEL[slot]
+        self._log(f"正在執行{label}強制卸載重試...")
         
         try:
-            # 嘗試使用 taskkill 關閉可能鎖定檔案的程式
+            # 嘗試關閉可能鎖定檔案的程式
             self._log("嘗試關閉可能鎖定檔案的程式...")
             
-            # 使用 handle.exe 或 lsof 類似功能（如果可用）
-            # 這裡使用簡單的方法：關閉所有 explorer.exe
-            result = subprocess.run(['taskkill', '/F', '/IM', 'explorer.exe'], 
-                                  capture_output=True, text=True)
-            if result.returncode == 0:
+            # 這裡使用簡單的方法：關閉所有 explorer.exe（直接呼叫 TerminateProcess，不另開 taskkill）
+            if _terminate_processes('explorer.exe'):
                 self._log("已終止 explorer.exe 程序")
-                # 重新啟動 explorer
-                subprocess.Popen(['explorer.exe'])
+                # 重新啟動 explorer（SW_SHOWNORMAL）
+                _ShellExecuteW(None, "open", "explorer.exe", None, None, 1)
                 self._log("已重新啟動 explorer.exe")
-            
-            # 等待程序完全終止
-            import time
-            time.sleep(2)
-            
+        except Exception as e:
+            self._log(f"{label}強制卸載過程中發生錯誤: {e}")
+            messagebox.showerror("錯誤", f"{label}強制卸載過程中發生錯誤: {e}")
+            return False
+        
+        # 等待程序完全終止後再排入背景重試
+        self.after(2000, self._thread, self._finish_force_unmount_retry, mdir, commit, slot)
+        return True
+
+    def _finish_force_unmount_retry(self, mdir: str, commit: bool, slot: int):
+        label = _SLOT_LABEL[slot]
+        try:
             # 再次嘗試卸載
-            self._log("重新嘗試卸載...")
-            ok, msg = WIMManager.unmount_wim(mdir, commit)
+            self._log(f"重新嘗試卸載{label}...")
+            ok, msg = WIMManager.unmount_wim(mdir, commit, self._log)
+            self._invalidate_mount_info(forget_mounts=not ok)
+            _fs_cache.invalidate(mdir)
             
             if ok:
-                self._log("✓ 強制卸載成功！")
-                messagebox.showinfo("卸載成功", "強制卸載成功！")
+                self._forget_mount(mdir)
+                self._log(f"✓ {label}強制卸載成功！")
+                self._info("卸載成功", f"{label}強制卸載成功！")
             else:
-                self._log(f"✗ 強制卸載仍然失敗: {msg}")
-                messagebox.showerror("卸載失敗", f"強制卸載仍然失敗:\n{msg}\n\n建議手動重開機後再試")
+                self._log(f"✗ {label}強制卸載仍然失敗: {msg}")
+                messagebox.showerror("卸載失敗", f"{label}強制卸載仍然失敗:\n{msg}\n\n建議手動重開機後再試")
                 
         except Exception as e:
-            self._log(f"強制卸載過程中發生錯誤: {e}")
-            messagebox.showerror("錯誤", f"強制卸載過程中發生錯誤: {e}")
+            self._log(f"{label}強制卸載過程中發生錯誤: {e}")
+            messagebox.showerror("錯誤", f"{label}強制卸載過程中發生錯誤: {e}")
+        finally:
+            self.after(0, self._end_flight, f"wim{slot}")
 
     # ---------- Driver 事件 ----------
     def _on_browse_driver_mount_dir(self):
@@ -2771,46 +3676,33 @@ class App(tk.Tk):
         if path:
             self.var_driver_mount_dir.set(path)
             self._log(f"已選擇映像掛載路徑：{path}")
-            self._save_config()
+            self._schedule_save()
 
     def _on_sync_from_wim1(self):
         """從 WIM#1 分頁同步掛載路徑"""
-        if not hasattr(self, 'var_mount_dir'):
-            messagebox.showwarning("同步失敗", "找不到 WIM#1 分頁的掛載路徑")
-            return
-            
-        wim_mount_dir = self.var_mount_dir.get().strip()
-        if not wim_mount_dir:
-            messagebox.showwarning("同步失敗", "WIM#1 分頁的掛載路徑為空\n請先在 WIM 分頁設定 WIM#1 掛載路徑")
-            return
-            
-        self.var_driver_mount_dir.set(wim_mount_dir)
-        self._log(f"✓ 已從 WIM#1 分頁同步掛載路徑：{wim_mount_dir}")
-        self._save_config()
-        messagebox.showinfo("同步成功", f"已同步 WIM#1 掛載路徑：\n{wim_mount_dir}")
+        self._sync_driver_mount_from(slot=1)
         
     def _on_sync_from_wim2(self):
         """從 WIM#2 分頁同步掛載路徑"""
-        if not hasattr(self, 'var_mount_dir2'):
-            messagebox.showwarning("同步失敗", "找不到 WIM#2 分頁的掛載路徑")
-            return
-            
-        wim_mount_dir = self.var_mount_dir2.get().strip()
+        self._sync_driver_mount_from(slot=2)
+
+    def _sync_driver_mount_from(self, *, slot: int):
+        wim_mount_dir = self._slot_mount_var(slot).get().strip()
         if not wim_mount_dir:
-            messagebox.showwarning("同步失敗", "WIM#2 分頁的掛載路徑為空\n請先在 WIM 分頁設定 WIM#2 掛載路徑")
+            messagebox.showwarning("同步失敗", f"WIM#{slot} 分頁的掛載路徑為空\n請先在 WIM 分頁設定 WIM#{slot} 掛載路徑")
             return
             
         self.var_driver_mount_dir.set(wim_mount_dir)
-        self._log(f"✓ 已從 WIM#2 分頁同步掛載路徑：{wim_mount_dir}")
-        self._save_config()
-        messagebox.showinfo("同步成功", f"已同步 WIM#2 掛載路徑：\n{wim_mount_dir}")
+        self._log(f"✓ 已從 WIM#{slot} 分頁同步掛載路徑：{wim_mount_dir}")
+        self._schedule_save()
+        self._info("同步成功", f"已同步 WIM#{slot} 掛載路徑：\n{wim_mount_dir}")
 
     def _on_browse_driver_source(self):
         path = filedialog.askdirectory(title="選擇驅動程式資料夾")
         if path:
             self.var_driver_source.set(path)
             self._log(f"已選擇驅動程式資料夾：{path}")
-            self._save_config()
+            self._schedule_save()
 
     def _on_browse_driver_file(self):
         # 根據目前路徑智能選擇初始目錄
@@ -2834,17 +3726,17 @@ class App(tk.Tk):
             # 檢查是否為 .inf 檔案並顯示資訊
             if path.lower().endswith('.inf'):
                 try:
-                    # 簡單讀取 .inf 檔案的基本資訊
-                    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read(500)  # 只讀取前 500 字元
-                        if 'DriverVer' in content:
-                            self._log("✓ 偵測到有效的驅動程式 .inf 檔案")
-                        else:
-                            self._log("⚠ 警告：可能不是標準的驅動程式 .inf 檔案")
-                except:
+                    # 只讀開頭 4 KiB 並直接比對位元組，不做解碼（UTF-16 的 .inf 也能找到）
+                    with open(path, 'rb') as f:
+                        head = f.read(4096)
+                    if _DRIVERVER_ASCII in head or _DRIVERVER_UTF16 in head:
+                        self._log("✓ 偵測到有效的驅動程式 .inf 檔案")
+                    else:
+                        self._log("⚠ 警告：可能不是標準的驅動程式 .inf 檔案")
+                except OSError:
                     self._log("無法讀取 .inf 檔案內容")
             
-            self._save_config()
+            self._schedule_save()
 
     def _on_check_mount_status(self):
         mount_dir = self.var_driver_mount_dir.get().strip()
@@ -2857,18 +3749,23 @@ class App(tk.Tk):
 
     def _do_check_mount_status(self, mount_dir: str):
         # 檢查路徑是否存在
-        if not os.path.exists(mount_dir):
+        if not _fs_cache.exists(mount_dir):
             self._log(f"路徑不存在：{mount_dir}")
             return
             
-        # 檢查是否有 Windows 資料夾（通常表示這是一個掛載的映像）
-        windows_path = os.path.join(mount_dir, "Windows")
-        system32_path = os.path.join(windows_path, "System32")
+        # 檢查是否有 Windows\System32 資料夾（通常表示這是一個掛載的映像）
+        # 掃描一次根目錄取得 Windows 項目，is_dir 直接使用掃描結果不另做 stat
+        try:
+            with os.scandir(mount_dir) as it:
+                windows_entry = next((e for e in it
+                                      if e.name.lower() == 'windows' and e.is_dir(follow_symlinks=False)), None)
+        except OSError:
+            windows_entry = None
         
-        if os.path.exists(windows_path) and os.path.exists(system32_path):
+        if windows_entry is not None and os.path.isdir(os.path.join(windows_entry.path, "System32")):
             self._log(f"✓ 映像掛載狀態正常：{mount_dir}")
             self._log("  發現 Windows 系統資料夾")
-            messagebox.showinfo("掛載狀態", "映像掛載狀態正常，可以進行驅動程式安裝")
+            self._info("掛載狀態", "映像掛載狀態正常，可以進行驅動程式安裝")
         else:
             self._log(f"⚠ 警告：路徑可能不是已掛載的映像：{mount_dir}")
             self._log("  未發現 Windows 系統資料夾")
@@ -2884,19 +3781,17 @@ class App(tk.Tk):
             messagebox.showwarning("輸入不完整", "請選擇映像掛載路徑和驅動程式來源")
             return
             
-        if not os.path.exists(mount_dir):
+        if not _fs_cache.exists(mount_dir):
             messagebox.showerror("路徑錯誤", "映像掛載路徑不存在")
             return
             
-        if not os.path.exists(driver_source):
+        if not _fs_cache.exists(driver_source):
             messagebox.showerror("路徑錯誤", "驅動程式路徑不存在")
             return
             
         self._log("開始安裝驅動程式...")
-        self._save_config()
-        self._thread(self._do_install_driver, mount_dir, driver_source, recurse, force_unsigned)
-
-    def _do_install_driver(self, mount_dir: str, driver_source: str, recurse: bool, force_unsigned: bool):
+        self._schedule_save()
+        
         recurse_text = "遞迴" if recurse else "非遞迴"
         unsigned_text = "允許未簽署" if force_unsigned else "僅簽署"
         
@@ -2906,10 +3801,15 @@ class App(tk.Tk):
         self._log(f"  搜尋模式: {recurse_text}")
         self._log(f"  簽署要求: {unsigned_text}")
         
-        ok, msg = DriverManager.add_driver_to_offline_image(mount_dir, driver_source, recurse, force_unsigned)
+        self._run_async(DriverManager.add_driver_to_offline_image, mount_dir, driver_source, recurse, force_unsigned,
+                        on_done=self._on_install_driver_done, buttons=(self.btn_install_driver,))
+
+    def _on_install_driver_done(self, result: tuple[bool, str]):
+        """驅動程式安裝完成（主執行緒）"""
+        ok, msg = result
         if ok:
-            self._log("✓ 驅動程式安裝成功！")
-            messagebox.showinfo("安裝成功", "驅動程式已成功安裝到離線映像")
+            self._log(f"✓ 驅動程式安裝成功！（{msg}）")
+            self._info("安裝成功", f"驅動程式已成功安裝到離線映像\n{msg}")
         else:
             self._log(f"✗ 驅動程式安裝失敗: {msg}")
             messagebox.showerror("安裝失敗", f"驅動程式安裝失敗:\n{msg}")
@@ -2921,14 +3821,14 @@ class App(tk.Tk):
             messagebox.showwarning("路徑為空", "請先設定萃取輸出目錄")
             return
             
-        if not os.path.exists(output_path):
+        if not _fs_cache.exists(output_path):
             messagebox.showwarning("路徑無效", "萃取輸出目錄不存在，請先執行萃取")
             return
             
         self.var_driver_source.set(output_path)
         self._log(f"✓ 已設定萃取結果為驅動程式來源：{output_path}")
-        self._save_config()
-        messagebox.showinfo("設定完成", f"已將萃取結果設為驅動程式來源：\n{output_path}")
+        self._schedule_save()
+        self._info("設定完成", f"已將萃取結果設為驅動程式來源：\n{output_path}")
 
     def _on_list_drivers(self):
         mount_dir = self.var_driver_mount_dir.get().strip()
@@ -2936,17 +3836,18 @@ class App(tk.Tk):
             messagebox.showwarning("輸入不完整", "請先輸入映像掛載路徑")
             return
             
-        if not os.path.exists(mount_dir):
+        if not _fs_cache.exists(mount_dir):
             messagebox.showerror("路徑錯誤", "映像掛載路徑不存在")
             return
             
         self._log("開始列出已安裝的驱動程式...")
-        self._thread(self._do_list_drivers, mount_dir)
-
-    def _do_list_drivers(self, mount_dir: str):
         self._log(f"正在查詢映像中的驅動程式: {mount_dir}")
-        
-        ok, drivers, err = DriverManager.get_drivers_in_offline_image(mount_dir)
+        self._run_async(DriverManager.get_drivers_in_offline_image, mount_dir,
+                        on_done=self._on_list_drivers_done, buttons=(self.btn_list_drivers,))
+
+    def _on_list_drivers_done(self, result: tuple):
+        """驅動程式查詢完成（主執行緒）"""
+        ok, drivers, err = result
         if not ok:
             self._log(f"查詢驅動程式失敗: {err}")
             messagebox.showerror("查詢失敗", f"無法查詢驅動程式:\n{err}")
@@ -2957,13 +3858,13 @@ class App(tk.Tk):
             messagebox.showinfo("查詢結果", "映像中沒有找到已安裝的驅動程式")
             return
             
-        self._log(f"找到 {len(drivers)} 個已安裝的驅動程式:")
-        for i, driver in enumerate(drivers, 1):
-            name = driver.get('PublishedName', 'N/A')
-            provider = driver.get('Provider', 'N/A')
-            version = driver.get('Version', 'N/A')
-            date = driver.get('Date', 'N/A')
-            self._log(f"  {i:2d}. {name} - {provider} (v{version}, {date})")
+        lines = [f"找到 {len(drivers)} 個已安裝的驅動程式:"]
+        lines.extend(
+            f"  {i:2d}. {d.get('PublishedName', 'N/A')} - {d.get('Provider', 'N/A')} "
+            f"(v{d.get('Version', 'N/A')}, {d.get('Date', 'N/A')})"
+            for i, d in enumerate(drivers, 1)
+        )
+        self._log("\n".join(lines))
             
         messagebox.showinfo("查詢結果", f"找到 {len(drivers)} 個已安裝的驅動程式\n詳細資訊請查看日誌")
 
@@ -2975,44 +3876,32 @@ class App(tk.Tk):
         if path:
             self.var_extract_source.set(path)
             self._log(f"已選擇來源 WIM 檔案：{path}")
-            self._save_config()
+            self._schedule_save()
 
     def _on_sync_extract_from_wim1(self):
         """從 WIM#1 分頁同步來源路徑"""
-        if not hasattr(self, 'var_mount_dir'):
-            messagebox.showwarning("同步失敗", "找不到 WIM#1 分頁的掛載路徑")
-            return
-            
-        wim_mount_dir = self.var_mount_dir.get().strip()
-        if not wim_mount_dir:
-            messagebox.showwarning("同步失敗", "WIM#1 分頁的掛載路徑為空")
-            return
-            
-        self.var_extract_source.set(wim_mount_dir)
-        self._log(f"✓ 已同步來源映像路徑（WIM#1）：{wim_mount_dir}")
-        self._save_config()
+        self._sync_extract_source_from(slot=1)
 
     def _on_sync_extract_from_wim2(self):
         """從 WIM#2 分頁同步來源路徑"""
-        if not hasattr(self, 'var_mount_dir2'):
-            messagebox.showwarning("同步失敗", "找不到 WIM#2 分頁的掛載路徑")
-            return
-            
-        wim_mount_dir = self.var_mount_dir2.get().strip()
+        self._sync_extract_source_from(slot=2)
+
+    def _sync_extract_source_from(self, *, slot: int):
+        wim_mount_dir = self._slot_mount_var(slot).get().strip()
         if not wim_mount_dir:
-            messagebox.showwarning("同步失敗", "WIM#2 分頁的掛載路徑為空")
+            messagebox.showwarning("同步失敗", f"WIM#{slot} 分頁的掛載路徑為空")
             return
             
         self.var_extract_source.set(wim_mount_dir)
-        self._log(f"✓ 已同步來源映像路徑（WIM#2）：{wim_mount_dir}")
-        self._save_config()
+        self._log(f"✓ 已同步來源映像路徑（WIM#{slot}）：{wim_mount_dir}")
+        self._schedule_save()
 
     def _on_browse_extract_output(self):
         path = filedialog.askdirectory(title="選擇驅動萃取輸出目錄")
         if path:
             self.var_extract_output.set(path)
             self._log(f"已選擇萃取輸出目錄：{path}")
-            self._save_config()
+            self._schedule_save()
 
     def _on_create_extract_dir(self):
         """建立萃取目錄"""
@@ -3022,13 +3911,14 @@ class App(tk.Tk):
             return
         
         try:
-            if os.path.exists(path):
-                messagebox.showinfo("目錄狀態", f"目錄已存在：{path}")
+            if _fs_cache.exists(path):
+                self._info("目錄狀態", f"目錄已存在：{path}")
             else:
                 os.makedirs(path, exist_ok=True)
+                _fs_cache.invalidate(path)
                 self._log(f"✓ 已建立萃取目錄：{path}")
-                messagebox.showinfo("建立成功", f"已建立萃取目錄：{path}")
-                self._save_config()
+                self._info("建立成功", f"已建立萃取目錄：{path}")
+                self._schedule_save()
         except Exception as e:
             self._log(f"建立目錄失敗：{e}")
             messagebox.showerror("建立失敗", f"無法建立目錄：{e}")
@@ -3036,16 +3926,11 @@ class App(tk.Tk):
     def _on_open_extract_dir(self):
         """開啟萃取目錄"""
         path = self.var_extract_output.get().strip()
-        if not path or not os.path.exists(path):
+        if not path or not _fs_cache.exists(path):
             self._log("萃取目錄不存在或路徑無效")
             messagebox.showwarning("路徑無效", "萃取目錄不存在，請先建立目錄")
             return
-        try:
-            os.startfile(path)
-            self._log(f"已開啟萃取目錄：{path}")
-        except Exception as e:
-            self._log(f"開啟萃取目錄失敗：{e}")
-            messagebox.showerror("開啟失敗", f"無法開啟目錄：{e}")
+        self._open_dir_async(path, "萃取目錄")
 
     def _on_extract_drivers(self):
         source_path = self.var_extract_source.get().strip()
@@ -3055,38 +3940,42 @@ class App(tk.Tk):
             messagebox.showwarning("輸入不完整", "請選擇來源映像掛載目錄和萃取輸出目錄")
             return
             
-        if not os.path.exists(source_path):
+        if not _fs_cache.exists(source_path):
             messagebox.showerror("路徑錯誤", "來源映像掛載目錄不存在")
             return
             
         self._log("開始萃取驅動程式...")
-        self._save_config()
-        self._thread(self._do_extract_drivers, source_path, output_path)
-
-    def _do_extract_drivers(self, source_path: str, output_path: str):
+        self._schedule_save()
+        
         self._log(f"正在從映像萃取驅動程式...")
         self._log(f"  來源映像目錄: {source_path}")
         self._log(f"  輸出目錄: {output_path}")
         
-        ok, msg = DriverManager.export_drivers_from_offline_image(source_path, output_path)
+        self._run_async(DriverManager.export_drivers_from_offline_image, source_path, output_path,
+                        on_done=lambda result: self._on_extract_drivers_done(result, output_path),
+                        buttons=(self.btn_extract_drivers,))
+
+    def _on_extract_drivers_done(self, result: tuple[bool, str], output_path: str):
+        """驅動程式萃取完成（主執行緒）"""
+        ok, msg = result
+        _fs_cache.invalidate(output_path)
         if ok:
             self._log("✓ 驅動程式萃取成功！")
             self._log(f"驅動程式已萃取到: {output_path}")
             
             # 自動將萃取結果設為驅動程式來源
-            if hasattr(self, 'var_driver_source'):
-                self.var_driver_source.set(output_path)
-                self._log("✓ 已自動設定為驅動程式來源")
-                self._save_config()
+            self.var_driver_source.set(output_path)
+            self._log("✓ 已自動設定為驅動程式來源")
+            self._schedule_save()
             
-            messagebox.showinfo("萃取成功", f"驅動程式已成功萃取到:\n{output_path}\n\n已自動設為驅動程式來源")
+            self._info("萃取成功", f"驅動程式已成功萃取到:\n{output_path}\n\n已自動設為驅動程式來源")
         else:
             self._log(f"✗ 驅動程式萃取失敗: {msg}")
             messagebox.showerror("萃取失敗", f"驅動程式萃取失敗:\n{msg}")
 
     def _on_view_extracted_drivers(self):
         output_path = self.var_extract_output.get().strip()
-        if not output_path or not os.path.exists(output_path):
+        if not output_path or not _fs_cache.exists(output_path):
             messagebox.showwarning("路徑無效", "萃取目錄不存在或無效")
             return
             
@@ -3098,15 +3987,16 @@ class App(tk.Tk):
         if ok:
             self._log(f"✓ {msg}")
             if drivers:
-                self._log("萃取的驅動程式清單:")
-                for i, driver in enumerate(drivers, 1):
-                    self._log(f"  {i:2d}. {driver['name']} ({driver.get('folder', driver['path'])})")
-                messagebox.showinfo("掃描結果", f"{msg}\n詳細清單請查看日誌")
+                lines = ["萃取的驅動程式清單:"]
+                lines.extend(f"  {i:2d}. {d['name']} ({d.get('folder', d['path'])})" for i, d in enumerate(drivers, 1))
+                self._log("\n".join(lines))
+                # 與日誌重繪同延遲且較晚排程，清單先顯示再跳出提示
+                self.after(_LOG_FLUSH_MS, self._info, "掃描結果", f"{msg}\n詳細清單請查看日誌")
             else:
-                messagebox.showinfo("掃描結果", "未找到任何 .inf 驅動程式檔案")
+                self.after(_LOG_FLUSH_MS, self._info, "掃描結果", "未找到任何 .inf 驅動程式檔案")
         else:
             self._log(f"✗ 掃描失敗: {msg}")
-            messagebox.showerror("掃描失敗", f"掃描驅動程式失敗:\n{msg}")
+            self.after(_LOG_FLUSH_MS, lambda: messagebox.showerror("掃描失敗", f"掃描驅動程式失敗:\n{msg}"))
 
     # 設定檔
     def _load_config(self):
@@ -3115,56 +4005,90 @@ class App(tk.Tk):
                 self.cfg.read(CONFIG_FILE, encoding='utf-8')
         except Exception:
             pass
+        # 啟動時一次展開成 (區段, 鍵) -> 值，之後讀取不再經過 ConfigParser
+        self._cfg_dict = {(sec, k): v for sec in self.cfg.sections() for k, v in self.cfg.items(sec)}
 
-    def _cfg_get(self, section: str, option: str):
-        if self.cfg.has_section(section) and self.cfg.has_option(section, option):
-            return self.cfg.get(section, option)
-        return None
+    def _cfg_get(self, section: str, key: str, default: Optional[str] = None) -> Optional[str]:
+        return self._cfg_dict.get((section, key), default)
 
     def _save_config(self):
         try:
             # WIM 設定
             if not self.cfg.has_section('WIM'):
                 self.cfg.add_section('WIM')
-            self.cfg.set('WIM', 'wim_file', self.var_wim.get().strip() if hasattr(self, 'var_wim') else '')
-            self.cfg.set('WIM', 'mount_dir', self.var_mount_dir.get().strip() if hasattr(self, 'var_mount_dir') else '')
-            self.cfg.set('WIM', 'index', self.var_wim_index.get().strip() if hasattr(self, 'var_wim_index') else '')
-            self.cfg.set('WIM', 'readonly', '1' if (hasattr(self, 'var_wim_readonly') and self.var_wim_readonly.get()) else '0')
-            self.cfg.set('WIM', 'unmount_commit', '1' if (hasattr(self, 'var_unmount_commit') and self.var_unmount_commit.get()) else '0')
+            self.cfg.set('WIM', 'wim_file', self.var_wim.get().strip())
+            self.cfg.set('WIM', 'mount_dir', self.var_mount_dir.get().strip())
+            self.cfg.set('WIM', 'index', self.var_wim_index.get().strip())
+            self.cfg.set('WIM', 'readonly', '1' if self.var_wim_readonly.get() else '0')
+            self.cfg.set('WIM', 'unmount_commit', '1' if self.var_unmount_commit.get() else '0')
             
             # WIM #2 設定
             if not self.cfg.has_section('WIM2'):
                 self.cfg.add_section('WIM2')
-            self.cfg.set('WIM2', 'wim_file', self.var_wim2.get().strip() if hasattr(self, 'var_wim2') else '')
-            self.cfg.set('WIM2', 'mount_dir', self.var_mount_dir2.get().strip() if hasattr(self, 'var_mount_dir2') else '')
-            self.cfg.set('WIM2', 'index', self.var_wim_index2.get().strip() if hasattr(self, 'var_wim_index2') else '')
-            self.cfg.set('WIM2', 'readonly', '1' if (hasattr(self, 'var_wim_readonly2') and self.var_wim_readonly2.get()) else '0')
-            self.cfg.set('WIM2', 'unmount_commit', '1' if (hasattr(self, 'var_unmount_commit2') and self.var_unmount_commit2.get()) else '0')
+            self.cfg.set('WIM2', 'wim_file', self.var_wim2.get().strip())
+            self.cfg.set('WIM2', 'mount_dir', self.var_mount_dir2.get().strip())
+            self.cfg.set('WIM2', 'index', self.var_wim_index2.get().strip())
+            self.cfg.set('WIM2', 'readonly', '1' if self.var_wim_readonly2.get() else '0')
+            self.cfg.set('WIM2', 'unmount_commit', '1' if self.var_unmount_commit2.get() else '0')
             
             # Driver 設定
             if not self.cfg.has_section('DRIVER'):
                 self.cfg.add_section('DRIVER')
-            self.cfg.set('DRIVER', 'mount_dir', self.var_driver_mount_dir.get().strip() if hasattr(self, 'var_driver_mount_dir') else '')
-            self.cfg.set('DRIVER', 'source_path', self.var_driver_source.get().strip() if hasattr(self, 'var_driver_source') else '')
-            self.cfg.set('DRIVER', 'recurse', '1' if (hasattr(self, 'var_driver_recurse') and self.var_driver_recurse.get()) else '0')
-            self.cfg.set('DRIVER', 'force_unsigned', '1' if (hasattr(self, 'var_driver_force_unsigned') and self.var_driver_force_unsigned.get()) else '0')
+            self.cfg.set('DRIVER', 'mount_dir', self.var_driver_mount_dir.get().strip())
+            self.cfg.set('DRIVER', 'source_path', self.var_driver_source.get().strip())
+            self.cfg.set('DRIVER', 'recurse', '1' if self.var_driver_recurse.get() else '0')
+            self.cfg.set('DRIVER', 'force_unsigned', '1' if self.var_driver_force_unsigned.get() else '0')
             
             # Extract 設定
             if not self.cfg.has_section('EXTRACT'):
                 self.cfg.add_section('EXTRACT')
-            self.cfg.set('EXTRACT', 'source_path', self.var_extract_source.get().strip() if hasattr(self, 'var_extract_source') else '')
-            self.cfg.set('EXTRACT', 'output_path', self.var_extract_output.get().strip() if hasattr(self, 'var_extract_output') else '')
+            self.cfg.set('EXTRACT', 'source_path', self.var_extract_source.get().strip())
+            self.cfg.set('EXTRACT', 'output_path', self.var_extract_output.get().strip())
+            
+            # 介面設定
+            if not self.cfg.has_section('UI'):
+                self.cfg.add_section('UI')
+            self.cfg.set('UI', 'suppress_info_dialogs', '1' if self.var_suppress_info_dialogs.get() else '0')
             
             # 設定檔直接放在程式同層，不需要建立額外資料夾
-            with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-                self.cfg.write(f)
+            # 先在記憶體組好整份內容，一次寫入暫存檔再取代，寫入中斷時不會留下半個設定檔
+            buf = StringIO()
+            self.cfg.write(buf)
+            tmp = CONFIG_FILE + '.tmp'
+            with open(tmp, 'w', encoding='utf-8', buffering=1 << 16) as f:
+                f.write(buf.getvalue())
+            os.replace(tmp, CONFIG_FILE)
+            self._cfg_dirty = False
         except Exception:
             pass
 
+    def _schedule_save(self):
+        """標記設定已變更，最後一次變更 500ms 後才統一寫檔"""
+        self._cfg_dirty = True
+        if self._cfg_after is not None:
+            self.after_cancel(self._cfg_after)
+        self._cfg_after = self.after(500, self._flush_cfg)
+
+    def _flush_cfg(self):
+        if self._cfg_after is not None:
+            self.after_cancel(self._cfg_after)
+            self._cfg_after = None
+        if self._cfg_dirty:
+            self._save_config()
+
+    def _on_close(self):
+        """關閉視窗前寫入尚未儲存的設定；尚未開始的背景作業直接取消，不讓行程在視窗關閉後繼續等待"""
+        self._flush_cfg()
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
+        self.destroy()
+
 
 def main():
     app = App()
-    app.mainloop()
+    try:
+        app.mainloop()
+    finally:
+        _ps_host.close()
 
 
 if __name__ == '__main__':
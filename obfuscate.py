@@ -9,11 +9,20 @@ import base64
 import codecs
 import keyword
 import random
+import re
 import string
 import os
 import sys
 
 class SimpleObfuscator:
+    # 替換一些常見的字符串：Base64 值於載入時計算，整份內容只掃描一次
+    _REPLACE_WORDS = ('WIM', 'Driver', 'Error', 'Success', 'Mount', 'Unmount')
+    _REPLACE = {
+        f"'{w}'": f"base64.b64decode('{base64.b64encode(w.encode()).decode()}').decode()"
+        for w in _REPLACE_WORDS
+    }
+    _REPLACE_RE = re.compile('|'.join(map(re.escape, _REPLACE)))
+
     def __init__(self):
         self.var_map = {}
         self.string_pool = []
@@ -61,30 +70,18 @@ def _decode_data():
     global ''' + ', '.join(f"_str_{i}" for i in range(10)) + '''
 '''
         
-        # 基本的字符串替換混淆
-        obfuscated_content = content
-        
-        # 替換一些常見的字符串
-        string_replacements = [
-            ("'WIM'", "base64.b64decode('V0lN').decode()"),
-            ("'Driver'", "base64.b64decode('RHJpdmVy').decode()"),
-            ("'Error'", "base64.b64decode('RXJyb3I=').decode()"),
-            ("'Success'", "base64.b64decode('U3VjY2Vzcw==').decode()"),
-            ("'Mount'", "base64.b64decode('TW91bnQ=').decode()"),
-            ("'Unmount'", "base64.b64decode('VW5tb3VudA==').decode()"),
-        ]
-        
-        for original, replacement in string_replacements:
-            obfuscated_content = obfuscated_content.replace(original, replacement)
+        # 基本的字符串替換混淆（單一正規式一次完成所有替換）
+        table = self._REPLACE
+        obfuscated_content = self._REPLACE_RE.sub(lambda m: table[m.group(0)], content)
         
-        # 寫入混淆後的文件
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write("# Obfuscated by Simple Python Obfuscator\n")
-            f.write("# -*- coding: utf-8 -*-\n\n")
-            for imp in imports:
-                f.write(f"{imp}\n")
-            f.write("\n")
-            f.write(obfuscated_content)
+        # 寫入混淆後的文件（檔頭在記憶體組好，整份一次寫出）
+        header = (
+            "# Obfuscated by Simple Python Obfuscator\n"
+            "# -*- coding: utf-8 -*-\n\n"
+            + "\n".join(imports) + "\n\n"
+        )
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write(header + obfuscated_content)
 
 def main():
     if len(sys.argv) != 3:
@@ -13,35 +13,86 @@ import threading
 import ctypes
 from ctypes import wintypes
 
+# 可疑的除錯 / 監控工具名稱（子字串比對）
+SUSPICIOUS_NAMES = (
+    'ollydbg', 'x64dbg', 'windbg', 'ida', 'cheatengine',
+    'processhacker', 'procmon', 'wireshark', 'fiddler'
+)
+# 比對用：短名稱在前（最短的 'ida' 最常命中），逐一比對時可以最早結束
+_SUSPICIOUS_TUPLE = tuple(sorted(SUSPICIOUS_NAMES, key=len))
+
+# 虛擬機型號關鍵字
+VM_INDICATORS = ('VBOX', 'VMWARE', 'QEMU', 'XEN', 'VIRTUAL')
+
+# Win32 API（載入時設定好函式原型，檢查時直接呼叫）
+if os.name == 'nt':
+    TH32CS_SNAPPROCESS = 0x00000002
+    INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+    class PROCESSENTRY32W(ctypes.Structure):
+        _fields_ = [
+            ("dwSize", wintypes.DWORD),
+            ("cntUsage", wintypes.DWORD),
+            ("th32ProcessID", wintypes.DWORD),
+            ("th32DefaultHeapID", ctypes.c_size_t),
+            ("th32ModuleID", wintypes.DWORD),
+            ("cntThreads", wintypes.DWORD),
+            ("th32ParentProcessID", wintypes.DWORD),
+            ("pcPriClassBase", ctypes.c_long),
+            ("dwFlags", wintypes.DWORD),
+            ("szExeFile", wintypes.WCHAR * 260),
+        ]
+
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    _kernel32.IsDebuggerPresent.argtypes = ()
+    _kernel32.IsDebuggerPresent.restype = wintypes.BOOL
+    _kernel32.CreateToolhelp32Snapshot.argtypes = (wintypes.DWORD, wintypes.DWORD)
+    _kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    _kernel32.Process32FirstW.argtypes = (wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W))
+    _kernel32.Process32FirstW.restype = wintypes.BOOL
+    _kernel32.Process32NextW.argtypes = (wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W))
+    _kernel32.Process32NextW.restype = wintypes.BOOL
+    _kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+    _kernel32.CloseHandle.restype = wintypes.BOOL
+    _IsDebuggerPresent = _kernel32.IsDebuggerPresent
+
+def _process_names():
+    """以一次 Toolhelp32 快照列出所有程序的映像名稱（小寫），不必逐一開啟程序"""
+    snap = _kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+    if not snap or snap == INVALID_HANDLE_VALUE:
+        raise ctypes.WinError(ctypes.get_last_error())
+    try:
+        entry = PROCESSENTRY32W()
+        entry.dwSize = ctypes.sizeof(entry)
+        ok = _kernel32.Process32FirstW(snap, ctypes.byref(entry))
+        while ok:
+            yield entry.szExeFile.lower()
+            ok = _kernel32.Process32NextW(snap, ctypes.byref(entry))
+    finally:
+        _kernel32.CloseHandle(snap)
+
 class SecurityProtection:
-    def __init__(self):
+    def __init__(self, enable_vm_check=True):
         self.start_time = time.time()
         self.check_interval = random.uniform(30, 60)  # 隨機檢查間隔
+        self._timer = None
+        # 虛擬機偵測結果（執行期間不會改變，只查詢一次）；停用時視為已檢查且不在虛擬機中
+        self._in_vm = None if enable_vm_check else False
         
     def anti_debug_check(self):
         """反調試檢查"""
         try:
             # 檢查是否有調試器附加
-            kernel32 = ctypes.windll.kernel32
-            if kernel32.IsDebuggerPresent():
+            if _IsDebuggerPresent():
                 return False
                 
-            # 檢查進程名稱
-            import psutil
-            current_process = psutil.Process()
-            suspicious_names = [
-                'ollydbg', 'x64dbg', 'windbg', 'ida', 'cheatengine',
-                'processhacker', 'procmon', 'wireshark', 'fiddler'
-            ]
-            
-            for proc in psutil.process_iter(['name']):
-                try:
-                    if any(sus in proc.info['name'].lower() for sus in suspicious_names):
+            # 檢查進程名稱（找到第一個就結束，不再掃描其餘程序）
+            for name in _process_names():
+                for sus in _SUSPICIOUS_TUPLE:
+                    if sus in name:
                         return False
-                except:
-                    continue
                     
-        except:
+        except Exception:
             pass
         return True
     
@@ -58,36 +109,48 @@ class SecurityProtection:
                 return False
                 
             # 檢查是否在虛擬機中運行
-            vm_indicators = [
-                'VBOX', 'VMWARE', 'QEMU', 'XEN', 'VIRTUAL'
-            ]
-            
-            try:
-                import wmi
-                c = wmi.WMI()
-                for system in c.Win32_ComputerSystem():
-                    if any(vm in system.Model.upper() for vm in vm_indicators):
-                        return False
-            except:
-                pass
+            if self._in_vm is None:
+                self._in_vm = self._detect_vm()
+            if self._in_vm:
+                return False
                 
-        except:
+        except Exception:
             pass
         return True
     
-    def runtime_protection(self):
-        """運行時保護線程"""
-        while True:
-            time.sleep(self.check_interval)
-            
-            if not self.anti_debug_check():
-                self._exit_protection()
-            
-            if not self.integrity_check():
-                self._exit_protection()
-            
-            # 更新檢查間隔
-            self.check_interval = random.uniform(30, 120)
+    def _detect_vm(self):
+        """查詢電腦型號判斷是否為虛擬機（WMI 連線成本高，只在啟動時於主執行緒執行一次）"""
+        # wmi（連帶 COM）只在真的需要檢查時才載入；未安裝時略過檢查
+        try:
+            import wmi
+        except ImportError:
+            return False
+        try:
+            c = wmi.WMI()
+            for system in c.Win32_ComputerSystem():
+                if any(vm in system.Model.upper() for vm in VM_INDICATORS):
+                    return True
+        except Exception:
+            pass
+        return False
+    
+    def _schedule(self):
+        """排程下一次檢查（不必常駐一條 sleep 中的執行緒）"""
+        self._timer = threading.Timer(self.check_interval, self._tick)
+        self._timer.daemon = True
+        self._timer.start()
+    
+    def _tick(self):
+        """運行時保護：執行一次檢查後重新排程"""
+        if not self.anti_debug_check():
+            self._exit_protection()
+        
+        if not self.integrity_check():
+            self._exit_protection()
+        
+        # 更新檢查間隔
+        self.check_interval = random.uniform(30, 120)
+        self._schedule()
     
     def _exit_protection(self):
         """保護性退出"""
@@ -95,7 +158,7 @@ class SecurityProtection:
         try:
             import gc
             gc.collect()
-        except:
+        except Exception:
             pass
         
         # 強制退出
@@ -109,9 +172,8 @@ class SecurityProtection:
         if not self.integrity_check():
             self._exit_protection()
         
-        # 啟動保護線程
-        protection_thread = threading.Thread(target=self.runtime_protection, daemon=True)
-        protection_thread.start()
+        # 排程定期檢查
+        self._schedule()
 
 # 創建全局保護實例
 _protection = SecurityProtection()
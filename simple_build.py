@@ -4,40 +4,29 @@
 使用基本混淆和onedir模式確保穩定運行
 """
 
+import base64
 import os
-import sys
-import subprocess
+import re
+import secrets
 import shutil
-import base64
-import random
-import string
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from ultimate_build import _hidden_imports, _run_pyinstaller
 
 class SimpleProtection:
-    def __init__(self):
-        self.key = self.generate_key()
-        
-    def generate_key(self):
-        """生成簡單密鑰"""
-        return ''.join(random.choices(string.ascii_letters + string.digits, k=16))
+    # 基本的字符串替換：Base64 編碼結果都是常數，類別定義時計算一次
+    _REPLACE_WORDS = ('WIM掛載工具', '驅動程式管理', '掛載', '卸載', '成功', '錯誤', 'Warning', 'Error')
+    _REPLACEMENTS = tuple(
+        (f"'{w}'", f"base64.b64decode('{base64.b64encode(w.encode()).decode()}').decode()")
+        for w in _REPLACE_WORDS
+    )
+    # 所有替換合成一個正規式，原始碼只掃描一次；直接處理 UTF-8 位元組，讀檔到寫檔之間不必解碼再編碼
+    _TABLE = {k.encode('utf-8'): v.encode('utf-8') for k, v in _REPLACEMENTS}
+    _PATTERN = re.compile(b"|".join(re.escape(k) for k in _TABLE))
     
-    def simple_obfuscate(self, source_code):
-        """簡單字符串混淆"""
-        # 基本的字符串替換
-        replacements = [
-            ("'WIM掛載工具'", f"base64.b64decode('{base64.b64encode('WIM掛載工具'.encode()).decode()}').decode()"),
-            ("'驅動程式管理'", f"base64.b64decode('{base64.b64encode('驅動程式管理'.encode()).decode()}').decode()"),
-            ("'掛載'", f"base64.b64decode('{base64.b64encode('掛載'.encode()).decode()}').decode()"),
-            ("'卸載'", f"base64.b64decode('{base64.b64encode('卸載'.encode()).decode()}').decode()"),
-            ("'成功'", f"base64.b64decode('{base64.b64encode('成功'.encode()).decode()}').decode()"),
-            ("'錯誤'", f"base64.b64decode('{base64.b64encode('錯誤'.encode()).decode()}').decode()"),
-            ("'Warning'", f"base64.b64decode('{base64.b64encode('Warning'.encode()).decode()}').decode()"),
-            ("'Error'", f"base64.b64decode('{base64.b64encode('Error'.encode()).decode()}').decode()"),
-        ]
-        
-        obfuscated = source_code
-        
-        # 添加基本保護導入
-        protection_header = '''
+    # 添加基本保護導入
+    _PROTECTION_HEADER = '''
 # Basic Protection
 import base64
 import os
@@ -57,13 +46,22 @@ def _basic_check():
 if not _basic_check():
     sys.exit(1)
 
-'''
+'''.encode('utf-8')
+    
+    def __init__(self):
+        self.key = self.generate_key()
         
+    def generate_key(self):
+        """生成簡單密鑰"""
+        return secrets.token_urlsafe(12)  # 16 個字元
+    
+    @staticmethod
+    def simple_obfuscate(source_code):
+        """簡單字符串混淆（輸入、輸出皆為 UTF-8 位元組）"""
         # 應用字符串替換
-        for original, replacement in replacements:
-            obfuscated = obfuscated.replace(original, replacement)
-        
-        return protection_header + obfuscated
+        table = SimpleProtection._TABLE
+        obfuscated = SimpleProtection._PATTERN.sub(lambda m: table[m.group(0)], source_code)
+        return b''.join((SimpleProtection._PROTECTION_HEADER, obfuscated))
     
     def create_protected_version(self, source_file, output_name):
         """創建保護版本"""
@@ -72,16 +70,16 @@ if not _basic_check():
         try:
             # 讀取源代碼
             print("步驟1: 讀取源代碼...")
-            with open(source_file, 'r', encoding='utf-8') as f:
+            with open(source_file, 'rb') as f:
                 source_code = f.read()
             
             # 簡單混淆
             print("步驟2: 執行基本混淆...")
             protected_code = self.simple_obfuscate(source_code)
             
-            # 寫入保護文件
+            # 寫入保護文件（已是 UTF-8 位元組，以二進位模式一次寫出）
             protected_file = f"{output_name}_simple.py"
-            with open(protected_file, 'w', encoding='utf-8') as f:
+            with open(protected_file, 'wb') as f:
                 f.write(protected_code)
             
             # 打包
@@ -106,30 +104,20 @@ if not _basic_check():
             cmd = [
                 'pyinstaller',
                 '--onedir',
+                '--noconfirm',
                 '--windowed',
                 '--distpath=simple_release',
                 '--workpath=simple_build',
                 '--specpath=simple_spec',
                 f'--name={output_name}',
-                '--hidden-import=tkinter',
-                '--hidden-import=tkinter.ttk',
-                '--hidden-import=tkinter.messagebox', 
-                '--hidden-import=tkinter.filedialog',
-                '--hidden-import=subprocess',
-                '--hidden-import=threading',
-                '--hidden-import=pathlib',
-                '--hidden-import=os',
-                '--hidden-import=sys',
-                '--hidden-import=base64',
-                '--hidden-import=configparser',
-                '--hidden-import=datetime',
-                '--hidden-import=re',
+                # 標準庫模組 PyInstaller 會自行找到，只需補上 tkinter 子模組
+                *(f'--hidden-import={m}' for m in _hidden_imports('tkinter')),
                 script_file
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            returncode, log_tail = _run_pyinstaller(cmd)
             
-            if result.returncode == 0:
+            if returncode == 0:
                 print(f"\\n=== 成功 ===")
                 print(f"簡化保護版本: simple_release/{output_name}/")
                 print(f"執行文件: simple_release/{output_name}/{output_name}.exe")
@@ -147,15 +135,17 @@ if not _basic_check():
                 print("✓ 隱藏控制台窗口")
                 return True
             else:
-                print(f"打包失敗: {result.stderr}")
+                print(f"打包失敗: {log_tail}")
                 return False
                 
         except Exception as e:
             print(f"打包出錯: {e}")
             return False
     
-    def cleanup(self):
-        """清理臨時文件"""
+    def cleanup(self, build_cache=False):
+        """清理臨時文件；PyInstaller 的分析快取（workpath / spec）預設保留給下次增量打包"""
+        if not build_cache:
+            return
         try:
             shutil.rmtree('simple_build', ignore_errors=True)
             shutil.rmtree('simple_spec', ignore_errors=True)
@@ -170,16 +160,33 @@ def main():
         print(f"錯誤: 找不到 {source_file}")
         sys.exit(1)
     
-    protector = SimpleProtection()
+    protectors = [SimpleProtection()]
+    builds = [(protectors[0].create_protected_version, source_file, output_name)]
+    
+    # 加上 --all 參數時同時建置終極保護版本；兩者的 workpath / distpath / specpath 各自獨立，
+    # 耗時的 PyInstaller 行程可以並行執行
+    if '--all' in sys.argv[1:]:
+        from ultimate_build import UltimateProtection
+        protectors.append(UltimateProtection())
+        builds.append((protectors[1].create_ultimate_executable, source_file, output_name))
     
     try:
-        success = protector.create_protected_version(source_file, output_name)
+        if len(builds) == 1:
+            # 只有一個版本時在主執行緒建置，PyInstaller 可直接在本行程執行
+            func, *args = builds[0]
+            success = func(*args)
+        else:
+            with ThreadPoolExecutor(max_workers=len(builds)) as pool:
+                futures = [pool.submit(*build) for build in builds]
+                success = all([f.result() for f in futures])
         if not success:
             print("保護和打包失敗")
             sys.exit(1)
             
     finally:
-        protector.cleanup()
+        # 加上 --clean 參數時才清除打包快取
+        for protector in protectors:
+            protector.cleanup(build_cache='--clean' in sys.argv[1:])
 
 if __name__ == "__main__":
     main()
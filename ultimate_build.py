@@ -7,26 +7,115 @@
 import os
 import sys
 import subprocess
+import logging
+import threading
+import importlib
+import pkgutil
 import shutil
-import tempfile
-import base64
-import random
-import string
-import hashlib
-import zlib
-import marshal
+from collections import deque
+import secrets
+
+# 加密 / 編譯用的模組（numpy、zlib、marshal 等）延後到實際用到時才載入，
+# 只查看說明或被 simple_build 匯入時不必付出載入成本
+
+# 編譯結果快取目錄（原始碼未變更時不必重新編譯）
+BUILD_CACHE_DIR = '.build_cache'
+
+def _source_imports(source):
+    """列出原始碼中所有 import 的模組（含函式內延後匯入的模組）。
+    終極版的程式碼加密後嵌在載入器字串裡，PyInstaller 分析不到其中的匯入，需逐一指定為 hidden import"""
+    import ast
+    import importlib.util
+    
+    names = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module)
+            # from 套件 import 子模組（例如 from tkinter import ttk）
+            for alias in node.names:
+                sub = f"{node.module}.{alias.name}"
+                try:
+                    if importlib.util.find_spec(sub) is not None:
+                        names.add(sub)
+                except (ImportError, ValueError):
+                    pass
+    return sorted(names)
+
+def _hidden_imports(pkg):
+    """列出套件及其直屬子模組（依目前的 Python 實際內容，不必手動維護清單；
+    略過子套件，例如 tkinter.test，也不會匯入任何子模組）"""
+    mod = importlib.import_module(pkg)
+    names = [pkg]
+    for m in pkgutil.iter_modules(mod.__path__, prefix=pkg + '.'):
+        if not m.ispkg and not m.name.rsplit('.', 1)[-1].startswith('_'):
+            names.append(m.name)
+    return names
+
+class _TailHandler(logging.Handler):
+    """保留最後數十筆 PyInstaller 日誌（本行程內執行時用）"""
+    def __init__(self, tail):
+        super().__init__()
+        self.tail = tail
+    
+    def emit(self, record):
+        self.tail.append(self.format(record) + '\n')
+
+def _run_pyinstaller_in_process(pyi_run, args):
+    """在本行程內執行 PyInstaller，回傳 (returncode, 最後數十行日誌)"""
+    tail = deque(maxlen=50)
+    handler = _TailHandler(tail)
+    logger = logging.getLogger('PyInstaller')
+    logger.addHandler(handler)
+    try:
+        pyi_run(args)
+        returncode = 0
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            returncode = e.code
+        elif e.code is None:
+            returncode = 0
+        else:
+            # 以字串結束（例如參數錯誤訊息）時，把訊息當作錯誤內容回報
+            tail.append(f"{e.code}\n")
+            returncode = 1
+    except Exception as e:
+        tail.append(f"{e}\n")
+        returncode = 1
+    finally:
+        logger.removeHandler(handler)
+    return returncode, ''.join(tail)
+
+def _run_pyinstaller(cmd):
+    """執行 PyInstaller：建置日誌（stderr）即時轉印，只保留最後數十行供失敗時顯示。
+    在主執行緒且可匯入 PyInstaller 時直接在本行程執行，省去啟動新直譯器與重新載入 PyInstaller；
+    PyInstaller 的全域狀態不能多執行緒同時使用，並行建置（其他執行緒）一律啟動子行程"""
+    if threading.current_thread() is threading.main_thread():
+        try:
+            from PyInstaller.__main__ import run as pyi_run
+        except ImportError:
+            pyi_run = None
+        if pyi_run is not None:
+            return _run_pyinstaller_in_process(pyi_run, cmd[1:])
+    
+    tail = deque(maxlen=50)
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    with proc:
+        for line in proc.stderr:
+            sys.stderr.write(line)
+            tail.append(line)
+    return proc.returncode, ''.join(tail)
 
 class UltimateProtection:
     def __init__(self):
+        import tempfile
         self.encryption_key = self.generate_strong_key()
         self.temp_dir = tempfile.mkdtemp()
         
     def generate_strong_key(self):
         """生成強加密密鑰"""
-        return ''.join(random.choices(
-            string.ascii_letters + string.digits + '!@#$%^&*',
-            k=64
-        ))
+        return secrets.token_urlsafe(48)  # 64 個字元，只含 URL 安全字元，可直接嵌入載入器字串
     
     def create_protected_loader(self, encrypted_payload):
         """創建受保護的加載器"""
@@ -36,7 +125,9 @@ import base64, zlib, marshal, sys, os, time, threading, random, hashlib
 
 class P:
     def __init__(self):
-        self.k = "{self.encryption_key[:32]}"
+        self.k = "{self.encryption_key}"
+        self.kb = self.k.encode()
+        self.klen = len(self.kb)
         self.s = time.time()
         self.r = random.random()
     
@@ -61,15 +152,16 @@ class P:
         try:
             # 多層解密
             step1 = base64.b64decode(data.encode())
-            step2 = zlib.decompress(step1)
-            step3 = base64.b64decode(step2)
             
-            # 簡單的XOR解密
-            result = bytearray()
-            for i, b in enumerate(step3):
-                result.append(b ^ ord(self.k[i % len(self.k)]))
+            # 簡單的XOR解密：同一金鑰位置的位元組取切片，以 256 位元組對照表一次 translate
+            # （只用標準庫，避免 PyInstaller 因 import 而把 NumPy 打包進執行檔）
+            kb, klen = self.kb, self.klen
+            result = bytearray(len(step1))
+            for j, k in enumerate(kb):
+                result[j::klen] = step1[j::klen].translate(bytes(b ^ k for b in range(256)))
+            result = bytes(result)
             
-            return marshal.loads(bytes(result))
+            return marshal.loads(zlib.decompress(result, -15))
         except:
             os._exit(1)
     
@@ -91,26 +183,75 @@ if __name__ == "__main__":
 '''
         return loader_template
     
+    def _compile_cached(self, source_code):
+        """編譯並 marshal 原始碼（str 或 UTF-8 位元組）；以原始碼雜湊與位元組碼版本為鍵快取在 .build_cache"""
+        import hashlib
+        import importlib.util
+        import marshal
+        
+        data = source_code if isinstance(source_code, bytes) else source_code.encode()
+        h = hashlib.sha256(data).hexdigest()
+        cache_file = os.path.join(BUILD_CACHE_DIR, f"{h}-{importlib.util.MAGIC_NUMBER.hex()}.marshal")
+        try:
+            with open(cache_file, 'rb') as f:
+                return f.read()
+        except OSError:
+            pass
+        
+        marshaled = marshal.dumps(compile(source_code, '<protected>', 'exec'))
+        # 先寫入暫存檔再 os.replace，中斷時不會留下被當成快取命中的殘缺檔案
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(BUILD_CACHE_DIR, exist_ok=True)
+            with open(tmp_file, 'wb') as f:
+                f.write(marshaled)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+        return marshaled
+    
     def multi_layer_encrypt(self, source_code):
         """多層加密"""
+        import zlib
+        # 有安裝 pybase64（SIMD 加速）時使用，否則退回標準庫，兩者介面相同
+        try:
+            import pybase64 as b64
+        except ImportError:
+            import base64 as b64
+        # 有 NumPy 時以向量化 XOR 加密，否則逐位元組處理
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        
         try:
             # 編譯代碼
-            compiled = compile(source_code, '<protected>', 'exec')
-            marshaled = marshal.dumps(compiled)
-            
-            # 第一層：XOR加密
-            encrypted = bytearray()
-            for i, b in enumerate(marshaled):
-                encrypted.append(b ^ ord(self.encryption_key[i % len(self.encryption_key)]))
+            marshaled = self._compile_cached(source_code)
             
-            # 第二層：Base64編碼
-            encoded = base64.b64encode(bytes(encrypted)).decode()
+            # 第一層：zlib壓縮（位元組碼重複性高，先壓縮後面各層要處理的資料也少；
+            # 壓縮已加密或 Base64 後的資料幾乎沒有效果）。
+            # 使用原始 DEFLATE（wbits=-15），省去 zlib 檔頭與 Adler-32 校驗碼
+            co = zlib.compressobj(6, zlib.DEFLATED, -15)
+            compressed = co.compress(marshaled) + co.flush()
             
-            # 第三層：zlib壓縮
-            compressed = zlib.compress(encoded.encode())
+            # 第二層：XOR加密
+            key = self.encryption_key.encode()
+            if np is not None:
+                data = np.frombuffer(compressed, np.uint8)
+                encrypted = (data ^ np.resize(np.frombuffer(key, np.uint8), data.size)).tobytes()
+            else:
+                # 同一金鑰位置的位元組取切片，以 256 位元組對照表一次 translate（C 層級迴圈）
+                klen = len(key)
+                out = bytearray(len(compressed))
+                for j, k in enumerate(key):
+                    out[j::klen] = compressed[j::klen].translate(bytes(b ^ k for b in range(256)))
+                encrypted = bytes(out)
             
-            # 第四層：最終Base64編碼
-            final = base64.b64encode(compressed).decode()
+            # 第三層：Base64編碼（嵌入載入器字串用，只需一次）
+            final = b64.b64encode(encrypted).decode()
             
             return final
             
@@ -119,12 +260,12 @@ if __name__ == "__main__":
             return None
     
     def process_source_code(self, source_file):
-        """處理源代碼，添加保護"""
-        with open(source_file, 'r', encoding='utf-8') as f:
+        """處理源代碼，添加保護（以 UTF-8 位元組處理，compile 可直接接受，不必先解碼）"""
+        with open(source_file, 'rb') as f:
             original_code = f.read()
         
         # 在代碼開頭添加保護初始化
-        protected_code = '''
+        protected_code = b''.join((b'''
 # Runtime Protection
 import sys, os, time, threading, random
 def _init_protection():
@@ -151,7 +292,7 @@ def _init_protection():
 
 _init_protection()
 
-''' + original_code
+''', original_code))
         
         return protected_code
     
@@ -174,14 +315,15 @@ _init_protection()
             print("步驟3: 生成保護載入器...")
             loader_code = self.create_protected_loader(encrypted_payload)
             
-            # 步驟4: 寫入受保護文件
+            # 步驟4: 寫入受保護文件（先整份編碼再以二進位模式一次寫出）
             protected_file = f"{output_name}_ultimate.py"
-            with open(protected_file, 'w', encoding='utf-8') as f:
-                f.write(loader_code)
+            with open(protected_file, 'wb') as f:
+                f.write(loader_code.encode('utf-8'))
             
             # 步驟5: 使用PyInstaller打包
             print("步驟5: 打包為可執行文件...")
-            success = self.build_final_executable(protected_file, f"{output_name}_Ultimate")
+            success = self.build_final_executable(protected_file, f"{output_name}_Ultimate",
+                                                  _source_imports(protected_source))
             
             # 清理
             try:
@@ -195,12 +337,16 @@ _init_protection()
             print(f"處理失敗: {e}")
             return False
     
-    def build_final_executable(self, script_file, output_name):
-        """最終打包"""
+    def build_final_executable(self, script_file, output_name, hidden_imports=()):
+        """最終打包；hidden_imports 為加密的程式碼實際用到的模組"""
+        # 載入器只看得到自己的匯入，程式本身用到的模組（含標準庫）都要明確指定
+        hidden = dict.fromkeys(['subprocess', 'threading', 'pathlib',
+                                *_hidden_imports('tkinter'), *hidden_imports])
         try:
             cmd = [
                 'pyinstaller',
                 '--onedir',
+                '--noconfirm',
                 '--windowed',
                 '--optimize=1',
                 '--distpath=ultimate_release',
@@ -208,19 +354,13 @@ _init_protection()
                 '--specpath=ultimate_spec',
                 f'--name={output_name}',
                 '--noconsole',
-                '--hidden-import=tkinter',
-                '--hidden-import=tkinter.ttk',
-                '--hidden-import=tkinter.messagebox',
-                '--hidden-import=tkinter.filedialog',
-                '--hidden-import=subprocess',
-                '--hidden-import=threading',
-                '--hidden-import=pathlib',
+                *(f'--hidden-import={m}' for m in hidden),
                 script_file
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            returncode, log_tail = _run_pyinstaller(cmd)
             
-            if result.returncode == 0:
+            if returncode == 0:
                 print(f"\\n=== 成功 ===")
                 print(f"終極保護版本: ultimate_release/{output_name}.exe")
                 print(f"文件大小: {os.path.getsize(f'ultimate_release/{output_name}.exe') // 1024 // 1024} MB")
@@ -232,19 +372,20 @@ _init_protection()
                 print("✓ 代碼混淆")
                 return True
             else:
-                print(f"打包失敗: {result.stderr}")
+                print(f"打包失敗: {log_tail}")
                 return False
                 
         except Exception as e:
             print(f"打包出錯: {e}")
             return False
     
-    def cleanup(self):
-        """清理臨時文件"""
+    def cleanup(self, build_cache=False):
+        """清理臨時文件；PyInstaller 的分析快取（workpath / spec）預設保留給下次增量打包"""
         try:
             shutil.rmtree(self.temp_dir, ignore_errors=True)
-            shutil.rmtree('ultimate_build', ignore_errors=True)
-            shutil.rmtree('ultimate_spec', ignore_errors=True)
+            if build_cache:
+                shutil.rmtree('ultimate_build', ignore_errors=True)
+                shutil.rmtree('ultimate_spec', ignore_errors=True)
         except:
             pass
 
@@ -265,7 +406,8 @@ def main():
             sys.exit(1)
             
     finally:
-        protector.cleanup()
+        # 加上 --clean 參數時才清除打包快取
+        protector.cleanup(build_cache='--clean' in sys.argv[1:])
 
 if __name__ == "__main__":
     main()